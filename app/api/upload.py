@@ -10,6 +10,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse
 
 from app.core.settings import settings
+from app.services.meta_log import meta_log
 from app.storage.local import LocalStorage
 from app.utils.media import (
     detect_media_type,
@@ -67,10 +68,11 @@ async def upload(
                 suffix=".jpg",
             )
             computed = preprocess_image(
-                src=tmp_path,
+                src=content,
                 dst=processed_path,
                 resize=settings.image_resize,
                 jpeg_quality=settings.jpeg_quality,
+                reduced_decode=settings.image_reduced_decode,
             )
         else:  # video
             processed_path = storage.save(tmp_path, subdir="processed/videos", suffix=suffix)
@@ -92,9 +94,8 @@ async def upload(
         "computed": computed,
     }
 
-    # 7) 메타 JSON 저장
-    meta_dir = Path(settings.meta_path)
-    meta_dir.mkdir(parents=True, exist_ok=True)
-    (meta_dir / f"{file_id}.json").write_text(json.dumps(record, ensure_ascii=False, indent=2))
+    # 7) 메타 로그 기록
+    if settings.meta_log:
+        meta_log.append(record)
 
     return JSONResponse(record)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.core.database import get_session
+from app.models.dataset import Dataset
+from app.schemas.dataset import DatasetCreate, DatasetResponse
+from app.services.dataset_service import DatasetService
+from app.utils.http_range import file_range_response, zip_stream_response
+
+router = APIRouter(prefix="/datasets", tags=["datasets"])
+service = DatasetService()
+
+
+@router.post("", response_model=DatasetResponse, status_code=201)
+def create_dataset(req: DatasetCreate, db: Session = Depends(get_session)):
+    # 필터 조건을 불변 매니페스트로 고정한 새 버전 생성, 아카이브 빌드는 워커가 수행
+    return service.create(db, req)
+
+
+def _get_dataset(db: Session, dataset_id: int) -> Dataset:
+    dataset = db.get(Dataset, dataset_id)
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return dataset
+
+
+@router.get("/{dataset_id}", response_model=DatasetResponse)
+def get_dataset(dataset_id: int, db: Session = Depends(get_session)):
+    return _get_dataset(db, dataset_id)
+
+
+@router.get("/{dataset_id}/download")
+def download_dataset_version(dataset_id: int, request: Request, db: Session = Depends(get_session)):
+    dataset = _get_dataset(db, dataset_id)
+    filename = f"{dataset.name}-{dataset.version}.zip"
+    archive = service.cache.open(dataset.manifest_hash)
+    if archive is not None:
+        # 캐시된 아카이브는 내용이 매니페스트 해시로 고정되므로 ETag로 그대로 사용
+        return file_range_response(request, archive, filename, f'"{dataset.manifest_hash}"', "application/zip")
+    # 빌드 전이거나 캐시에서 밀려났으면 매니페스트로부터 스트리밍
+    return zip_stream_response(request, service.stream(dataset), filename)
@@ -1,50 +1,151 @@
 from __future__ import annotations
 
-import shutil
-import tempfile
-from typing import Optional
-from pathlib import Path
+from datetime import timezone
+from typing import Iterator, Literal, Optional
 
-from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, and_
 from sqlalchemy.orm import Session
 
-from app.core.database import get_session
+from app.core.database import SessionLocal, get_session
+from app.core.settings import settings
 from app.models.file import File
+from app.schemas.upload import MediaType
+from app.services import columnar_export
+from app.services.file_query import build_file_filters
+from app.services.file_writer import save_entry_crcs
+from app.services.near_duplicates import BAND_COLUMNS, MAX_DISTANCE, drop_near_duplicates
+from app.storage import read_location, stat_location
+from app.utils.http_range import zip_stream_response
+from app.utils.zipstream import ZipEntry, ZipStream, entry_name
 
 router = APIRouter(prefix="/download", tags=["download"])
 
+YIELD_PER = 1000  # 쿼리 결과를 이 단위로 나눠 가져옴 (전체 행을 메모리에 올리지 않음)
+
+
+def _dataset_entries(filters: list, dedupe_near: Optional[int] = None) -> Iterator[ZipEntry]:
+    # 스트리밍은 요청 세션이 닫힌 뒤에도 진행되므로 별도 세션 사용
+    stmt = (
+        select(
+            File.id,
+            File.processed_path,
+            File.media_type,
+            File.size_bytes,
+            File.processed_size,
+            File.crc32,
+            File.created_at,
+            *BAND_COLUMNS,
+        )
+        .where(and_(*filters) if filters else True)
+        # 유사 중복 제거 시에는 연속 촬영 중 첫 프레임을 남기도록 촬영 순서로 읽음
+        .order_by(*((File.captured_at, File.id) if dedupe_near is not None else (File.id,)))
+        .execution_options(yield_per=YIELD_PER)
+    )
+    with SessionLocal() as db:
+        rows = db.execute(stmt)
+        if dedupe_near is not None:
+            rows = drop_near_duplicates(rows, dedupe_near)
+        for row in rows:
+            processed_path = row.processed_path
+            # 크기는 DB 값 사용 (동영상 처리 파일은 원본과 같은 내용, 이미지는 CRC와 함께 저장한 크기)
+            # 모르는 항목만 저장소에 조회 (s3 모드에서 객체마다 head_object를 보내지 않도록, 없어진 파일은 건너뜀)
+            size = row.size_bytes if row.media_type == "video" else row.processed_size
+            if size is None:
+                st = stat_location(processed_path)
+                if st is None:
+                    continue
+                size = st.size
+            yield ZipEntry(
+                name=entry_name(row.id, processed_path),
+                path=processed_path,
+                size=size,
+                # 엔트리 시각은 업로드 시각 (stat 여부와 관계없이 같은 값 → 같은 아카이브 바이트/ETag)
+                mtime=row.created_at.replace(tzinfo=timezone.utc).timestamp(),
+                crc=row.crc32,
+                file_id=row.id,
+            )
+
 
 @router.get("/dataset")
 def download_dataset(
+    request: Request,
     vehicle_id: Optional[str] = Query(None),
     source: Optional[str] = Query(None),
     route_id: Optional[str] = Query(None),
-    media_type: Optional[str] = Query(None),
+    media_type: Optional[MediaType] = Query(None),
+    min_blur: Optional[float] = Query(None),
+    captured_from: Optional[str] = Query(None),
+    captured_to: Optional[str] = Query(None),
+    bbox: Optional[str] = Query(None, description="위치 영역 west,south,east,north (경도/위도)"),
+    near_lat: Optional[float] = Query(None, ge=-90, le=90),
+    near_lon: Optional[float] = Query(None, ge=-180, le=180),
+    radius_m: Optional[float] = Query(None, gt=0, le=100_000, description="near_lat/near_lon 기준 반경(m)"),
+    dedupe_near: Optional[int] = Query(
+        None, ge=0, le=MAX_DISTANCE, description="지각 해시 해밍 거리 k 이내 유사 프레임은 처음 것만 포함"
+    ),
     db: Session = Depends(get_session),
 ):
-    filters = []
-    if vehicle_id:
-        filters.append(File.vehicle_id == vehicle_id)
-    if source:
-        filters.append(File.source == source)
-    if route_id:
-        filters.append(File.route_id == route_id)
-    if media_type:
-        filters.append(File.media_type == media_type)
-
-    stmt = select(File).where(and_(*filters) if filters else True)
-    files = db.scalars(stmt).all()
-    if not files:
+    filters = build_file_filters(
+        vehicle_id=vehicle_id,
+        source=source,
+        route_id=route_id,
+        media_type=media_type,
+        min_blur=min_blur,
+        captured_from=captured_from,
+        captured_to=captured_to,
+        bbox=bbox,
+        near_lat=near_lat,
+        near_lon=near_lon,
+        radius_m=radius_m,
+    )
+
+    if db.scalar(select(File.id).where(and_(*filters) if filters else True).limit(1)) is None:
         raise HTTPException(status_code=404, detail="No files for given filters")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        bundle_dir = Path(tmpdir) / "bundle"
-        bundle_dir.mkdir(parents=True, exist_ok=True)
-        for f in files:
-            src = Path(f.processed_path)
-            if src.exists():
-                shutil.copy2(src, bundle_dir / src.name)
-        archive_path = shutil.make_archive(str(bundle_dir), "zip", root_dir=bundle_dir)
-        return FileResponse(archive_path, filename="dataset.zip")
+    stream = ZipStream(
+        lambda: _dataset_entries(filters, dedupe_near),
+        reader=lambda e, start: read_location(e.path, start),
+        on_crcs=save_entry_crcs,
+    )
+    return zip_stream_response(request, stream, filename="dataset.zip")
+
+
+@router.get("/export")
+def export_files(
+    format: Literal["parquet", "arrow"] = Query("parquet", description="parquet | arrow (Arrow IPC 스트림)"),
+    vehicle_id: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    route_id: Optional[str] = Query(None),
+    media_type: Optional[MediaType] = Query(None),
+    min_blur: Optional[float] = Query(None),
+    captured_from: Optional[str] = Query(None),
+    captured_to: Optional[str] = Query(None),
+    bbox: Optional[str] = Query(None, description="위치 영역 west,south,east,north (경도/위도)"),
+    near_lat: Optional[float] = Query(None, ge=-90, le=90),
+    near_lon: Optional[float] = Query(None, ge=-180, le=180),
+    radius_m: Optional[float] = Query(None, gt=0, le=100_000, description="near_lat/near_lon 기준 반경(m)"),
+):
+    # files 행(meta_json/computed_json은 meta.*/computed.* 컬럼으로 펼침)을 컬럼 포맷으로 스트리밍
+    if not columnar_export.available():
+        raise HTTPException(status_code=501, detail="Columnar export requires pyarrow (pip install pyarrow)")
+    filters = build_file_filters(
+        vehicle_id=vehicle_id,
+        source=source,
+        route_id=route_id,
+        media_type=media_type,
+        min_blur=min_blur,
+        captured_from=captured_from,
+        captured_to=captured_to,
+        bbox=bbox,
+        near_lat=near_lat,
+        near_lon=near_lon,
+        radius_m=radius_m,
+    )
+    media_type_header, filename = columnar_export.FORMATS[format]
+    return StreamingResponse(
+        columnar_export.export_files(filters, format, settings.export_batch_rows),
+        media_type=media_type_header,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,21 +1,38 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from collections import deque
+from itertools import islice
+from typing import Iterator, List, Literal, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy import select, and_, func
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, and_
 from sqlalchemy.orm import Session
 
-from app.core.database import get_session
+from app.core.database import SessionLocal, get_session
+from app.core.settings import settings
 from app.models.file import File
+from app.schemas.file import FileItem, FilePage
 from app.schemas.upload import MediaType
+from app.services.file_query import build_file_filters, after_cursor, encode_cursor, file_columns, parse_fields
+from app.services.near_duplicates import BAND_COLUMNS, MAX_DISTANCE, drop_near_duplicates, find_near, row_phash
+from app.services.response_cache import cached_json
+from app.services.thumbnail_cache import ThumbnailCache, render_file_thumbnail, thumbnail_cache
+from app.storage import storage_for
+from app.utils.json_codec import dumps
 
 router = APIRouter(prefix="/files", tags=["files"])
 
+PAGE_LIMIT = 200  # JSON 응답 한 페이지 최대 행 수
+STREAM_LIMIT = 1_000_000  # NDJSON 스트리밍 최대 행 수
+STREAM_CHUNK_ROWS = 500
+CURSOR_FIELDS = ("captured_at", "id")
+DEDUP_FIELDS = tuple(col.key for col in BAND_COLUMNS)
 
-@router.get("")
+
+@router.get("", response_model=Union[List[FileItem], FilePage])
 def list_files(
+    request: Request,
     vehicle_id: Optional[str] = Query(None),
     source: Optional[str] = Query(None),
     route_id: Optional[str] = Query(None),
@@ -23,33 +40,210 @@ def list_files(
     min_blur: Optional[float] = Query(None),
     captured_from: Optional[str] = Query(None),
     captured_to: Optional[str] = Query(None),
-    limit: int = Query(50, ge=1, le=200),
+    bbox: Optional[str] = Query(None, description="위치 영역 west,south,east,north (경도/위도)"),
+    near_lat: Optional[float] = Query(None, ge=-90, le=90),
+    near_lon: Optional[float] = Query(None, ge=-180, le=180),
+    radius_m: Optional[float] = Query(None, gt=0, le=100_000, description="near_lat/near_lon 기준 반경(m)"),
+    limit: int = Query(50, ge=1, le=STREAM_LIMIT, description=f"json은 최대 {PAGE_LIMIT}, ndjson은 최대 {STREAM_LIMIT}"),
     offset: int = Query(0, ge=0),
+    pagination: Literal["offset", "cursor"] = Query("offset", description="cursor: (captured_at, id) 키셋 페이지네이션"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 cursor 모드)"),
+    dedupe_near: Optional[int] = Query(
+        None, ge=0, le=MAX_DISTANCE, description="지각 해시 해밍 거리 k 이내 유사 프레임은 처음 것만 반환"
+    ),
+    fields: Optional[str] = Query(None, description="응답에 포함할 컬럼 (쉼표 구분, 예: id,stored_path,processed_path)"),
+    format: Literal["json", "ndjson"] = Query("json", description="ndjson: 한 줄에 한 항목씩 스트리밍 (촬영 순서)"),
     db: Session = Depends(get_session),
 ):
-    filters = []
-    if vehicle_id:
-        filters.append(File.vehicle_id == vehicle_id)
-    if source:
-        filters.append(File.source == source)
-    if route_id:
-        filters.append(File.route_id == route_id)
-    if media_type:
-        filters.append(File.media_type == media_type)
-    if min_blur is not None:
-        filters.append(File.computed_json["blur_score"].as_float() >= min_blur)
-    if captured_from:
-        filters.append(File.captured_at >= datetime.fromisoformat(captured_from.replace("Z", "+00:00")))
-    if captured_to:
-        filters.append(File.captured_at <= datetime.fromisoformat(captured_to.replace("Z", "+00:00")))
-
-    stmt = select(File).where(and_(*filters) if filters else True).offset(offset).limit(limit)
-    return db.scalars(stmt).all()
+    # 고른 컬럼만 SELECT해서 ORM 객체 없이 행 → dict → JSON 바이트로 직렬화
+    params = dict(
+        vehicle_id=vehicle_id,
+        source=source,
+        route_id=route_id,
+        media_type=media_type,
+        min_blur=min_blur,
+        captured_from=captured_from,
+        captured_to=captured_to,
+        bbox=bbox,
+        near_lat=near_lat,
+        near_lon=near_lon,
+        radius_m=radius_m,
+    )
+    columns = parse_fields(fields)
+    if format == "ndjson":
+        filters = build_file_filters(**params)
+        if cursor:
+            filters.append(after_cursor(cursor))
+        return StreamingResponse(
+            _stream_ndjson(filters, columns, limit, offset, dedupe_near), media_type="application/x-ndjson"
+        )
+    if limit > PAGE_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit above {PAGE_LIMIT} requires format=ndjson")
+
+    # 같은 조건의 반복 조회는 응답 캐시에서 (새 행이 커밋되면 무효화)
+    page = dict(limit=limit, offset=offset, pagination=pagination, cursor=cursor, dedupe_near=dedupe_near)
+    key = {**params, **page, "fields": ",".join(columns)}
+    return cached_json(request, "files", key, lambda: _list_files(db, params, columns, **page))
+
+
+def _list_files(
+    db: Session,
+    params: dict,
+    fields: Tuple[str, ...],
+    limit: int,
+    offset: int,
+    pagination: str,
+    cursor: Optional[str],
+    dedupe_near: Optional[int],
+):
+    filters = build_file_filters(**params)
+
+    if dedupe_near is not None:
+        return _list_deduped(db, filters, fields, dedupe_near, limit, offset, pagination, cursor)
+
+    if pagination == "offset" and cursor is None:
+        stmt = select(*file_columns(fields)).where(and_(*filters) if filters else True).offset(offset).limit(limit)
+        return [dict(zip(fields, row)) for row in db.execute(stmt)]
+
+    # 키셋 페이지네이션: offset 없이 마지막 위치 다음부터 읽으므로 몇 번째 페이지든 비용이 같음
+    if cursor:
+        filters.append(after_cursor(cursor))
+    stmt = (
+        select(*file_columns(fields, CURSOR_FIELDS))
+        .where(and_(*filters) if filters else True)
+        .order_by(File.captured_at, File.id)
+        .limit(limit + 1)
+    )
+    rows = db.execute(stmt).all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].captured_at, items[-1].id) if len(rows) > limit else None
+    return {"items": [dict(zip(fields, row)) for row in items], "next_cursor": next_cursor}
+
+
+def _list_deduped(
+    db: Session,
+    filters: list,
+    fields: Tuple[str, ...],
+    k: int,
+    limit: int,
+    offset: int,
+    pagination: str,
+    cursor: Optional[str],
+):
+    # 촬영 순서대로 훑으면서 유사 중복을 걸러 limit개를 채움 (걸러진 행도 읽으므로 페이지당 비용은 중복 비율만큼 증가)
+    if cursor:
+        filters.append(after_cursor(cursor))
+    examined = deque(maxlen=2)  # 마지막으로 읽은 두 행 (다음 커서 위치 계산용)
+    rows = drop_near_duplicates((examined.append(row) or row for row in _scan(db, filters, fields, k)), k)
+    if pagination == "offset" and cursor is None:
+        return [dict(zip(fields, row)) for row in islice(rows, offset, offset + limit)]
+    items = list(islice(rows, limit + 1))
+    next_cursor = None
+    if len(items) > limit:
+        # 다음 페이지는 limit+1번째로 남은 행부터 (그 앞에서 걸러진 행은 다시 보지 않음)
+        before = examined[0]
+        next_cursor = encode_cursor(before.captured_at, before.id)
+    return {"items": [dict(zip(fields, row)) for row in items[:limit]], "next_cursor": next_cursor}
+
+
+def _scan(db: Session, filters: list, fields: Tuple[str, ...], dedupe_near: Optional[int]):
+    # 촬영 순서 전체 스캔 (유사 중복 제거 시 지각 해시 밴드 컬럼도 함께 읽음)
+    extra = CURSOR_FIELDS + (DEDUP_FIELDS if dedupe_near is not None else ())
+    stmt = (
+        select(*file_columns(fields, extra))
+        .where(and_(*filters) if filters else True)
+        .order_by(File.captured_at, File.id)
+        .execution_options(yield_per=500)
+    )
+    return db.execute(stmt)
+
+
+def _stream_ndjson(
+    filters: list, fields: Tuple[str, ...], limit: int, offset: int, dedupe_near: Optional[int]
+) -> Iterator[bytes]:
+    # 응답이 끝날 때까지 자체 세션으로 읽으면서 STREAM_CHUNK_ROWS행씩 묶어 전송 (메모리는 청크 하나 분량)
+    with SessionLocal() as db:
+        rows = _scan(db, filters, fields, dedupe_near)
+        if dedupe_near is not None:
+            rows = drop_near_duplicates(rows, dedupe_near)
+        lines = []
+        for row in islice(rows, offset, offset + limit):
+            lines.append(dumps(dict(zip(fields, row))))
+            if len(lines) >= STREAM_CHUNK_ROWS:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+        if lines:
+            yield b"\n".join(lines) + b"\n"
 
 
 @router.get("/{file_id}")
-def get_file(file_id: str, db: Session = Depends(get_session)):
+def get_file(file_id: str, request: Request, db: Session = Depends(get_session)):
+    return cached_json(request, "file", {"id": file_id}, lambda: _get_file(db, file_id))
+
+
+def _get_file(db: Session, file_id: str) -> File:
     obj = db.get(File, file_id)
     if not obj:
         raise HTTPException(status_code=404, detail="File not found")
     return obj
+
+
+@router.get("/{file_id}/similar")
+def similar_files(
+    file_id: str,
+    k: int = Query(6, ge=0, le=MAX_DISTANCE, description="지각 해시 해밍 거리 상한"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_session),
+):
+    # 지각 해시가 거리 k 이내인 유사 프레임 (가까운 순)
+    obj = db.get(File, file_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="File not found")
+    value = row_phash(obj)
+    if value is None:
+        raise HTTPException(status_code=400, detail="File has no perceptual hash")
+    matches = find_near(db, value, k, limit=limit, exclude_id=file_id)
+    return {"items": [{"distance": d, "file": f} for f, d in matches]}
+
+
+@router.get("/{file_id}/thumbnail")
+def get_thumbnail(
+    file_id: str,
+    request: Request,
+    size: int = Query(256, description="긴 변 px (THUMBNAIL_SIZES 중 하나)"),
+    db: Session = Depends(get_session),
+):
+    # 처리 파일에서 만든 JPEG 썸네일 (디스크 캐시, 처음 요청 때 생성)
+    if size not in settings.thumbnail_sizes:
+        raise HTTPException(status_code=400, detail=f"size must be one of {settings.thumbnail_sizes}")
+    row = db.execute(select(File.processed_path, File.media_type, File.sha256).where(File.id == file_id)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    key = ThumbnailCache.key(row.sha256, size)
+    # 같은 파일의 같은 크기 썸네일은 바뀌지 않으므로 오래 캐시하고 키를 ETag로 사용
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "ETag": f'"{key}"'}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    try:
+        body = thumbnail_cache.read_or_render(key, lambda: render_file_thumbnail(row.processed_path, row.media_type, size))
+    except (ValueError, FileNotFoundError) as exc:
+        raise HTTPException(status_code=404, detail="Processed file is missing or unreadable") from exc
+    return Response(content=body, media_type="image/jpeg", headers=headers)
+
+
+@router.get("/{file_id}/url")
+def get_file_url(
+    file_id: str,
+    variant: Literal["processed", "raw"] = Query("processed"),
+    expires_sec: int = Query(settings.s3_presign_expires_sec, ge=1, le=7 * 24 * 3600),
+    db: Session = Depends(get_session),
+):
+    # 객체 저장소에서 API 서버를 거치지 않고 직접 받을 수 있는 임시 URL
+    obj = db.get(File, file_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="File not found")
+    location = obj.processed_path if variant == "processed" else obj.stored_path
+    url = storage_for(location).presigned_url(location, expires_sec)
+    if url is None:
+        raise HTTPException(status_code=400, detail="Presigned URLs are not supported for local storage")
+    return {"url": url, "expires_sec": expires_sec}
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, get_async_session, get_session
+from app.core.workers import worker_pool
+from app.models.processing_job import ProcessingJob
+from app.schemas.job import JobResponse
+from app.services.rescore_service import RescoreService
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+rescore_service = RescoreService()
+
+
+@router.post("/rescore", response_model=JobResponse, status_code=202)
+def rescore(
+    chunk_size: Optional[int] = Query(None, ge=1, le=100_000),
+    batch_size: Optional[int] = Query(None, ge=1, le=1024),
+    db: Session = Depends(get_session),
+):
+    # 전체 이미지의 품질 지표 재계산 작업 등록 (워커가 처리, 진행 상황은 GET /jobs/{id}의 result)
+    return rescore_service.enqueue(db, chunk_size, batch_size)
+
+
+def _get_job(job_id: int) -> Optional[ProcessingJob]:
+    with SessionLocal() as db:
+        return db.get(ProcessingJob, job_id)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, adb: Optional[AsyncSession] = Depends(get_async_session)):
+    # 작업 상태 폴링용 (자주 호출되므로 비동기 엔진이 있으면 이벤트 루프에서 바로 조회, 없으면 I/O 스레드에서)
+    if adb is not None:
+        job = await adb.get(ProcessingJob, job_id)
+    else:
+        job = await worker_pool.run_io("db_get", _get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app.core.metrics import metrics
+from app.services.response_cache import response_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+def get_metrics():
+    # 큐 깊이·처리 중 작업 수·단계별 지연 시간 스냅샷 + 응답 캐시 적중률
+    return {**metrics.snapshot(), "response_cache": response_cache.stats()}
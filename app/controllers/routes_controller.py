@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_session
+from app.services.file_query import parse_datetime
+from app.services.timeseries import route_timeline
+
+router = APIRouter(prefix="/routes", tags=["routes"])
+
+
+@router.get("/{route_id}/timeline")
+def get_route_timeline(
+    route_id: str,
+    gap_sec: float = Query(60.0, gt=0, description="이 간격(초)보다 오래 촬영이 없으면 공백으로 봄"),
+    vehicle_id: Optional[str] = Query(None),
+    captured_from: Optional[str] = Query(None),
+    captured_to: Optional[str] = Query(None),
+    db: Session = Depends(get_session),
+):
+    # 경로의 연속 촬영 구간과 공백 (촬영 시각 순 인덱스 스캔 한 번)
+    timeline = route_timeline(
+        db,
+        route_id,
+        gap_sec,
+        vehicle_id=vehicle_id,
+        start=parse_datetime(captured_from) if captured_from else None,
+        end=parse_datetime(captured_to) if captured_to else None,
+    )
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="No files for route")
+    return timeline
@@ -1,35 +1,72 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select, func
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 
 from app.core.database import get_session
-from app.models.file import File
+from app.schemas.upload import MediaType
+from app.services.blob_store import dedup_report
+from app.services.file_query import parse_datetime
+from app.services.response_cache import cached_json
+from app.services.stats_rollup import summarize
+from app.services.timeseries import timeseries
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
 
 @router.get("")
-def stats(db: Session = Depends(get_session)):
-    total_files = db.scalar(select(func.count()).select_from(File)) or 0
-
-    by_media = db.execute(select(File.media_type, func.count()).group_by(File.media_type)).all()
-    media_hist = {m: c for m, c in by_media}
-
-    blur_min, blur_avg, blur_max = db.execute(
-        select(func.min(File.computed_json["blur_score"].as_float()),
-               func.avg(File.computed_json["blur_score"].as_float()),
-               func.max(File.computed_json["blur_score"].as_float()))
-    ).one()
-    blur_stats = {
-        "min": float(blur_min) if blur_min is not None else 0.0,
-        "avg": float(blur_avg) if blur_avg is not None else 0.0,
-        "max": float(blur_max) if blur_max is not None else 0.0,
-    }
-
-    return {
-        "total_files": total_files,
-        "media_histogram": media_hist,
-        "blur_stats": blur_stats,
-    }
+def stats(
+    request: Request,
+    group_by: Optional[Literal["day", "media_type", "vehicle_id", "route_id"]] = Query(None),
+    media_type: Optional[MediaType] = Query(None),
+    vehicle_id: Optional[str] = Query(None),
+    route_id: Optional[str] = Query(None),
+    captured_from: Optional[str] = Query(None),
+    captured_to: Optional[str] = Query(None),
+    db: Session = Depends(get_session),
+):
+    # 집계 테이블(stats_rollups)에서 응답 - 기간 필터는 촬영일 단위
+    # 캐시 키는 촬영일로 정규화한 기간 (같은 날의 다른 시각은 같은 응답)
+    params = dict(
+        group_by=group_by,
+        media_type=media_type,
+        vehicle_id=vehicle_id,
+        route_id=route_id,
+        day_from=parse_datetime(captured_from).date() if captured_from else None,
+        day_to=parse_datetime(captured_to).date() if captured_to else None,
+    )
+    return cached_json(request, "stats", params, lambda: summarize(db, **params))
+
+
+@router.get("/timeseries")
+def stats_timeseries(
+    granularity: Literal["minute", "hour", "day"] = Query("hour"),
+    group_by: Optional[Literal["vehicle_id", "route_id", "source"]] = Query(None),
+    vehicle_id: Optional[str] = Query(None),
+    route_id: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    captured_from: Optional[str] = Query(None),
+    captured_to: Optional[str] = Query(None),
+    limit: int = Query(10_000, ge=1, le=100_000),
+    db: Session = Depends(get_session),
+):
+    # 촬영 시각 버킷별 파일 수 (stats_timeseries 집계 테이블에서 응답)
+    return timeseries(
+        db,
+        granularity=granularity,
+        group_by=group_by,
+        vehicle_id=vehicle_id,
+        route_id=route_id,
+        source=source,
+        start=parse_datetime(captured_from) if captured_from else None,
+        end=parse_datetime(captured_to) if captured_to else None,
+        limit=limit,
+    )
+
+
+@router.get("/dedup")
+def dedup_stats(db: Session = Depends(get_session)):
+    # 중복 제거 모드의 블롭 수/참조 수/절감 바이트 (원본 기준)
+    return dedup_report(db)
@@ -1,21 +1,41 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, UploadFile, File, Form, Depends
+from typing import Literal, Optional
+
+from fastapi import APIRouter, UploadFile, File, Form, Depends, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_session
-from app.schemas.upload import UploadResponse
+from app.schemas.job import JobAccepted
+from app.schemas.upload import UploadResponse, BatchUploadResponse
+from app.services.batch_service import BatchUploadService
 from app.services.upload_service import UploadService
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 service = UploadService()
+batch_service = BatchUploadService()
 
 
-@router.post("", response_model=UploadResponse)
+@router.post("", response_model=UploadResponse, responses={202: {"model": JobAccepted}})
 async def upload(
     file: UploadFile = File(..., description="이미지/동영상 파일"),
     metadata: str = Form(..., description="JSON 문자열 메타데이터"),
+    mode: Literal["sync", "async"] = Query("sync", description="async: 원본 저장 후 202 + job id, 전처리는 워커가 수행"),
+    db: Session = Depends(get_session),
+):
+    if mode == "async":
+        accepted = await service.enqueue_upload(db=db, file=file, metadata_str=metadata)
+        return JSONResponse(status_code=202, content=accepted.model_dump())
+    # 컨트롤러는 요청 파싱만 담당, 로직은 서비스로 위임 (블로킹 작업은 서비스가 워커 풀로 넘김)
+    return await service.process_upload(db=db, file=file, metadata_str=metadata)
+
+
+@router.post("/batch", response_model=BatchUploadResponse)
+async def upload_batch(
+    file: UploadFile = File(..., description="이미지/동영상을 담은 ZIP 파일"),
+    manifest: Optional[str] = Form(None, description='JSON 매니페스트 {"defaults": {...}, "entries": {"<이름>": {...}}}'),
     db: Session = Depends(get_session),
 ):
-    # 컨트롤러는 요청 파싱만 담당, 로직은 서비스로 위임
-    return service.process_upload(db=db, file=file, metadata_str=metadata)
+    # 매니페스트가 없으면 ZIP 안의 manifest.json 사용
+    return await batch_service.process_batch(db=db, file=file, manifest_str=manifest)
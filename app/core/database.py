@@ -1,10 +1,70 @@
-from sqlalchemy import create_engine
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.core.settings import settings
 
+try:  # 비동기 엔진은 비동기 드라이버(aiosqlite/asyncpg 등)가 있을 때만 사용
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+except ImportError:  # pragma: no cover
+    create_async_engine = None
+
+# 연결마다 적용하는 SQLite 설정
+# WAL: 읽기가 쓰기를 막지 않음 (쓰기는 여전히 하나씩), NORMAL: WAL에서는 체크포인트 때만 fsync
+# busy_timeout: 쓰기 잠금을 바로 실패시키지 않고 기다림 ("database is locked" 방지)
+# 쓰기 트랜잭션은 BEGIN IMMEDIATE로 시작 (드라이버가 첫 INSERT/UPDATE/DELETE 직전에 BEGIN, 읽기만 하는 연결은 잠금 없음)
+# → 읽기로 시작한 트랜잭션을 쓰기로 올리다 busy handler 없이 바로 실패하는 경우가 없고, 쓰기 잠금 대기는 busy_timeout이 담당
+SQLITE_PRAGMAS = ("journal_mode", "synchronous", "busy_timeout")
+
+# 동기 URL → 같은 DB의 비동기 드라이버 URL (DATABASE_ASYNC_URL이 없을 때)
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgresql+psycopg": "postgresql+psycopg"}
+
+
+def engine_options(url: str) -> dict:
+    # 방언별 엔진 옵션: SQLite는 파일 잠금이 병목이라 풀 설정 대신 잠금 대기, 그 외는 커넥션 풀 크기/검사
+    if make_url(url).get_backend_name() == "sqlite":
+        # 워커 스레드 간에 커넥션을 넘겨 쓰므로 같은 스레드 검사는 끔, timeout은 드라이버의 잠금 대기(초)
+        return {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": settings.sqlite_busy_timeout_ms / 1000,
+                "isolation_level": "IMMEDIATE",
+            }
+        }
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_sec,
+        "pool_recycle": settings.db_pool_recycle_sec,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    values = {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+    }
+    cursor = dbapi_connection.cursor()
+    try:
+        for name in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={values[name]}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str, **kwargs) -> Engine:
+    engine = create_engine(url, future=True, **{**engine_options(url), **kwargs})
+    if engine.dialect.name == "sqlite" and make_url(url).database not in (None, "", ":memory:"):
+        event.listen(engine, "connect", _sqlite_pragmas)
+    return engine
+
+
 # 엔진/세션/베이스 정의
-engine = create_engine(settings.database_url, future=True)
+engine = create_db_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 Base = declarative_base()
 
@@ -15,3 +75,53 @@ def get_session():
         yield session
     finally:
         session.close()
+
+
+def async_database_url(url: str = settings.database_url) -> Optional[str]:
+    if settings.database_async_url:
+        return settings.database_async_url
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False) if driver else None
+
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def async_engine() -> Optional["AsyncEngine"]:
+    # 비동기 엔진 (설정/드라이버가 없으면 None → 호출자는 동기 세션을 워커 풀에서 사용)
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None and settings.database_async and create_async_engine is not None:
+        url = async_database_url()
+        if url is None:
+            return None
+        try:
+            _async_engine = create_async_engine(url, **engine_options(url))
+        except ImportError:  # 드라이버 미설치
+            return None
+        if _async_engine.dialect.name == "sqlite":
+            event.listen(_async_engine.sync_engine, "connect", _sqlite_pragmas)
+        _async_sessionmaker = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_session():
+    # 비동기 엔진이 있으면 AsyncSession, 없으면 None (엔드포인트는 동기 경로로 대체)
+    if async_engine() is None:
+        yield None
+        return
+    async with _async_sessionmaker() as session:
+        yield session
+
+
+def upsert_insert(session):
+    # INSERT ... ON CONFLICT DO UPDATE를 지원하는 방언별 insert 생성자 (SQLite/PostgreSQL)
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise RuntimeError(f"Upsert is not supported for dialect: {dialect}")
+    return insert
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator
+
+WINDOW_SIZE = 1024  # 분위수 계산용으로 단계별로 보관하는 최근 샘플 수
+
+
+class _StageStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_sec = 0.0
+        self.max_sec = 0.0
+        self.recent: Deque[float] = deque(maxlen=WINDOW_SIZE)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_sec += seconds
+        self.max_sec = max(self.max_sec, seconds)
+        self.recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self.recent)
+
+        def pct(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+        return {
+            "count": self.count,
+            "avg_ms": (self.total_sec / self.count * 1000) if self.count else 0.0,
+            "p50_ms": pct(0.50) * 1000,
+            "p99_ms": pct(0.99) * 1000,
+            "max_ms": self.max_sec * 1000,
+        }
+
+
+class Metrics:
+    # 프로세스 내 게이지(큐 깊이 등)와 단계별 지연 시간을 모으는 간단한 레지스트리
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._gauges: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {}
+        self._stages: Dict[str, _StageStats] = {}
+
+    def gauge_add(self, name: str, delta: int) -> None:
+        with self._lock:
+            self._gauges[name] = self._gauges.get(name, 0) + delta
+
+    def incr(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + delta
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stages.setdefault(stage, _StageStats()).observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "gauges": dict(self._gauges),
+                "counters": dict(self._counters),
+                "stages": {name: s.snapshot() for name, s in self._stages.items()},
+            }
+
+
+metrics = Metrics()
@@ -1,4 +1,4 @@
-from typing import Tuple, List
+from typing import Tuple, List, Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -13,9 +13,48 @@ class Settings(BaseSettings):
     storage_base_path: str = Field("./data", alias="STORAGE_BASE_PATH")
     processed_path: str = Field("./data/processed", alias="PROCESSED_PATH")
     meta_path: str = Field("./data/meta", alias="META_PATH")
+    # 업로드 메타 레코드 로그 (META_PATH 아래 JSONL 세그먼트, app/services/meta_log.py)
+    meta_log: bool = Field(True, alias="META_LOG")
+    meta_log_segment_mb: int = Field(64, alias="META_LOG_SEGMENT_MB")  # 이 크기를 넘으면 세그먼트 봉인
+    meta_log_compact_segments: int = Field(8, alias="META_LOG_COMPACT_SEGMENTS")  # 봉인 세그먼트가 이 수면 병합
+    dataset_path: str = Field("./data/datasets", alias="DATASET_PATH")  # 매니페스트/아카이브 캐시
+    # 로컬 디렉터리 레이아웃: sharded(날짜/이름 앞 2자리로 분산) | flat(하위 디렉터리 하나에 모두 저장)
+    storage_layout: Literal["sharded", "flat"] = Field("sharded", alias="STORAGE_LAYOUT")
+    storage_fsync: bool = Field(False, alias="STORAGE_FSYNC")  # 모든 로컬 쓰기를 fsync (느리지만 정전에도 안전)
+
+    # 저장소 백엔드: local(기본) | s3 (S3 호환 - AWS S3/MinIO, boto3 필요)
+    # s3 모드에서도 OpenCV 처리는 로컬 작업 공간(STORAGE_BASE_PATH)에서 하고, 완료 후 업로드하고 로컬 사본은 지움
+    storage_mode: Literal["local", "s3"] = Field("local", alias="STORAGE_MODE")
+    s3_bucket: str = Field("", alias="S3_BUCKET")
+    s3_prefix: str = Field("", alias="S3_PREFIX")
+    s3_endpoint_url: Optional[str] = Field(None, alias="S3_ENDPOINT_URL")  # MinIO 등
+    s3_region: Optional[str] = Field(None, alias="S3_REGION")
+    s3_access_key: Optional[str] = Field(None, alias="S3_ACCESS_KEY")  # 비우면 boto3 기본 자격 증명 사용
+    s3_secret_key: Optional[str] = Field(None, alias="S3_SECRET_KEY")
+    s3_max_pool_connections: int = Field(32, alias="S3_MAX_POOL_CONNECTIONS")
+    s3_multipart_threshold_mb: int = Field(64, alias="S3_MULTIPART_THRESHOLD_MB")  # 이 크기부터 멀티파트 업로드
+    s3_multipart_chunk_mb: int = Field(16, alias="S3_MULTIPART_CHUNK_MB")
+    s3_max_concurrency: int = Field(8, alias="S3_MAX_CONCURRENCY")  # 파일 하나당 병렬 파트 업로드 수
+    s3_presign_expires_sec: int = Field(3600, alias="S3_PRESIGN_EXPIRES_SEC")
 
     # DB
     database_url: str = Field("sqlite:///./data.db", alias="DATABASE_URL")
+    # SQLite: 연결마다 적용하는 PRAGMA (WAL이면 읽기가 쓰기를 막지 않음), 쓰기 잠금 대기 시간
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE"] = Field("WAL", alias="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL"] = Field("NORMAL", alias="SQLITE_SYNCHRONOUS")
+    sqlite_busy_timeout_ms: int = Field(5000, alias="SQLITE_BUSY_TIMEOUT_MS")
+    # PostgreSQL 등: 커넥션 풀 (pre_ping은 끊어진 연결을 꺼내기 전에 확인)
+    db_pool_size: int = Field(10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(20, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_sec: float = Field(30.0, alias="DB_POOL_TIMEOUT_SEC")
+    db_pool_recycle_sec: int = Field(1800, alias="DB_POOL_RECYCLE_SEC")
+    db_pool_pre_ping: bool = Field(True, alias="DB_POOL_PRE_PING")
+    # 비동기 엔진(AsyncSession): 비동기 엔드포인트가 워커 스레드 없이 DB를 읽음 (aiosqlite/asyncpg 필요)
+    database_async: bool = Field(False, alias="DATABASE_ASYNC")
+    database_async_url: Optional[str] = Field(None, alias="DATABASE_ASYNC_URL")  # 비우면 DATABASE_URL에서 유도
+
+    # 중복 제거 모드: 같은 sha256의 업로드는 저장된 블롭과 계산값을 재사용 (blobs/ 아래 해시 경로에 저장)
+    dedup_mode: bool = Field(False, alias="DEDUP_MODE")
 
     # 업로드 허용 확장자/크기
     allowed_image_exts: List[str] = Field(default_factory=lambda: [".jpg", ".jpeg", ".png", ".bmp"])
@@ -25,6 +64,56 @@ class Settings(BaseSettings):
     # 이미지 전처리 기본값
     image_resize: Tuple[int, int] = Field((640, 640), alias="IMAGE_RESIZE")
     jpeg_quality: int = Field(90, alias="JPEG_QUALITY")
+    # 원본이 목표 크기보다 충분히 크면 JPEG를 1/2~1/8 배율로 축소 디코드
+    image_reduced_decode: bool = Field(True, alias="IMAGE_REDUCED_DECODE")
+
+    # 품질 지표 재채점 작업: DB에서 한 번에 읽는 행 수 / 한 번에 벡터 연산하는 프레임 수
+    rescore_chunk_size: int = Field(1000, alias="RESCORE_CHUNK_SIZE")
+    rescore_batch_size: int = Field(32, alias="RESCORE_BATCH_SIZE")
+
+    # 동영상 프레임 샘플 분석: 영상 하나당 최대 디코드 프레임 수 / 시간 예산 (0 프레임이면 분석 생략)
+    video_sample_frames: int = Field(32, alias="VIDEO_SAMPLE_FRAMES")
+    video_sample_budget_sec: float = Field(5.0, alias="VIDEO_SAMPLE_BUDGET_SEC")
+
+    # 업로드 처리 워커 풀 (0이면 미디어 작업도 스레드 풀에서 처리)
+    media_workers: int = Field(2, alias="MEDIA_WORKERS")
+    io_workers: int = Field(8, alias="IO_WORKERS")
+    max_inflight_uploads: int = Field(8, alias="MAX_INFLIGHT_UPLOADS")  # 동시에 처리하는 업로드 수
+    max_queued_uploads: int = Field(64, alias="MAX_QUEUED_UPLOADS")  # 초과 시 503으로 거절
+
+    # 단건 업로드 files INSERT 묶음 처리: 동시에 들어온 행을 창(ms) 동안 또는 최대 행 수까지 모아 한 번에 커밋
+    insert_coalesce: bool = Field(True, alias="INSERT_COALESCE")
+    insert_coalesce_window_ms: float = Field(5.0, alias="INSERT_COALESCE_WINDOW_MS")
+    insert_coalesce_max_rows: int = Field(200, alias="INSERT_COALESCE_MAX_ROWS")
+    insert_coalesce_target_ms: float = Field(0.0, alias="INSERT_COALESCE_TARGET_MS")  # 지연 목표 (0이면 창 고정)
+
+    # ZIP 배치 업로드: 한 트랜잭션으로 묶어 INSERT하는 엔트리 수
+    batch_chunk_size: int = Field(500, alias="BATCH_CHUNK_SIZE")
+
+    # 비동기 처리 큐 (processing_jobs 테이블 기반)
+    job_lease_sec: int = Field(120, alias="JOB_LEASE_SEC")  # 워커가 작업을 선점하는 시간
+    job_max_attempts: int = Field(5, alias="JOB_MAX_ATTEMPTS")
+    job_backoff_base_sec: float = Field(2.0, alias="JOB_BACKOFF_BASE_SEC")  # 재시도 간격 = base * 2^(시도-1)
+    job_backoff_max_sec: float = Field(300.0, alias="JOB_BACKOFF_MAX_SEC")
+    worker_poll_interval_sec: float = Field(1.0, alias="WORKER_POLL_INTERVAL_SEC")
+
+    # Parquet/Arrow 내보내기: 한 번에 읽어 레코드 배치(row group) 하나로 쓰는 행 수
+    export_batch_rows: int = Field(10_000, alias="EXPORT_BATCH_ROWS")
+
+    # GET /files, /files/{id}, /stats 응답 캐시 (프로세스 내 LRU/TTL, 쓰기 커밋 시 세대 증가로 무효화)
+    response_cache: bool = Field(True, alias="RESPONSE_CACHE")
+    response_cache_max_bytes: int = Field(64 * 1024**2, alias="RESPONSE_CACHE_MAX_BYTES")
+    response_cache_ttl_sec: float = Field(30.0, alias="RESPONSE_CACHE_TTL_SEC")  # 다른 프로세스의 쓰기가 보이기까지 최대 지연
+
+    # 썸네일 파생본 캐시 (GET /files/{id}/thumbnail?size=): 허용 크기(긴 변 px), 업로드 시 미리 만들 크기, 최대 크기
+    thumbnail_path: str = Field("./data/thumbnails", alias="THUMBNAIL_PATH")
+    thumbnail_sizes: List[int] = Field(default_factory=lambda: [128, 256, 512], alias="THUMBNAIL_SIZES")
+    thumbnail_eager_sizes: List[int] = Field(default_factory=list, alias="THUMBNAIL_EAGER_SIZES")  # 비우면 첫 요청 때 생성
+    thumbnail_jpeg_quality: int = Field(80, alias="THUMBNAIL_JPEG_QUALITY")
+    thumbnail_cache_max_bytes: int = Field(2 * 1024**3, alias="THUMBNAIL_CACHE_MAX_BYTES")
+
+    # 데이터셋 아카이브 캐시 최대 크기 (초과 시 오래 안 쓴 아카이브부터 삭제)
+    dataset_cache_max_bytes: int = Field(50 * 1024**3, alias="DATASET_CACHE_MAX_BYTES")
 
 
 settings = Settings()
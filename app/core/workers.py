@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from fastapi import HTTPException
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+T = TypeVar("T")
+
+
+class WorkerPool:
+    # CPU 작업(디코드·리사이즈·블러·인코드)은 프로세스 풀, 블로킹 I/O는 스레드 풀에서 실행
+    def __init__(self, media_workers: int, io_workers: int, max_inflight: int, max_queued: int):
+        self.media_workers = media_workers
+        self.io_workers = io_workers
+        self.max_inflight = max_inflight
+        self.max_queued = max_queued
+        self._cpu: Executor | None = None
+        self._io: ThreadPoolExecutor | None = None
+        self._sem: asyncio.Semaphore | None = None
+        self._sem_loop: asyncio.AbstractEventLoop | None = None
+        self._waiting = 0
+
+    @property
+    def io_executor(self) -> ThreadPoolExecutor:
+        if self._io is None:
+            self._io = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="adp-io")
+        return self._io
+
+    @property
+    def cpu_executor(self) -> Executor:
+        # media_workers=0이면 프로세스 풀 없이 스레드 풀에서 처리 (개발/테스트용)
+        if self._cpu is None:
+            if self.media_workers > 0:
+                # OpenCV 내부 스레드와 fork가 충돌하지 않도록 spawn 사용
+                ctx = multiprocessing.get_context("spawn")
+                self._cpu = ProcessPoolExecutor(max_workers=self.media_workers, mp_context=ctx)
+            else:
+                self._cpu = self.io_executor
+        return self._cpu
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # 이벤트 루프마다 세마포어를 새로 만든다 (테스트 클라이언트는 요청마다 루프가 다를 수 있음)
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_inflight)
+            self._sem_loop = loop
+        return self._sem
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        # 동시 처리 수를 제한하고, 대기열이 가득 차면 503으로 백프레셔를 건다
+        if self._waiting >= self.max_queued:
+            metrics.incr("uploads_rejected")
+            raise HTTPException(status_code=503, detail="Server busy, retry later", headers={"Retry-After": "1"})
+        sem = self._semaphore()
+        self._waiting += 1
+        metrics.gauge_add("upload_queue_depth", 1)
+        start = time.perf_counter()
+        try:
+            await sem.acquire()
+        finally:
+            self._waiting -= 1
+            metrics.gauge_add("upload_queue_depth", -1)
+        metrics.observe("queue_wait", time.perf_counter() - start)
+        metrics.gauge_add("uploads_inflight", 1)
+        try:
+            yield
+        finally:
+            metrics.gauge_add("uploads_inflight", -1)
+            sem.release()
+
+    async def _run(self, executor: Executor, pending_gauge: str, stage: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        metrics.gauge_add(pending_gauge, 1)
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+        finally:
+            metrics.gauge_add(pending_gauge, -1)
+            metrics.observe(stage, time.perf_counter() - start)
+
+    async def run_cpu(self, stage: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # fn/인자는 프로세스 경계를 넘으므로 pickle 가능한 모듈 수준 함수여야 함
+        return await self._run(self.cpu_executor, "cpu_pending", stage, fn, *args, **kwargs)
+
+    async def run_io(self, stage: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._run(self.io_executor, "io_pending", stage, fn, *args, **kwargs)
+
+    def shutdown(self) -> None:
+        if self._cpu is not None and self._cpu is not self._io:
+            self._cpu.shutdown(wait=True, cancel_futures=True)
+        if self._io is not None:
+            self._io.shutdown(wait=True, cancel_futures=True)
+        self._cpu = None
+        self._io = None
+
+
+worker_pool = WorkerPool(
+    media_workers=settings.media_workers,
+    io_workers=settings.io_workers,
+    max_inflight=settings.max_inflight_uploads,
+    max_queued=settings.max_queued_uploads,
+)
@@ -1,14 +1,34 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.settings import settings
 from app.core import database
-from app.controllers import health_controller, upload_controller, files_controller, stats_controller, download_controller
+from app.core.workers import worker_pool
+from app.controllers import (
+    health_controller,
+    upload_controller,
+    files_controller,
+    stats_controller,
+    download_controller,
+    metrics_controller,
+    jobs_controller,
+    datasets_controller,
+    routes_controller,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 종료 시 워커 풀 정리
+    worker_pool.shutdown()
 
 
 def create_app() -> FastAPI:
     # FastAPI 앱 생성 및 라우터 구성
-    app = FastAPI(title="Data Backend", version="0.1.0")
+    app = FastAPI(title="Data Backend", version="0.1.0", lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -24,6 +44,10 @@ def create_app() -> FastAPI:
     app.include_router(files_controller.router, prefix=settings.api_prefix)
     app.include_router(stats_controller.router, prefix=settings.api_prefix)
     app.include_router(download_controller.router, prefix=settings.api_prefix)
+    app.include_router(metrics_controller.router, prefix=settings.api_prefix)
+    app.include_router(jobs_controller.router, prefix=settings.api_prefix)
+    app.include_router(datasets_controller.router, prefix=settings.api_prefix)
+    app.include_router(routes_controller.router, prefix=settings.api_prefix)
     return app
 
 
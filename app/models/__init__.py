@@ -1,5 +1,7 @@
 from app.models.file import File
 from app.models.dataset import Dataset
 from app.models.processing_job import ProcessingJob
+from app.models.blob import Blob
+from app.models.stats_rollup import StatsRollup, StatsBlurBucket, StatsTimeseries
 
-__all__ = ["File", "Dataset", "ProcessingJob"]
+__all__ = ["File", "Dataset", "ProcessingJob", "Blob", "StatsRollup", "StatsBlurBucket", "StatsTimeseries"]
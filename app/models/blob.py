@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class Blob(Base):
+    # 콘텐츠 주소(sha256) 기반 저장 파일 - 같은 내용의 업로드는 이 행을 참조만 함 (중복 제거 모드)
+    __tablename__ = "blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    media_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    stored_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    processed_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    # 최초 처리 시 계산값 (중복 업로드는 OpenCV 작업 없이 재사용)
+    computed_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # 이 블롭을 참조하는 files 행 수
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,20 +1,33 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, JSON
+from sqlalchemy import Column, String, Integer, DateTime, JSON, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
 
+# 스냅샷 아카이브 상태 값
+DATASET_PENDING = "pending"
+DATASET_READY = "ready"
+
 
 class Dataset(Base):
     __tablename__ = "datasets"
+    __table_args__ = (UniqueConstraint("name", "version", name="uq_datasets_name_version"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(128), nullable=False)
     version: Mapped[str] = mapped_column(String(64), nullable=False)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    path: Mapped[str] = mapped_column(String(1024), nullable=False)  # 불변 매니페스트(JSONL) 경로
     filters: Mapped[dict] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     created_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
+
+    # 매니페스트(파일 id + sha256 목록)의 해시 = 아카이브 캐시 키
+    manifest_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    file_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status: Mapped[str] = mapped_column(String(32), nullable=False, default=DATASET_PENDING)
+    # 이전 버전에 파일만 추가된 경우 그 버전의 아카이브 뒤에 이어 붙여 빌드
+    base_dataset_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    job_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
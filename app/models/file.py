@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON
+from sqlalchemy import Column, String, Integer, BigInteger, Float, DateTime, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -9,6 +9,28 @@ from app.core.database import Base
 
 class File(Base):
     __tablename__ = "files"
+    __table_args__ = (
+        # 조회 필터 패턴(등호 조건 + 촬영 시각 범위/정렬)에 맞춘 복합 인덱스
+        Index("ix_files_vehicle_id_captured_at", "vehicle_id", "captured_at"),
+        Index("ix_files_route_id_captured_at", "route_id", "captured_at"),
+        Index("ix_files_source_captured_at", "source", "captured_at"),
+        Index("ix_files_media_type_captured_at", "media_type", "captured_at"),
+        # 커서 페이지네이션 정렬 키 (captured_at, id)
+        Index("ix_files_captured_at_id", "captured_at", "id"),
+        # 중복 업로드 확인 / 같은 내용을 참조하는 파일 조회
+        Index("ix_files_sha256", "sha256"),
+        # 품질 지표 범위 필터/집계 (min/max는 인덱스 끝점만 읽음)
+        Index("ix_files_blur_score", "blur_score"),
+        Index("ix_files_media_type_blur_score", "media_type", "blur_score"),
+        Index("ix_files_duration_sec", "duration_sec"),
+        # 위치 조회: 지오해시 셀 범위 조회 (Z-order 정렬이라 B-tree로 영역 검색)
+        Index("ix_files_geohash", "geohash"),
+        # 유사 중복 탐색: 지각 해시 밴드별 등호 조회 (다중 인덱스 해싱)
+        Index("ix_files_phash_b0", "phash_b0"),
+        Index("ix_files_phash_b1", "phash_b1"),
+        Index("ix_files_phash_b2", "phash_b2"),
+        Index("ix_files_phash_b3", "phash_b3"),
+    )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -17,6 +39,10 @@ class File(Base):
     media_type: Mapped[str] = mapped_column(String(16), nullable=False)  # image|video
     size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
     sha256: Mapped[str] = mapped_column(String(128), nullable=False)
+    # 처리 파일의 CRC-32 (ZIP 스트리밍 때 처음 계산해 저장, Range 이어받기에서 앞부분을 읽지 않고 건너뜀)
+    crc32: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # 처리 파일 크기 (CRC와 함께 저장, ZIP 목록을 만들 때 파일마다 stat/head_object 하지 않도록)
+    processed_size: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
 
     # 메타데이터
     vehicle_id: Mapped[str] = mapped_column(String(128), nullable=False)
@@ -25,10 +51,25 @@ class File(Base):
     route_id: Mapped[str] = mapped_column(String(128), nullable=False)
     location_lat: Mapped[float | None] = mapped_column(Float, nullable=True)
     location_lon: Mapped[float | None] = mapped_column(Float, nullable=True)
+    geohash: Mapped[str | None] = mapped_column(String(12), nullable=True)  # 위치의 지오해시 (app/utils/geohash.py)
     weather: Mapped[str | None] = mapped_column(String(64), nullable=True)
     note: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
+    # 품질 지표 (app/utils/media.py 계산값, 이미지/동영상에 없는 항목은 NULL)
+    blur_score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    width: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    height: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fps: Mapped[float | None] = mapped_column(Float, nullable=True)
+    duration_sec: Mapped[float | None] = mapped_column(Float, nullable=True)
+    frame_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # 64비트 dHash를 16비트씩 나눈 밴드 (app/utils/phash.py, 이미지만)
+    phash_b0: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    phash_b1: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    phash_b2: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    phash_b3: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     meta_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # 전체 계산값 (컬럼으로 승격되지 않은 지표도 여기에 보관)
     computed_json: Mapped[dict] = mapped_column(JSON, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
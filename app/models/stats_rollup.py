@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from sqlalchemy import Integer, String, Float, Date, DateTime, BigInteger, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class StatsRollup(Base):
+    # files 삽입 시 같은 트랜잭션에서 갱신되는 집계 (촬영일/타입/차량/경로 단위)
+    __tablename__ = "stats_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    media_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    vehicle_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    route_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+
+    file_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    size_bytes_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    blur_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    blur_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    blur_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    blur_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+
+class StatsBlurBucket(Base):
+    # 블러 점수 히스토그램 (버킷별 개수를 더하기만 하면 되므로 어떤 그룹 조합으로도 병합 가능)
+    __tablename__ = "stats_blur_buckets"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    media_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    vehicle_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    route_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class StatsTimeseries(Base):
+    # 촬영 시각 버킷(분/시/일)별 파일 수 - files 삽입 시 세 단위 모두 같은 트랜잭션에서 갱신
+    __tablename__ = "stats_timeseries"
+    __table_args__ = (
+        # 차량/경로 단위 시계열 조회 (단위 + 키 등호 + 시각 범위)
+        Index("ix_stats_timeseries_vehicle", "granularity", "vehicle_id", "bucket_start"),
+        Index("ix_stats_timeseries_route", "granularity", "route_id", "bucket_start"),
+    )
+
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)  # minute|hour|day
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    vehicle_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    route_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    source: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    file_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    size_bytes_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.upload import MediaType
+
+
+class DatasetFilters(BaseModel):
+    # GET /api/files와 같은 필터 조건
+    vehicle_id: Optional[str] = None
+    source: Optional[str] = None
+    route_id: Optional[str] = None
+    media_type: Optional[MediaType] = None
+    min_blur: Optional[float] = None
+    captured_from: Optional[str] = None
+    captured_to: Optional[str] = None
+
+
+class DatasetCreate(BaseModel):
+    name: str = Field(..., max_length=128)
+    description: Optional[str] = Field(None, max_length=255)
+    created_by: Optional[str] = Field(None, max_length=128)
+    filters: DatasetFilters = Field(default_factory=DatasetFilters)
+
+
+class DatasetResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    version: str
+    description: Optional[str] = None
+    filters: Optional[dict] = None
+    manifest_hash: str
+    file_count: int
+    status: str
+    base_dataset_id: Optional[int] = None
+    job_id: Optional[int] = None
+    created_at: datetime
+    created_by: Optional[str] = None
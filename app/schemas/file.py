@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FileItem(BaseModel):
+    # GET /api/files 항목 (files 컬럼과 같은 이름, fields=로 고르면 고른 키만 포함)
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    original_filename: Optional[str] = None
+    stored_path: Optional[str] = None
+    processed_path: Optional[str] = None
+    media_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+    sha256: Optional[str] = None
+    crc32: Optional[int] = None
+    processed_size: Optional[int] = None
+    vehicle_id: Optional[str] = None
+    captured_at: Optional[datetime] = None
+    source: Optional[str] = None
+    route_id: Optional[str] = None
+    location_lat: Optional[float] = None
+    location_lon: Optional[float] = None
+    geohash: Optional[str] = None
+    weather: Optional[str] = None
+    note: Optional[str] = None
+    blur_score: Optional[float] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    duration_sec: Optional[float] = None
+    frame_count: Optional[int] = None
+    phash_b0: Optional[int] = None
+    phash_b1: Optional[int] = None
+    phash_b2: Optional[int] = None
+    phash_b3: Optional[int] = None
+    meta_json: Optional[dict] = None
+    computed_json: Optional[dict] = None
+    created_at: Optional[datetime] = None
+
+
+class FilePage(BaseModel):
+    # cursor 페이지네이션 응답 (offset 모드는 항목 배열만 반환)
+    items: List[FileItem]
+    next_cursor: Optional[str] = None
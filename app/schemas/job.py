@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobAccepted(BaseModel):
+    # 비동기 업로드 접수 응답 (202)
+    job_id: int
+    file_id: str
+    status: str
+
+
+class JobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    job_type: str
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    result: Optional[dict] = None
+    available_at: datetime
+    created_at: datetime
+    updated_at: datetime
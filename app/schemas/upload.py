@@ -30,3 +30,21 @@ class UploadResponse(BaseModel):
     sha256: str
     meta: dict
     computed: dict
+
+
+class BatchEntryResult(BaseModel):
+    name: str
+    status: Literal["ok", "error"]
+    file_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchUploadResponse(BaseModel):
+    job_id: int
+    status: str
+    total: int
+    succeeded: int
+    failed: int
+    elapsed_sec: float
+    files_per_sec: float
+    entries: list[BatchEntryResult]
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.processing_job import ProcessingJob, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED
+from app.schemas.upload import Metadata, MediaType, BatchUploadResponse
+from app.services.file_writer import build_file_row, file_record, insert_files
+from app.services.meta_log import meta_log
+from app.services.upload_service import UploadService
+from app.storage import storage_for
+
+MANIFEST_NAME = "manifest.json"
+
+
+class _Entry:
+    # ZIP 엔트리 하나의 처리 상태
+    def __init__(self, info: zipfile.ZipInfo):
+        self.info = info
+        self.name = info.filename
+        self.file_id = uuid4().hex
+        self.meta: Metadata | None = None
+        self.media_type: MediaType | None = None
+        self.stored_path: Path | None = None
+        self.size_bytes = 0
+        self.file_hash = ""
+        self.row: dict | None = None
+        self.reused = False  # 기존 블롭을 재사용 (다른 행과 공유하므로 정리 대상에서 제외)
+        self.pin: Path | None = None  # 새로 만든 블롭의 핀 (커밋 후 제거, 실패 시 참조 확인 후 정리)
+        self.committed = False
+        self.error: str | None = None
+
+
+class BatchUploadService(UploadService):
+    def _parse_manifest(self, manifest_str: Optional[str], zf: zipfile.ZipFile) -> dict:
+        # 매니페스트: {"defaults": {...}, "entries": {"<엔트리 이름>": {...}}}
+        # 폼 필드가 없으면 ZIP 안의 manifest.json을 사용
+        if manifest_str is None:
+            if MANIFEST_NAME not in zf.namelist():
+                return {"defaults": {}, "entries": {}}
+            manifest_str = zf.read(MANIFEST_NAME).decode("utf-8")
+        try:
+            manifest = json.loads(manifest_str)
+        except json.JSONDecodeError as exc:  # noqa: BLE001
+            raise HTTPException(status_code=400, detail=f"Invalid manifest JSON: {exc}") from exc
+        if not isinstance(manifest, dict):
+            raise HTTPException(status_code=400, detail="Manifest must be a JSON object")
+        return {"defaults": manifest.get("defaults") or {}, "entries": manifest.get("entries") or {}}
+
+    def _open_zip(self, src: BinaryIO) -> zipfile.ZipFile:
+        # 업로드 스풀 파일을 그대로 열어 중앙 디렉터리만 읽음 (전체 압축 해제 없음)
+        try:
+            return zipfile.ZipFile(src)
+        except zipfile.BadZipFile as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {exc}") from exc
+
+    def _create_job(self, db: Session, filename: str, total: int) -> int:
+        job = ProcessingJob(job_type="batch_upload", status=JOB_RUNNING, payload={"filename": filename, "total": total})
+        db.add(job)
+        db.commit()
+        return job.id
+
+    def _finish_job(self, db: Session, job_id: int, status: str, result: dict) -> None:
+        job = db.get(ProcessingJob, job_id)
+        job.status = status
+        job.result = result
+        job.updated_at = datetime.utcnow()
+        db.commit()
+
+    def _prepare(self, entry: _Entry, manifest: dict) -> None:
+        # 엔트리별 메타(기본값 + 개별 값) 검증, 확장자/크기 확인
+        raw = {**manifest["defaults"], **(manifest["entries"].get(entry.name) or {})}
+        try:
+            entry.meta = Metadata(**raw)
+        except Exception as exc:  # noqa: BLE001
+            entry.error = f"Metadata validation failed: {exc}"
+            return
+        try:
+            entry.media_type = self._detect_media_type(entry.name)
+        except HTTPException as exc:
+            entry.error = exc.detail
+            return
+        if entry.info.file_size > settings.max_file_size_mb * 1024 * 1024:
+            entry.error = f"File too large: > {settings.max_file_size_mb}MB"
+
+    def _store_chunk(self, zf: zipfile.ZipFile, entries: List[_Entry]) -> None:
+        # 엔트리를 하나씩 스트리밍으로 raw/에 기록 (디스크에 아카이브를 풀지 않음)
+        for entry in entries:
+            if entry.error:
+                continue
+            try:
+                with zf.open(entry.info) as src:
+                    entry.stored_path, entry.size_bytes, entry.file_hash = self._store_raw(
+                        src, Path(entry.name).suffix.lower()
+                    )
+            except HTTPException as exc:
+                entry.error = exc.detail
+            except (zipfile.BadZipFile, OSError) as exc:
+                entry.error = f"Failed to read entry: {exc}"
+
+    def _discard(self, entries: List[_Entry]) -> None:
+        # 커밋되지 않은 엔트리가 남긴 원본/처리 파일 삭제 (없는 파일은 무시)
+        # 중복 제거 모드의 콘텐츠 주소 경로는 다른 요청과 공유될 수 있으므로 _release_blob으로 참조를 확인한 뒤 삭제
+        for entry in entries:
+            if entry.committed:
+                continue
+            locations = {str(entry.stored_path)} if entry.stored_path is not None else set()
+            if entry.row is not None and entry.pin is not None:
+                pin, entry.pin = entry.pin, None
+                try:
+                    self._release_blob(
+                        pin, entry.file_hash, [entry.row["stored_path"], entry.row["processed_path"]]
+                    )
+                except Exception:  # noqa: BLE001
+                    pass
+            elif entry.row is not None and not entry.reused:
+                locations.update((entry.row["stored_path"], entry.row["processed_path"]))
+            for location in locations:
+                try:
+                    storage_for(location).delete(location)
+                except Exception:  # noqa: BLE001
+                    pass
+
+    async def _process_entry(self, entry: _Entry, blob: Optional[dict]) -> None:
+        if entry.error:
+            return
+        suffix = Path(entry.name).suffix.lower()
+        try:
+            stored_path, processed_path, computed, entry.pin = await self._ingest(
+                entry.stored_path, entry.media_type, suffix, entry.size_bytes, entry.file_hash, blob
+            )
+        except HTTPException as exc:
+            entry.error = exc.detail
+            return
+        except Exception as exc:  # noqa: BLE001
+            # 예상하지 못한 오류도 엔트리 단위 실패로 기록 (나머지 엔트리는 계속 처리)
+            # 콘텐츠 주소 경로로 옮긴 파일은 _ingest가 참조를 확인해 정리했으므로 남은 원본만 삭제
+            entry.error = f"Processing failed: {exc}"
+            await self.pool.run_io("batch_discard", self._discard, [entry])
+            return
+        entry.reused = blob is not None
+        entry.row = build_file_row(
+            file_id=entry.file_id,
+            original_filename=Path(entry.name).name,
+            stored_path=stored_path,
+            processed_path=processed_path,
+            media_type=entry.media_type,
+            size_bytes=entry.size_bytes,
+            file_hash=entry.file_hash,
+            meta=entry.meta,
+            computed=computed,
+        )
+
+    def _insert_chunk(self, db: Session, entries: List[_Entry]) -> None:
+        # 청크 단위로 한 번에 INSERT + 한 번의 커밋
+        rows = [e.row for e in entries if e.row is not None]
+        if not rows:
+            return
+        try:
+            insert_files(db, rows)
+            db.commit()
+        except Exception as exc:  # noqa: BLE001
+            db.rollback()
+            self._discard(entries)
+            for e in entries:
+                if e.row is not None:
+                    e.row = None
+                    e.error = f"DB insert failed: {exc}"
+            return
+        for e in entries:
+            e.committed = e.row is not None
+            if e.pin is not None:
+                self.storage.unpin_blob(e.pin)
+                e.pin = None
+
+    def _fail_job(self, db: Session, job_id: int, chunk: List[_Entry], exc: Exception) -> None:
+        # 청크 처리 중 예상하지 못한 오류: 청크에서 이미 저장한 파일을 지우고 작업을 실패로 기록
+        db.rollback()
+        self._discard(chunk)
+        self._finish_job(db, job_id, JOB_FAILED, {"error": f"Batch processing failed: {exc}"})
+
+    async def process_batch(self, db: Session, file: UploadFile, manifest_str: Optional[str]) -> BatchUploadResponse:
+        start = time.perf_counter()
+        zf = await self.pool.run_io("batch_open", self._open_zip, file.file)
+        try:
+            manifest = self._parse_manifest(manifest_str, zf)
+            entries = [_Entry(info) for info in zf.infolist() if not info.is_dir() and info.filename != MANIFEST_NAME]
+            job_id = await self.pool.run_io("db_commit", self._create_job, db, file.filename or "", len(entries))
+
+            succeeded = 0
+            chunk: List[_Entry] = []
+            try:
+                async with self.pool.slot():
+                    for i in range(0, len(entries), settings.batch_chunk_size):
+                        chunk = entries[i : i + settings.batch_chunk_size]
+                        for entry in chunk:
+                            self._prepare(entry, manifest)
+                        await self.pool.run_io("batch_store", self._store_chunk, zf, chunk)
+                        blobs = await self.pool.run_io(
+                            "dedup_lookup", self._find_blobs, db, [e.file_hash for e in chunk if not e.error]
+                        )
+                        # 청크 내 이미지/동영상 전처리는 프로세스 풀에 한꺼번에 분산
+                        await asyncio.gather(*(self._process_entry(e, blobs.get(e.file_hash)) for e in chunk))
+                        await self.pool.run_io("db_commit", self._insert_chunk, db, chunk)
+                        records = [file_record(e.row) for e in chunk if e.row is not None]
+                        succeeded += len(records)
+                        # 청크마다 메타 로그에 한 번에 기록 (배치 전체를 메모리에 모아두지 않음)
+                        if settings.meta_log:
+                            await self.pool.run_io("meta_write", meta_log.append_many, records)
+
+                elapsed = time.perf_counter() - start
+                result = {
+                    "total": len(entries),
+                    "succeeded": succeeded,
+                    "failed": len(entries) - succeeded,
+                    "elapsed_sec": elapsed,
+                    "files_per_sec": succeeded / elapsed if elapsed > 0 else 0.0,
+                    "entries": [
+                        {"name": e.name, "status": "ok", "file_id": e.file_id}
+                        if e.row is not None
+                        else {"name": e.name, "status": "error", "error": e.error}
+                        for e in entries
+                    ],
+                }
+                status = JOB_SUCCEEDED if succeeded or not entries else JOB_FAILED
+                await self.pool.run_io("db_commit", self._finish_job, db, job_id, status, result)
+            except Exception as exc:
+                # 작업이 running으로 남지 않도록 실패로 기록하고 진행 중이던 청크의 파일을 정리
+                await self.pool.run_io("db_commit", self._fail_job, db, job_id, chunk, exc)
+                raise
+        finally:
+            zf.close()
+        return BatchUploadResponse(job_id=job_id, status=status, **result)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert_insert
+from app.models.blob import Blob
+
+
+def find_blobs(db: Session, hashes: Iterable[str]) -> dict[str, dict]:
+    # sha256 → 재사용할 저장 경로/계산값 (세션과 분리된 dict로 반환)
+    hashes = list(set(hashes))
+    if not hashes:
+        return {}
+    stmt = select(Blob.sha256, Blob.stored_path, Blob.processed_path, Blob.computed_json).where(Blob.sha256.in_(hashes))
+    return {
+        sha256: {"stored_path": stored_path, "processed_path": processed_path, "computed": computed}
+        for sha256, stored_path, processed_path, computed in db.execute(stmt)
+    }
+
+
+def find_blob(db: Session, file_hash: str) -> Optional[dict]:
+    return find_blobs(db, [file_hash]).get(file_hash)
+
+
+def register_refs(db: Session, rows: Iterable[dict]) -> None:
+    # files INSERT와 같은 트랜잭션에서 블롭 참조 수 증가 (없으면 생성, 커밋은 호출자가 담당)
+    rows = list(rows)
+    refs = Counter(row["sha256"] for row in rows)
+    if not refs:
+        return
+    first = {}
+    for row in rows:
+        first.setdefault(row["sha256"], row)
+    insert = upsert_insert(db)
+    stmt = insert(Blob).values(
+        [
+            {
+                "sha256": sha256,
+                "media_type": first[sha256]["media_type"],
+                "size_bytes": first[sha256]["size_bytes"],
+                "stored_path": first[sha256]["stored_path"],
+                "processed_path": first[sha256]["processed_path"],
+                "computed_json": first[sha256]["computed_json"],
+                "ref_count": count,
+            }
+            for sha256, count in sorted(refs.items())
+        ]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["sha256"],
+            set_={"ref_count": Blob.ref_count + stmt.excluded.ref_count},
+        )
+    )
+
+
+def dedup_report(db: Session) -> dict:
+    # 원본 기준 절감량: 참조 수만큼 저장했을 크기 - 실제 저장한 크기
+    blobs, refs, unique_bytes, logical_bytes = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(Blob.ref_count), 0),
+            func.coalesce(func.sum(Blob.size_bytes), 0),
+            func.coalesce(func.sum(Blob.size_bytes * Blob.ref_count), 0),
+        )
+    ).one()
+    return {
+        "blobs": int(blobs),
+        "references": int(refs),
+        "unique_bytes": int(unique_bytes),
+        "logical_bytes": int(logical_bytes),
+        "bytes_saved": int(logical_bytes) - int(unique_bytes),
+    }
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, select
+
+from app.core.database import SessionLocal
+from app.models.file import File
+from app.services.file_writer import QUALITY_COLUMNS
+
+try:  # pyarrow는 컬럼 포맷 내보내기에서만 필요한 선택 의존성
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "files.parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "files.arrows"),
+}
+
+# 그대로 내보내는 files 컬럼 (phash 밴드는 인덱스용이라 제외 - 원래 값은 computed.phash)
+BASE_COLUMNS = (
+    "id",
+    "original_filename",
+    "stored_path",
+    "processed_path",
+    "media_type",
+    "size_bytes",
+    "sha256",
+    "vehicle_id",
+    "captured_at",
+    "source",
+    "route_id",
+    "location_lat",
+    "location_lon",
+    "geohash",
+    "weather",
+    "note",
+    *QUALITY_COLUMNS,
+    "created_at",
+)
+# 펼친 JSON 키 중 스키마에 없거나 타입이 다른 값은 여기에 JSON 문자열로 보관
+EXTRA_COLUMNS = ("meta_extra", "computed_extra")
+
+FlatColumn = Tuple[str, str, str, str]  # (컬럼명, 원본 JSON 컬럼, 펼친 키, 값 종류)
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def _base_schema() -> list:
+    fields = []
+    for name in BASE_COLUMNS:
+        column = File.__table__.c[name]
+        py = column.type.python_type
+        if py is datetime:
+            typ = pa.timestamp("us")
+        elif py is int:
+            typ = pa.int64()
+        elif py is float:
+            typ = pa.float64()
+        else:
+            typ = pa.string()
+        fields.append(pa.field(name, typ, nullable=column.nullable))
+    return fields
+
+
+def _flatten(value: dict, prefix: str = "") -> dict:
+    # 중첩 dict는 점 표기 키로 펼침 (예: video_quality.dark_ratio)
+    out = {}
+    for key, item in value.items():
+        name = f"{prefix}{key}"
+        if isinstance(item, dict) and item:
+            out.update(_flatten(item, f"{name}."))
+        else:
+            out[name] = item
+    return out
+
+
+def _kind(values: list) -> Optional[str]:
+    kinds = set()
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, bool):
+            kinds.add("bool")
+        elif isinstance(v, int):
+            kinds.add("int")
+        elif isinstance(v, float):
+            kinds.add("float")
+        elif isinstance(v, str):
+            kinds.add("str")
+        else:
+            kinds.add("json")
+    if not kinds:
+        return None
+    if kinds <= {"int", "float"}:
+        return "float" if "float" in kinds else "int"
+    return kinds.pop() if len(kinds) == 1 else "json"
+
+
+_ARROW_TYPES = {"bool": "bool_", "int": "int64", "float": "float64", "str": "string", "json": "string"}
+
+
+def _coerce(value, kind: str):
+    # (성공 여부, 변환값) - 첫 배치에서 정한 타입과 맞지 않으면 extra 컬럼으로 보냄
+    if kind == "json":
+        return True, json.dumps(value, ensure_ascii=False)
+    if kind == "bool":
+        return isinstance(value, bool), value
+    if isinstance(value, bool):
+        return False, None
+    if kind == "int":
+        return isinstance(value, int), value
+    if kind == "float":
+        return isinstance(value, (int, float)), float(value) if isinstance(value, (int, float)) else None
+    return isinstance(value, str), value
+
+
+def _infer_fields(rows: Sequence) -> List[FlatColumn]:
+    # 첫 배치에서 보이는 JSON 키로 펼친 컬럼 스키마를 정함 (이미 files 컬럼인 키는 제외)
+    fields: List[FlatColumn] = []
+    for source, prefix in (("meta_json", "meta."), ("computed_json", "computed.")):
+        flat = [_flatten(getattr(row, source) or {}) for row in rows]
+        keys = sorted({k for item in flat for k in item} - set(BASE_COLUMNS))
+        for key in keys:
+            kind = _kind([item.get(key) for item in flat])
+            if kind is not None:
+                fields.append((prefix + key, source, key, kind))
+    return fields
+
+
+def _record_batch(rows: Sequence, schema, fields: List[FlatColumn]):
+    columns = {name: [getattr(row, name) for row in rows] for name in BASE_COLUMNS}
+    flat_cols = {name: [None] * len(rows) for name, *_ in fields}
+    extras = {name: [None] * len(rows) for name in EXTRA_COLUMNS}
+    by_source = {"meta_json": {}, "computed_json": {}}
+    for name, source, key, kind in fields:
+        by_source[source][key] = (name, kind)
+
+    for i, row in enumerate(rows):
+        for source, extra_name in zip(by_source, EXTRA_COLUMNS):
+            leftover = {}
+            for key, value in _flatten(getattr(row, source) or {}).items():
+                if key in BASE_COLUMNS:
+                    continue
+                target = by_source[source].get(key)
+                if target is None:
+                    leftover[key] = value
+                    continue
+                if value is None:
+                    continue
+                ok, converted = _coerce(value, target[1])
+                if ok:
+                    flat_cols[target[0]][i] = converted
+                else:
+                    leftover[key] = value
+            if leftover:
+                extras[extra_name][i] = json.dumps(leftover, ensure_ascii=False)
+
+    arrays = [pa.array(columns[f.name], type=f.type) for f in schema if f.name in columns]
+    arrays += [pa.array(flat_cols[name], type=getattr(pa, _ARROW_TYPES[kind])()) for name, _, _, kind in fields]
+    arrays += [pa.array(extras[name], type=pa.string()) for name in EXTRA_COLUMNS]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _schema(fields: List[FlatColumn]):
+    flat = [pa.field(name, getattr(pa, _ARROW_TYPES[kind])()) for name, _, _, kind in fields]
+    return pa.schema(_base_schema() + flat + [pa.field(name, pa.string()) for name in EXTRA_COLUMNS])
+
+
+class _Sink:
+    # pyarrow 쓰기 대상: 쓴 바이트를 모아 뒀다가 배치마다 꺼내 응답으로 흘려보냄
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def export_files(filters: list, fmt: str = "parquet", batch_rows: int = 10_000) -> Iterator[bytes]:
+    # 필터(인덱스 컬럼 조건은 SQL WHERE로 내려감)에 맞는 files 행을 batch_rows씩 읽어
+    # 레코드 배치(Parquet는 배치마다 row group)로 바로 써서 내보냄 → 메모리는 배치 하나 분량
+    # 촬영 순서로 써서 row group별 captured_at 통계 범위가 좁음 (읽는 쪽 조건 pushdown에 유리)
+    columns = [File.__table__.c[name] for name in BASE_COLUMNS] + [File.meta_json, File.computed_json]
+    stmt = (
+        select(*columns)
+        .where(and_(*filters) if filters else True)
+        .order_by(File.captured_at, File.id)
+        .execution_options(yield_per=batch_rows)
+    )
+    sink = _Sink()
+    writer = None
+    schema = fields = None
+    # 스트리밍은 요청 세션이 닫힌 뒤에도 진행되므로 별도 세션 사용
+    with SessionLocal() as db:
+        for rows in db.execute(stmt).partitions():
+            if writer is None:
+                fields = _infer_fields(rows)
+                schema = _schema(fields)
+                writer = _open_writer(sink, schema, fmt)
+            writer.write_batch(_record_batch(rows, schema, fields))
+            yield sink.drain()
+    if writer is None:
+        # 결과가 없어도 읽을 수 있는 빈 파일(기본 컬럼만)을 만듦
+        writer = _open_writer(sink, _schema([]), fmt)
+    writer.close()
+    yield sink.drain()
+
+
+def _open_writer(sink: _Sink, schema, fmt: str):
+    out = pa.PythonFile(sink, mode="w")
+    if fmt == "arrow":
+        return ipc.new_stream(out, schema)
+    return pq.ParquetWriter(out, schema, compression="zstd")
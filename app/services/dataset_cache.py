@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Optional
+from uuid import uuid4
+
+
+class DatasetCache:
+    # 매니페스트 해시로 키를 잡는 아카이브 캐시, 전체 크기가 한도를 넘으면 LRU로 삭제
+    # 최근 사용 시각은 파일 mtime으로 관리 (noatime 마운트에서도 동작)
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, manifest_hash: str) -> Path:
+        return self.root / f"{manifest_hash}.zip"
+
+    def get(self, manifest_hash: str) -> Optional[Path]:
+        path = self.path_for(manifest_hash)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def open(self, manifest_hash: str) -> Optional[BinaryIO]:
+        # 응답에 쓸 아카이브는 경로 대신 열린 파일로 넘김 → 그 뒤 evict()가 지워도 끝까지 읽을 수 있음 (없으면 None)
+        path = self.get(manifest_hash)
+        if path is None:
+            return None
+        try:
+            return path.open("rb")
+        except FileNotFoundError:
+            return None
+
+    def put(self, manifest_hash: str, write: Callable[[BinaryIO], None]) -> Path:
+        # 임시 이름으로 다 쓴 뒤 rename → 읽는 쪽은 완성된 아카이브만 봄
+        final = self.path_for(manifest_hash)
+        tmp = self.root / f".{manifest_hash}.{uuid4().hex}.tmp"
+        try:
+            with tmp.open("wb") as f:
+                write(f)
+            os.replace(tmp, final)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        self.evict(keep=final)
+        return final
+
+    def evict(self, keep: Optional[Path] = None) -> List[str]:
+        entries = []
+        for p in self.root.glob("*.zip"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and p == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+            removed.append(p.stem)
+        return removed
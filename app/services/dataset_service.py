@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import select, and_, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.core.workers import WorkerPool, worker_pool
+from app.models.dataset import Dataset, DATASET_PENDING, DATASET_READY
+from app.models.file import File
+from app.schemas.dataset import DatasetCreate
+from app.services.dataset_cache import DatasetCache
+from app.services.file_query import build_file_filters
+from app.services.file_writer import save_entry_crcs
+from app.services.job_queue import job_queue
+from app.storage import read_location, stat_location
+from app.utils.zipstream import ZipEntry, ZipStream, entry_name, read_zip_base
+
+BUILD_DATASET_JOB = "build_dataset"
+YIELD_PER = 1000
+
+
+def manifest_entries(manifest_path: Path, skip: int = 0) -> Iterator[ZipEntry]:
+    # 매니페스트 순서대로 아카이브 엔트리 생성 (처리 파일이 없어진 항목은 건너뜀)
+    with manifest_path.open("r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if i < skip:
+                continue
+            item = json.loads(line)
+            st = stat_location(item["path"])
+            if st is None:
+                continue
+            yield ZipEntry(
+                name=entry_name(item["id"], item["path"]),
+                path=item["path"],
+                size=st.size,
+                mtime=st.mtime,
+                crc=item.get("crc32"),
+                file_id=item["id"],
+            )
+
+
+def read_entry(entry: ZipEntry, start: int = 0) -> Iterator[bytes]:
+    return read_location(entry.path, start)
+
+
+class DatasetService:
+    def __init__(self, pool: WorkerPool = worker_pool):
+        self.pool = pool
+        self.root = Path(settings.dataset_path)
+        self.manifest_dir = self.root / "manifests"
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = DatasetCache(self.root / "cache", settings.dataset_cache_max_bytes)
+
+    def _write_manifest(self, db: Session, filters: list, prev: Optional[Dataset]) -> tuple[Path, str, int, bool]:
+        # 필터 결과를 JSONL 매니페스트로 고정. 이전 버전의 파일을 모두 포함하면
+        # 이전 매니페스트 뒤에 추가분만 붙여 순서를 유지 (→ 아카이브 증분 빌드 가능)
+        old_ids: set[str] = set()
+        if prev is not None:
+            with open(prev.path, "r", encoding="utf-8") as f:
+                old_ids = {json.loads(line)["id"] for line in f}
+
+        stmt = (
+            select(File.id, File.sha256, File.processed_path, File.crc32)
+            .where(and_(*filters) if filters else True)
+            .order_by(File.id)
+            .execution_options(yield_per=YIELD_PER)
+        )
+        seen_old = 0
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as full, tempfile.TemporaryFile("w+", encoding="utf-8") as added:
+            for file_id, sha256, processed_path, crc32 in db.execute(stmt):
+                line = json.dumps({"id": file_id, "sha256": sha256, "path": processed_path, "crc32": crc32}) + "\n"
+                full.write(line)
+                if file_id in old_ids:
+                    seen_old += 1
+                else:
+                    added.write(line)
+
+            incremental = bool(old_ids) and seen_old == len(old_ids)
+            prev_file = open(prev.path, "r", encoding="utf-8") if incremental else None
+            parts = [prev_file, added] if incremental else [full]
+
+            h = hashlib.sha256()
+            count = 0
+            tmp = self.manifest_dir / f".manifest.{uuid4().hex}.tmp"
+            try:
+                with tmp.open("w", encoding="utf-8") as out:
+                    for part in parts:
+                        part.seek(0)
+                        for line in part:
+                            item = json.loads(line)
+                            h.update(f"{item['id']}:{item['sha256']}\n".encode("utf-8"))
+                            out.write(line)
+                            count += 1
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            finally:
+                if prev_file is not None:
+                    prev_file.close()
+            manifest_hash = h.hexdigest()
+            # 매니페스트도 해시 이름으로 저장 → 같은 내용의 버전은 파일 하나를 공유
+            path = self.manifest_dir / f"{manifest_hash}.jsonl"
+            os.replace(tmp, path)
+        return path, manifest_hash, count, incremental
+
+    def create(self, db: Session, req: DatasetCreate) -> Dataset:
+        filters = build_file_filters(**req.filters.model_dump())
+        prev = db.scalar(select(Dataset).where(Dataset.name == req.name).order_by(Dataset.id.desc()).limit(1))
+        version_no = (db.scalar(select(func.count()).select_from(Dataset).where(Dataset.name == req.name)) or 0) + 1
+
+        path, manifest_hash, count, incremental = self._write_manifest(db, filters, prev)
+        if count == 0:
+            raise HTTPException(status_code=404, detail="No files for given filters")
+
+        dataset = Dataset(
+            name=req.name,
+            version=f"v{version_no}",
+            description=req.description,
+            created_by=req.created_by,
+            path=str(path),
+            filters=req.filters.model_dump(exclude_none=True),
+            manifest_hash=manifest_hash,
+            file_count=count,
+            status=DATASET_READY if self.cache.get(manifest_hash) else DATASET_PENDING,
+            base_dataset_id=prev.id if incremental else None,
+        )
+        db.add(dataset)
+        try:
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Dataset version already exists, retry") from exc
+
+        if dataset.status == DATASET_PENDING:
+            # 아카이브는 백그라운드 워커가 한 번만 빌드
+            job = job_queue.enqueue(db, BUILD_DATASET_JOB, {"dataset_id": dataset.id})
+            dataset.job_id = job.id
+            db.commit()
+        db.refresh(dataset)
+        return dataset
+
+    def stream(self, dataset: Dataset) -> ZipStream:
+        # 캐시가 아직 없을 때 매니페스트로부터 바로 스트리밍
+        return ZipStream(lambda: manifest_entries(Path(dataset.path)), reader=read_entry, on_crcs=save_entry_crcs)
+
+    def build(self, db: Session, dataset_id: int) -> dict:
+        dataset = db.get(Dataset, dataset_id)
+        if dataset is None:
+            raise HTTPException(status_code=404, detail="Dataset not found")
+
+        incremental = False
+        archive = self.cache.get(dataset.manifest_hash)
+        if archive is None:
+            base, skip = None, 0
+            if dataset.base_dataset_id is not None:
+                prev = db.get(Dataset, dataset.base_dataset_id)
+                prev_archive = self.cache.get(prev.manifest_hash) if prev is not None else None
+                if prev_archive is not None:
+                    # 이전 버전 아카이브의 엔트리 영역을 그대로 복사하고 추가분만 읽어 붙임
+                    base, skip = read_zip_base(prev_archive), prev.file_count
+                    incremental = True
+            stream = ZipStream(
+                lambda: manifest_entries(Path(dataset.path), skip), base=base, reader=read_entry, on_crcs=save_entry_crcs
+            )
+
+            def write(f) -> None:
+                for chunk in stream.iter_bytes():
+                    f.write(chunk)
+
+            archive = self.cache.put(dataset.manifest_hash, write)
+
+        dataset.status = DATASET_READY
+        db.commit()
+        return {
+            "dataset_id": dataset_id,
+            "manifest_hash": dataset.manifest_hash,
+            "archive_bytes": archive.stat().st_size,
+            "incremental": incremental,
+        }
+
+    async def process_enqueued(self, db: Session, payload: dict) -> dict:
+        # 워커에서 호출
+        return await self.pool.run_io("dataset_build", self.build, db, payload["dataset_id"])
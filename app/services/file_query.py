@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+from app.models.file import File
+from app.schemas.file import FileItem
+from app.utils.geohash import BBox, cell_ranges, cover, meters_per_degree, radius_bbox
+
+
+# 목록 응답에 쓸 수 있는 컬럼 (기본값: 전체)
+FILE_FIELDS: Tuple[str, ...] = tuple(FileItem.model_fields)
+
+
+def parse_fields(value: Optional[str]) -> Tuple[str, ...]:
+    # fields=id,stored_path 형태의 응답 컬럼 선택 (중복 제거, 순서 유지)
+    if not value:
+        return FILE_FIELDS
+    names = tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in FILE_FIELDS]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def file_columns(fields: Tuple[str, ...], extra: Tuple[str, ...] = ()) -> list:
+    # 고른 컬럼을 앞에 두고 (dict(zip(fields, row))로 응답 항목 구성) 내부에 필요한 컬럼을 뒤에 붙임
+    return [getattr(File, name) for name in (*fields, *(name for name in extra if name not in fields))]
+
+
+def parse_datetime(value: str) -> datetime:
+    # ISO8601 문자열 (Z 접미사 허용)
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid datetime: {value}") from exc
+
+
+def build_file_filters(
+    vehicle_id: Optional[str] = None,
+    source: Optional[str] = None,
+    route_id: Optional[str] = None,
+    media_type: Optional[str] = None,
+    min_blur: Optional[float] = None,
+    captured_from: Optional[str] = None,
+    captured_to: Optional[str] = None,
+    bbox: Optional[str] = None,
+    near_lat: Optional[float] = None,
+    near_lon: Optional[float] = None,
+    radius_m: Optional[float] = None,
+) -> list:
+    # 조회/다운로드/데이터셋이 공통으로 쓰는 files 필터 조건
+    filters = []
+    if vehicle_id:
+        filters.append(File.vehicle_id == vehicle_id)
+    if source:
+        filters.append(File.source == source)
+    if route_id:
+        filters.append(File.route_id == route_id)
+    if media_type:
+        filters.append(File.media_type == media_type)
+    if min_blur is not None:
+        filters.append(File.blur_score >= min_blur)
+    if captured_from:
+        filters.append(File.captured_at >= parse_datetime(captured_from))
+    if captured_to:
+        filters.append(File.captured_at <= parse_datetime(captured_to))
+    if bbox:
+        filters.extend(_region_filters(parse_bbox(bbox)))
+    if near_lat is not None or near_lon is not None or radius_m is not None:
+        if near_lat is None or near_lon is None or radius_m is None:
+            raise HTTPException(status_code=400, detail="near_lat, near_lon and radius_m must be given together")
+        filters.extend(_region_filters(radius_bbox(near_lat, near_lon, radius_m)))
+        # 반경 조건은 짧은 거리용 등장방형 근사 (SQLite에도 있는 사칙연산만 사용)
+        kx, ky = meters_per_degree(near_lat)
+        dx = (File.location_lon - near_lon) * kx
+        dy = (File.location_lat - near_lat) * ky
+        filters.append(dx * dx + dy * dy <= radius_m * radius_m)
+    return filters
+
+
+def parse_bbox(value: str) -> BBox:
+    # "west,south,east,north" (경도/위도, GeoJSON 순서)
+    try:
+        west, south, east, north = (float(v) for v in value.split(","))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid bbox: {value}") from exc
+    if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+        raise HTTPException(status_code=400, detail=f"Invalid bbox: {value}")
+    return west, south, east, north
+
+
+def _region_filters(region: BBox) -> list:
+    # 영역을 덮는 지오해시 셀 범위(geohash 인덱스 범위 조회) + 경계 셀의 바깥을 거르는 좌표 조건
+    west, south, east, north = region
+    cells = [
+        and_(File.geohash >= lo, File.geohash < hi) if hi is not None else File.geohash >= lo
+        for lo, hi in cell_ranges(cover(region))
+    ]
+    return [
+        or_(*cells),
+        File.location_lon.between(west, east),
+        File.location_lat.between(south, north),
+    ]
+
+
+def encode_cursor(captured_at: datetime, file_id: str) -> str:
+    # (captured_at, id) 키셋 위치를 불투명 문자열로 인코딩
+    raw = json.dumps([captured_at.isoformat(), file_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        captured_at, file_id = json.loads(raw)
+        return datetime.fromisoformat(captured_at), str(file_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def after_cursor(cursor: str):
+    # (captured_at, id) > (커서 값) 조건 - 정렬 키 인덱스를 타고 바로 다음 위치부터 읽음
+    captured_at, file_id = decode_cursor(cursor)
+    return or_(
+        File.captured_at > captured_at,
+        and_(File.captured_at == captured_at, File.id > file_id),
+    )
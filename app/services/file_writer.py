@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, insert
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.models.file import File
+from app.schemas.upload import Metadata, MediaType
+from app.services.blob_store import register_refs
+from app.services.response_cache import INSERTS, UPDATES, mark_changed
+from app.services.stats_rollup import apply_rollups
+from app.services.timeseries import apply_timeseries
+from app.utils import geohash
+from app.utils.phash import BAND_COUNT, bands, from_hex
+from app.utils.zipstream import ZipEntry
+
+# computed dict에서 files 컬럼으로 승격된 품질 지표 (컬럼명 = 키)
+QUALITY_COLUMNS = ("blur_score", "width", "height", "fps", "duration_sec", "frame_count")
+# computed["phash"](16자리 hex)를 나눠 저장하는 밴드 컬럼
+PHASH_COLUMNS = tuple(f"phash_b{i}" for i in range(BAND_COUNT))
+
+
+def build_file_row(
+    file_id: str,
+    original_filename: str,
+    stored_path: str | Path,
+    processed_path: str | Path,
+    media_type: MediaType,
+    size_bytes: int,
+    file_hash: str,
+    meta: Metadata,
+    computed: dict,
+) -> dict:
+    # files 테이블 한 행에 해당하는 컬럼 dict 구성
+    return {
+        "id": file_id,
+        "original_filename": original_filename,
+        "stored_path": str(stored_path),
+        "processed_path": str(processed_path),
+        "media_type": media_type,
+        "size_bytes": size_bytes,
+        "sha256": file_hash,
+        "vehicle_id": meta.vehicle_id,
+        "captured_at": datetime.fromisoformat(meta.captured_at.replace("Z", "+00:00")),
+        "source": meta.source,
+        "route_id": meta.route_id,
+        "location_lat": meta.location_lat,
+        "location_lon": meta.location_lon,
+        "geohash": location_geohash(meta.location_lat, meta.location_lon),
+        "weather": meta.weather,
+        "note": meta.note,
+        **quality_columns(computed),
+        "meta_json": meta.model_dump(),
+        "computed_json": computed,
+    }
+
+
+def location_geohash(lat: Optional[float], lon: Optional[float]) -> Optional[str]:
+    if lat is None or lon is None:
+        return None
+    return geohash.encode(lat, lon)
+
+
+def quality_columns(computed: dict) -> dict:
+    return {**{name: computed.get(name) for name in QUALITY_COLUMNS}, **phash_columns(computed.get("phash"))}
+
+
+def phash_columns(value: Optional[str]) -> dict:
+    parts = bands(from_hex(value)) if value else (None,) * BAND_COUNT
+    return dict(zip(PHASH_COLUMNS, parts))
+
+
+def file_record(row: dict) -> dict:
+    # 응답/메타 파일용 레코드 (DB 재조회 없이 메모리 값으로 구성)
+    return {
+        "id": row["id"],
+        "original_filename": row["original_filename"],
+        "stored_path": row["stored_path"],
+        "processed_path": row["processed_path"],
+        "media_type": row["media_type"],
+        "size_bytes": row["size_bytes"],
+        "sha256": row["sha256"],
+        "meta": row["meta_json"],
+        "computed": row["computed_json"],
+    }
+
+
+def insert_files(db: Session, rows: Iterable[dict]) -> None:
+    # 여러 행을 한 번의 INSERT ... VALUES로 기록하고 통계 집계(중복 제거 모드면 블롭 참조 수도)를
+    # 같은 트랜잭션에서 갱신
+    # (커밋은 호출자가 담당)
+    rows = list(rows)
+    if rows:
+        db.execute(insert(File), rows)
+        apply_rollups(db, rows)
+        apply_timeseries(db, rows)
+        if settings.dedup_mode:
+            register_refs(db, rows)
+        mark_changed(db, INSERTS)
+
+
+def update_crcs(db: Session, crcs: Iterable[Tuple[str, int, int]]) -> None:
+    # 처리 파일 CRC-32와 크기를 id별로 한 번의 executemany로 기록 (커밋은 호출자가 담당)
+    params = [{"b_id": file_id, "b_crc32": crc, "b_size": size} for file_id, crc, size in crcs]
+    if params:
+        table = File.__table__
+        db.execute(
+            table.update()
+            .where(table.c.id == bindparam("b_id"))
+            .values(crc32=bindparam("b_crc32"), processed_size=bindparam("b_size")),
+            params,
+        )
+        mark_changed(db, UPDATES)
+
+
+def save_entry_crcs(found: List[Tuple[ZipEntry, int]]) -> None:
+    # ZipStream(on_crcs=...)용: 스트리밍 중 계산한 CRC를 저장 (스트리밍은 요청 세션이 닫힌 뒤에도 진행되므로 별도 세션)
+    # 저장에 실패해도 응답은 계속 보내고 다음 요청에서 다시 계산
+    try:
+        with SessionLocal() as db:
+            update_crcs(db, [(entry.file_id, crc, entry.size) for entry, crc in found if entry.file_id is not None])
+            db.commit()
+    except Exception:  # noqa: BLE001
+        metrics.incr("zip_crc_save_errors")
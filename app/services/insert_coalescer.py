@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.core.workers import WorkerPool, worker_pool
+from app.services.file_writer import insert_files
+
+
+class _LoopState:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.pending: List[Tuple[dict, asyncio.Future, float]] = []
+        self.full = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class InsertCoalescer:
+    # 동시에 들어온 업로드의 files 행을 짧은 창(window_ms) 동안 모아 한 번의 INSERT ... VALUES + 한 번의 커밋으로 기록
+    # 한 번에 하나의 배치만 기록하고, 기록하는 동안 들어온 행은 다음 배치로 모임 (그룹 커밋)
+    def __init__(self, pool: WorkerPool, window_ms: float, max_rows: int, target_ms: float = 0.0) -> None:
+        self.pool = pool
+        self.window_ms = window_ms
+        self.max_rows = max_rows
+        # 지연 목표(0이면 끔): 대기 창 + 최근 기록 시간이 목표를 넘지 않도록 창을 줄임
+        self.target_ms = target_ms
+        self._write_ms = 0.0  # 배치 기록 시간의 지수 이동 평균
+        self._state: Optional[_LoopState] = None
+
+    def current_window_ms(self) -> float:
+        if self.target_ms <= 0:
+            return self.window_ms
+        return max(0.0, min(self.window_ms, self.target_ms - self._write_ms))
+
+    def _loop_state(self) -> _LoopState:
+        # 이벤트 루프마다 상태를 새로 만든다 (테스트 클라이언트는 요청마다 루프가 다를 수 있음)
+        loop = asyncio.get_running_loop()
+        if self._state is None or self._state.loop is not loop:
+            self._state = _LoopState(loop)
+        return self._state
+
+    async def insert(self, row: dict) -> None:
+        # 행이 커밋되면 반환 (해당 행의 INSERT가 실패하면 그 예외를 그대로 올림)
+        state = self._loop_state()
+        future = state.loop.create_future()
+        state.pending.append((row, future, time.perf_counter()))
+        if len(state.pending) >= self.max_rows:
+            state.full.set()
+        if state.task is None or state.task.done():
+            state.task = state.loop.create_task(self._drain(state))
+        await future
+
+    async def _drain(self, state: _LoopState) -> None:
+        while state.pending:
+            window_ms = self.current_window_ms()
+            if len(state.pending) < self.max_rows and window_ms > 0:
+                try:
+                    await asyncio.wait_for(state.full.wait(), window_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+            state.full.clear()
+            batch = state.pending[: self.max_rows]
+            del state.pending[: self.max_rows]
+            start = time.perf_counter()
+            try:
+                errors = await self.pool.run_io("db_commit", _write_rows, [row for row, _, _ in batch])
+            except Exception as exc:  # noqa: BLE001
+                errors = [exc] * len(batch)
+            now = time.perf_counter()
+            self._write_ms = 0.8 * self._write_ms + 0.2 * (now - start) * 1000
+            metrics.incr("insert_batches")
+            metrics.incr("insert_rows", len(batch))
+            for (_, future, queued_at), error in zip(batch, errors):
+                metrics.observe("insert_coalesce_wait", now - queued_at)
+                if future.done():  # 요청이 취소된 경우 (행은 이미 기록됨)
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+
+def _write_rows(rows: List[dict]) -> List[Optional[Exception]]:
+    # 배치 전체를 한 트랜잭션으로 기록, 실패하면 행별로 다시 시도해 문제 있는 행만 실패 처리
+    with SessionLocal() as db:
+        try:
+            insert_files(db, rows)
+            db.commit()
+            return [None] * len(rows)
+        except Exception:  # noqa: BLE001
+            db.rollback()
+        metrics.incr("insert_batch_fallbacks")
+        errors: List[Optional[Exception]] = []
+        for row in rows:
+            try:
+                insert_files(db, [row])
+                db.commit()
+                errors.append(None)
+            except Exception as exc:  # noqa: BLE001
+                db.rollback()
+                errors.append(exc)
+        return errors
+
+
+insert_coalescer = InsertCoalescer(
+    worker_pool,
+    window_ms=settings.insert_coalesce_window_ms,
+    max_rows=settings.insert_coalesce_max_rows,
+    target_ms=settings.insert_coalesce_target_ms,
+)
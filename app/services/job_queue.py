@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update, and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.processing_job import ProcessingJob, JOB_PENDING, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED
+
+CLAIM_RETRIES = 5  # 다른 워커와 선점 경쟁에서 졌을 때 다시 시도하는 횟수
+
+
+class JobQueue:
+    # processing_jobs 테이블을 큐로 사용 (메시지 큐 도입 전 로컬 대체재)
+    def __init__(
+        self,
+        lease_sec: int = settings.job_lease_sec,
+        max_attempts: int = settings.job_max_attempts,
+        backoff_base_sec: float = settings.job_backoff_base_sec,
+        backoff_max_sec: float = settings.job_backoff_max_sec,
+    ):
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+
+    def enqueue(self, db: Session, job_type: str, payload: dict) -> ProcessingJob:
+        now = datetime.utcnow()
+        job = ProcessingJob(
+            job_type=job_type,
+            status=JOB_PENDING,
+            payload=payload,
+            max_attempts=self.max_attempts,
+            available_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(job)
+        db.commit()
+        return job
+
+    def _claimable(self, now: datetime, job_types: Optional[Iterable[str]]):
+        # 대기 중이면서 실행 가능 시각이 지났거나, 실행 중이지만 리스가 만료된(워커 사망) 작업
+        cond = or_(
+            and_(ProcessingJob.status == JOB_PENDING, ProcessingJob.available_at <= now),
+            and_(ProcessingJob.status == JOB_RUNNING, ProcessingJob.lease_expires_at < now),
+        )
+        if job_types is not None:
+            cond = and_(cond, ProcessingJob.job_type.in_(list(job_types)))
+        return cond
+
+    def claim(self, db: Session, worker_id: str, job_types: Optional[Iterable[str]] = None) -> Optional[ProcessingJob]:
+        # 조건부 UPDATE로 선점 → rowcount가 1일 때만 내 작업 (SQLite/PostgreSQL 공통)
+        for _ in range(CLAIM_RETRIES):
+            now = datetime.utcnow()
+            cond = self._claimable(now, job_types)
+            job_id = db.scalar(
+                select(ProcessingJob.id).where(cond).order_by(ProcessingJob.available_at, ProcessingJob.id).limit(1)
+            )
+            if job_id is None:
+                db.rollback()
+                return None
+            res = db.execute(
+                update(ProcessingJob)
+                .where(ProcessingJob.id == job_id, cond)
+                .values(
+                    status=JOB_RUNNING,
+                    lease_owner=worker_id,
+                    lease_expires_at=now + timedelta(seconds=self.lease_sec),
+                    attempts=ProcessingJob.attempts + 1,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            if res.rowcount == 1:
+                job = db.get(ProcessingJob, job_id, populate_existing=True)
+                if job.attempts > job.max_attempts:
+                    # 리스 만료로 재선점됐지만 시도 횟수를 다 쓴 작업
+                    self._mark_failed(db, job, job.last_error or "Lease expired too many times")
+                    continue
+                return job
+        return None
+
+    def extend_lease(self, db: Session, job: ProcessingJob) -> None:
+        job.lease_expires_at = datetime.utcnow() + timedelta(seconds=self.lease_sec)
+        db.commit()
+
+    def checkpoint(self, db: Session, job_id: int, progress: dict) -> None:
+        # 긴 작업의 진행 상황을 result에 기록하고 리스를 연장 (재시도 시 이 지점부터 재개)
+        now = datetime.utcnow()
+        db.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id)
+            .values(result=progress, lease_expires_at=now + timedelta(seconds=self.lease_sec), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    def progress(self, db: Session, job_id: int) -> dict:
+        # 마지막 체크포인트 (없으면 빈 dict)
+        return db.scalar(select(ProcessingJob.result).where(ProcessingJob.id == job_id)) or {}
+
+    def complete(self, db: Session, job: ProcessingJob, result: dict) -> None:
+        job.status = JOB_SUCCEEDED
+        job.result = result
+        job.last_error = None
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.updated_at = datetime.utcnow()
+        db.commit()
+
+    def _mark_failed(self, db: Session, job: ProcessingJob, error: str) -> None:
+        job.status = JOB_FAILED
+        job.last_error = error[:1024]
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.updated_at = datetime.utcnow()
+        db.commit()
+
+    def fail(self, db: Session, job: ProcessingJob, error: str, retryable: bool = True) -> None:
+        # 재시도 가능하면 지수 백오프 후 다시 대기열로, 아니면 실패 확정
+        if not retryable or job.attempts >= job.max_attempts:
+            self._mark_failed(db, job, error)
+            return
+        delay = min(self.backoff_max_sec, self.backoff_base_sec * (2 ** (job.attempts - 1)))
+        now = datetime.utcnow()
+        job.status = JOB_PENDING
+        job.last_error = error[:1024]
+        job.available_at = now + timedelta(seconds=delay)
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.updated_at = now
+        db.commit()
+
+
+job_queue = JobQueue()
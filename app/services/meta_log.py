@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import argparse
+import bisect
+import fcntl
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.settings import settings
+from app.models.file import File
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row, insert_files
+
+# 업로드 메타 레코드(file_record)를 파일 하나씩 쓰는 대신 세그먼트 파일(JSONL)에 이어 씀
+#   NNNNNNNN.jsonl : 레코드 한 줄씩 (활성 세그먼트는 하나, 크기가 넘치면 봉인하고 다음 번호로)
+#   NNNNNNNN.idx   : 봉인된 세그먼트의 id 정렬 인덱스 (고정 폭 → mmap 이진 탐색으로 id 조회)
+#   .lock          : 쓰기/봉인/병합 교체/조회를 줄 세우는 flock (API 프로세스와 처리 워커가 같은 디렉터리에 씀)
+#   .compact.lock  : 병합 중(배타)/전체 읽기 중(공유) 표시 → 다른 프로세스가 읽고 있는 세그먼트를 지우지 않음
+SEGMENT_RE = re.compile(r"^(\d{8})\.jsonl$")
+ID_WIDTH = 64  # files.id 컬럼 길이
+INDEX_ENTRY = struct.Struct(f"<{ID_WIDTH}sQI")  # (id, 오프셋, 길이)
+
+LOCK_NAME = ".lock"
+COMPACT_LOCK_NAME = ".compact.lock"
+
+Location = Tuple[int, int]  # (오프셋, 길이)
+
+
+def _segment_path(root: Path, number: int) -> Path:
+    return root / f"{number:08d}.jsonl"
+
+
+def _index_path(root: Path, number: int) -> Path:
+    return root / f"{number:08d}.idx"
+
+
+def _encode(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _scan(path: Path, start: int = 0) -> Tuple[Dict[str, Location], int]:
+    # 세그먼트를 start부터 읽어 id → 위치 (같은 id는 뒤의 것), 마지막 완전한 줄까지의 크기
+    index: Dict[str, Location] = {}
+    offset = start
+    with path.open("rb") as f:
+        f.seek(start)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # 쓰다 끊긴 마지막 줄
+            try:
+                index[json.loads(line)["id"]] = (offset, len(line))
+            except (ValueError, KeyError):
+                break
+            offset += len(line)
+    return index, offset
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(path.name + ".tmp")
+
+
+def _write_index(path: Path, index: Dict[str, Location]) -> None:
+    # 임시 파일에 쓴 뒤 교체 (교체 전에 끊기면 임시 파일은 다음 열기 때 지움)
+    tmp = _tmp_path(path)
+    with tmp.open("wb") as f:
+        for file_id in sorted(index):
+            offset, length = index[file_id]
+            f.write(INDEX_ENTRY.pack(file_id.encode(), offset, length))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_index(path: Path) -> Iterator[Tuple[str, int, int]]:
+    data = path.read_bytes()
+    for raw_id, offset, length in INDEX_ENTRY.iter_unpack(data):
+        yield raw_id.rstrip(b"\0").decode(), offset, length
+
+
+def _lookup(path: Path, file_id: str) -> Optional[Location]:
+    # 정렬된 고정 폭 인덱스에서 이진 탐색
+    key = file_id.encode().ljust(ID_WIDTH, b"\0")
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            n = len(mm) // INDEX_ENTRY.size
+
+            class _Keys:
+                def __len__(self) -> int:
+                    return n
+
+                def __getitem__(self, i: int) -> bytes:
+                    return mm[i * INDEX_ENTRY.size : i * INDEX_ENTRY.size + ID_WIDTH]
+
+            i = bisect.bisect_left(_Keys(), key)
+            if i < n:
+                raw_id, offset, length = INDEX_ENTRY.unpack_from(mm, i * INDEX_ENTRY.size)
+                if raw_id == key:
+                    return offset, length
+    return None
+
+
+def _read_at(path: Path, location: Location) -> dict:
+    offset, length = location
+    with path.open("rb") as f:
+        return json.loads(os.pread(f.fileno(), length, offset))
+
+
+class MetaLog:
+    # 디스크 상태(세그먼트 번호, 인덱스 유무, 활성 세그먼트 크기)가 기준이고 메모리 상태는 캐시
+    # → 잠금을 잡을 때마다 디렉터리를 다시 보고 다른 프로세스가 이어 쓴 부분만 읽어 따라잡음
+    def __init__(
+        self,
+        root: str | Path,
+        segment_bytes: int,
+        compact_segments: int,
+        fsync: bool = False,
+    ) -> None:
+        self.root = Path(root)
+        self.segment_bytes = segment_bytes
+        self.compact_segments = compact_segments  # 봉인 세그먼트가 이 수 이상이면 백그라운드 병합
+        self.fsync = fsync
+        self._cond = threading.Condition()
+        self._opened = False
+        self._sealed: List[int] = []
+        self._active = 0
+        self._active_file = None
+        self._active_size = 0  # 활성 세그먼트에서 인덱스에 반영한 크기 (다른 프로세스 기록 포함)
+        self._active_index: Dict[str, Location] = {}
+        # 그룹 커밋 상태: 대기 중 레코드, 발급/기록 완료 순번, 기록 담당 스레드 유무
+        self._pending: List[Tuple[str, bytes]] = []
+        self._next_seq = 0
+        self._written_seq = 0
+        self._writing = False
+        self._failures: List[Tuple[int, int, BaseException]] = []  # 실패한 기록의 순번 구간 (최근 것만)
+        self._compacting = False
+
+    # 잠금/상태 갱신 -----------------------------------------------------------
+
+    @contextmanager
+    def _flock(self, name: str = LOCK_NAME, mode: int = fcntl.LOCK_EX) -> Iterator[None]:
+        # 잡을 때마다 파일을 새로 열어 flock → 다른 프로세스뿐 아니라 같은 프로세스의 다른 스레드와도 배타
+        # (메모리 상태도 이 잠금 안에서만 읽고 씀), LOCK_NB로 못 잡으면 BlockingIOError
+        self.root.mkdir(parents=True, exist_ok=True)
+        with (self.root / name).open("ab") as f:
+            fcntl.flock(f.fileno(), mode)
+            yield
+
+    def _open(self) -> None:
+        # 최초 사용 시 중단된 기록의 임시 파일 정리 (호출자가 .lock 보유)
+        if self._opened:
+            return
+        # 인덱스 임시 파일은 .lock 안에서만 쓰므로 지워도 됨, 병합 임시 세그먼트는 진행 중인 병합이 없을 때만
+        for tmp in self.root.glob("*.idx.tmp"):
+            tmp.unlink()
+        try:
+            with self._flock(COMPACT_LOCK_NAME, fcntl.LOCK_EX | fcntl.LOCK_NB):
+                for tmp in self.root.glob("*.tmp"):
+                    tmp.unlink()
+        except BlockingIOError:
+            pass
+        self._opened = True
+
+    def _refresh(self) -> None:
+        # 디렉터리를 다시 읽어 봉인/병합/다른 프로세스의 기록을 반영 (호출자가 .lock 보유)
+        self._open()
+        numbers = sorted(int(m.group(1)) for p in self.root.iterdir() if (m := SEGMENT_RE.match(p.name)))
+        for number in numbers[:-1]:
+            if not _index_path(self.root, number).exists():
+                # 봉인 도중 끊긴 세그먼트: 인덱스를 다시 만듦
+                _write_index(_index_path(self.root, number), _scan(_segment_path(self.root, number))[0])
+        if numbers and not _index_path(self.root, numbers[-1]).exists():
+            self._sealed, active = numbers[:-1], numbers[-1]
+        else:
+            self._sealed, active = numbers, (numbers[-1] + 1 if numbers else 1)
+        if active != self._active or self._active_file is None:
+            # 다른 프로세스가 봉인했거나 처음 열기: 새 활성 세그먼트를 처음부터 읽음
+            if self._active_file is not None:
+                self._active_file.close()
+            self._active = active
+            self._active_file = _segment_path(self.root, active).open("ab")
+            self._active_size = 0
+            self._active_index = {}
+        size = os.fstat(self._active_file.fileno()).st_size
+        if size != self._active_size:
+            index, end = _scan(_segment_path(self.root, self._active), self._active_size)
+            self._active_index.update(index)
+            if end < size:
+                # 쓰는 쪽은 잠금 안에서만 쓰므로 잠금을 잡은 지금 보이는 미완성 줄은 중단된 기록 → 제거
+                os.ftruncate(self._active_file.fileno(), end)
+            self._active_size = end
+
+    def close(self) -> None:
+        with self._flock():
+            if self._active_file is not None:
+                self._active_file.close()
+            self._active_file = None
+            self._opened = False
+
+    # 쓰기 (그룹 커밋) --------------------------------------------------------
+
+    def append(self, record: dict) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[dict]) -> None:
+        # 동시에 들어온 레코드를 먼저 온 스레드가 모아서 한 번의 write(+fsync)로 기록,
+        # 나머지는 자기 순번이 기록될 때까지 기다림
+        items = [(r["id"], _encode(r)) for r in records]
+        if not items:
+            return
+        with self._cond:
+            self._pending.extend(items)
+            self._next_seq += len(items)
+            seq = self._next_seq
+            while self._written_seq < seq:
+                if self._writing:
+                    self._cond.wait()
+                    continue
+                self._writing = True
+                batch, self._pending = self._pending, []
+                self._cond.release()
+                try:
+                    error = None
+                    try:
+                        self._write(batch)
+                    except BaseException as exc:  # noqa: BLE001
+                        error = exc
+                finally:
+                    self._cond.acquire()
+                self._writing = False
+                first = self._written_seq + 1
+                self._written_seq += len(batch)
+                if error is not None:
+                    self._failures = [*self._failures[-15:], (first, self._written_seq, error)]
+                self._cond.notify_all()
+            for first, last, error in self._failures:
+                if first <= seq and seq - len(items) < last:
+                    raise error
+
+    def _write(self, batch: List[Tuple[str, bytes]]) -> None:
+        # 기록 담당 스레드만 호출: 잠금 안에서 디스크 상태를 따라잡은 뒤 실제 파일 끝(fstat)에 씀
+        with self._flock():
+            self._refresh()
+            offset = self._active_size
+            locations = {}
+            for file_id, line in batch:
+                locations[file_id] = (offset, len(line))
+                offset += len(line)
+            try:
+                self._active_file.write(b"".join(line for _, line in batch))
+                self._active_file.flush()
+                if self.fsync:
+                    os.fsync(self._active_file.fileno())
+            except BaseException:
+                os.ftruncate(self._active_file.fileno(), self._active_size)  # 일부만 써진 줄은 버림
+                raise
+            self._active_index.update(locations)
+            self._active_size = offset
+            if self._active_size >= self.segment_bytes:
+                self._seal()
+
+    def _seal(self) -> None:
+        # 활성 세그먼트 봉인: 인덱스를 쓰고 다음 세그먼트 시작 (호출자가 .lock 보유)
+        _write_index(_index_path(self.root, self._active), self._active_index)
+        self._active_file.close()
+        self._sealed.append(self._active)
+        self._active += 1
+        self._active_file = _segment_path(self.root, self._active).open("ab")
+        self._active_size = 0
+        self._active_index = {}
+        if len(self._sealed) >= self.compact_segments:
+            with self._cond:
+                if self._compacting:
+                    return
+                self._compacting = True
+            threading.Thread(target=self._compact_in_background, name="meta-log-compact", daemon=True).start()
+
+    # 읽기 ---------------------------------------------------------------
+
+    def get(self, file_id: str) -> Optional[dict]:
+        # 활성 세그먼트는 메모리 인덱스, 봉인 세그먼트는 최신 것부터 인덱스 이진 탐색 (전체 스캔 없음)
+        with self._flock():
+            self._refresh()
+            location = self._active_index.get(file_id)
+            if location is not None:
+                return _read_at(_segment_path(self.root, self._active), location)
+            for number in reversed(self._sealed):
+                location = _lookup(_index_path(self.root, number), file_id)
+                if location is not None:
+                    return _read_at(_segment_path(self.root, number), location)
+        return None
+
+    def records(self) -> Iterator[dict]:
+        # 전체 레코드를 기록 순서대로 (같은 id는 마지막 것만) - 복구/재구성용
+        # 읽는 동안 병합 잠금을 공유로 잡아 다른 프로세스의 병합이 세그먼트를 지우지 못하게 함
+        with self._flock(COMPACT_LOCK_NAME, fcntl.LOCK_SH):
+            with self._flock():
+                self._refresh()
+                segments = [*self._sealed, self._active]
+                active_index = dict(self._active_index)
+                active_size = self._active_size
+            latest: Dict[str, Tuple[int, int]] = {}
+            for number in segments[:-1]:
+                for file_id, offset, _ in _read_index(_index_path(self.root, number)):
+                    latest[file_id] = (number, offset)
+            for file_id, (offset, _) in active_index.items():
+                latest[file_id] = (segments[-1], offset)
+            for number in segments:
+                with _segment_path(self.root, number).open("rb") as f:
+                    offset = 0
+                    for line in f:
+                        if not line.endswith(b"\n") or (number == segments[-1] and offset >= active_size):
+                            break
+                        record = json.loads(line)
+                        if latest.get(record["id"]) == (number, offset):
+                            yield record
+                        offset += len(line)
+
+    # 병합 ---------------------------------------------------------------
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        finally:
+            with self._cond:
+                self._compacting = False
+
+    def compact(self) -> int:
+        # 봉인 세그먼트들을 하나로 병합 (같은 id는 마지막 레코드만 남김), 병합한 세그먼트 수 반환
+        # 봉인 세그먼트는 바뀌지 않으므로 무거운 복사는 .lock 밖에서, 교체만 .lock 안에서 수행
+        # 다른 병합이나 전체 읽기가 진행 중이면 (다른 프로세스 포함) 이번에는 건너뜀
+        try:
+            with self._flock(COMPACT_LOCK_NAME, fcntl.LOCK_EX | fcntl.LOCK_NB):
+                return self._compact()
+        except BlockingIOError:
+            return 0
+
+    def _compact(self) -> int:
+        with self._flock():
+            self._refresh()
+            numbers = list(self._sealed)
+        if len(numbers) < 2:
+            return 0
+        latest: Dict[str, Tuple[int, int]] = {}
+        for number in numbers:
+            for file_id, offset, _ in _read_index(_index_path(self.root, number)):
+                latest[file_id] = (number, offset)
+
+        target = numbers[-1]
+        tmp_segment = _tmp_path(_segment_path(self.root, target))
+        merged: Dict[str, Location] = {}
+        out_offset = 0
+        with tmp_segment.open("wb") as out:
+            for number in numbers:
+                entries = sorted(
+                    (offset, length, file_id)
+                    for file_id, offset, length in _read_index(_index_path(self.root, number))
+                    if latest[file_id] == (number, offset)
+                )
+                with _segment_path(self.root, number).open("rb") as f:
+                    for offset, length, file_id in entries:
+                        out.write(os.pread(f.fileno(), length, offset))
+                        merged[file_id] = (out_offset, length)
+                        out_offset += length
+            out.flush()
+            os.fsync(out.fileno())
+
+        with self._flock():
+            # 병합본을 가장 최근 번호로 교체하고 이전 세그먼트 삭제
+            # 인덱스를 먼저 지우므로 도중에 끊겨도 다음 열기 때 그 세그먼트를 스캔해 인덱스를 다시 만듦
+            _index_path(self.root, target).unlink()
+            os.replace(tmp_segment, _segment_path(self.root, target))
+            _write_index(_index_path(self.root, target), merged)
+            for number in numbers[:-1]:
+                _index_path(self.root, number).unlink(missing_ok=True)
+                _segment_path(self.root, number).unlink(missing_ok=True)
+            self._sealed = [n for n in self._sealed if n not in numbers[:-1]]
+        return len(numbers)
+
+
+meta_log = MetaLog(
+    settings.meta_path,
+    segment_bytes=settings.meta_log_segment_mb * 1024 * 1024,
+    compact_segments=settings.meta_log_compact_segments,
+    fsync=settings.storage_fsync,
+)
+
+
+def rebuild_database(log: MetaLog = meta_log, chunk_size: int = 500) -> int:
+    # 재해 복구: 로그의 레코드로 files 행(및 집계)을 다시 만듦 (이미 있는 id는 건너뜀), 추가한 행 수 반환
+    Base.metadata.create_all(bind=engine)
+    inserted = 0
+
+    def flush(chunk: List[dict]) -> int:
+        with SessionLocal() as db:
+            existing = set(db.scalars(select(File.id).where(File.id.in_([r["id"] for r in chunk]))))
+            rows = [
+                build_file_row(
+                    file_id=r["id"],
+                    original_filename=r["original_filename"],
+                    stored_path=r["stored_path"],
+                    processed_path=r["processed_path"],
+                    media_type=r["media_type"],
+                    size_bytes=r["size_bytes"],
+                    file_hash=r["sha256"],
+                    meta=Metadata(**r["meta"]),
+                    computed=r["computed"],
+                )
+                for r in chunk
+                if r["id"] not in existing
+            ]
+            insert_files(db, rows)
+            db.commit()
+            return len(rows)
+
+    chunk: List[dict] = []
+    for record in log.records():
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            inserted += flush(chunk)
+            chunk = []
+    if chunk:
+        inserted += flush(chunk)
+    return inserted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="업로드 메타 로그 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("compact", help="봉인된 세그먼트 병합")
+    get = sub.add_parser("get", help="id로 레코드 조회")
+    get.add_argument("file_id")
+    sub.add_parser("rebuild-db", help="로그로 DB files 행 재구성 (DATABASE_URL 대상)")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        print(f"merged {meta_log.compact()} segments")
+    elif args.command == "get":
+        record = meta_log.get(args.file_id)
+        print(json.dumps(record, ensure_ascii=False, indent=2) if record else "not found")
+    else:
+        print(f"inserted {rebuild_database()} rows")
+
+
+if __name__ == "__main__":
+    main()
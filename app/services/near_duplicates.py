@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import select, or_
+from sqlalchemy.orm import Session
+
+from app.models.file import File
+from app.utils.phash import BAND_COUNT, BKTree, band_neighbors, bands, from_bands, hamming
+
+T = TypeVar("T")
+
+MAX_DISTANCE = 11  # 밴드당 탐색 반경 k // 4 <= 2 (밴드마다 최대 137개 값 조회)
+BAND_COLUMNS = (File.phash_b0, File.phash_b1, File.phash_b2, File.phash_b3)
+
+
+def row_phash(row) -> Optional[int]:
+    parts = tuple(getattr(row, col.key) for col in BAND_COLUMNS)
+    return None if parts[0] is None else from_bands(parts)
+
+
+def find_near(
+    db: Session, value: int, k: int, limit: int = 100, exclude_id: Optional[str] = None
+) -> List[Tuple[File, int]]:
+    # 해밍 거리 k 이내 파일: 밴드 인덱스로 후보만 좁힌 뒤(전체 스캔 없음) 실제 거리로 확인
+    radius = k // BAND_COUNT
+    conds = [col.in_(band_neighbors(part, radius)) for col, part in zip(BAND_COLUMNS, bands(value))]
+    stmt = select(File).where(or_(*conds))
+    if exclude_id is not None:
+        stmt = stmt.where(File.id != exclude_id)
+    matches = []
+    for obj in db.scalars(stmt):
+        d = hamming(value, row_phash(obj))
+        if d <= k:
+            matches.append((obj, d))
+    matches.sort(key=lambda m: (m[1], m[0].captured_at, m[0].id))
+    return matches[:limit]
+
+
+def drop_near_duplicates(rows: Iterable[T], k: int, key: Callable[[T], Optional[int]] = row_phash) -> Iterator[T]:
+    # 순서대로 보면서 이미 내보낸 프레임과 거리 k 이내인 행은 건너뜀 (해시 없는 행은 그대로 통과)
+    # 내보낸 해시는 BK-트리에 쌓아 행마다 전체 비교 없이 확인
+    kept = BKTree()
+    for row in rows:
+        value = key(row)
+        if value is not None:
+            if kept.has_within(value, k):
+                continue
+            kept.add(value)
+        yield row
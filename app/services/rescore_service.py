@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from itertools import chain
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.core.workers import WorkerPool, worker_pool
+from app.models.blob import Blob
+from app.models.file import File
+from app.models.processing_job import ProcessingJob
+from app.services.file_writer import phash_columns
+from app.services.job_queue import job_queue
+from app.services.response_cache import UPDATES, mark_changed
+from app.services.stats_rollup import adjust_blur_rollups, refresh_blur_extremes
+from app.utils.quality import score_images
+
+RESCORE_JOB = "rescore_files"
+
+# 청크 조회 컬럼 (롤업 보정에 필요한 키 + 이전 blur_score 포함)
+CHUNK_COLUMNS = (
+    File.id,
+    File.processed_path,
+    File.sha256,
+    File.computed_json,
+    File.blur_score,
+    File.captured_at,
+    File.media_type,
+    File.vehicle_id,
+    File.route_id,
+)
+
+
+def _progress(cursor: str, processed: int, updated: int, elapsed: float) -> dict:
+    # 체크포인트/결과 공통 형식 (처리량은 재개 전 구간까지 포함한 누적 기준)
+    return {
+        "cursor": cursor,
+        "processed": processed,
+        "updated": updated,
+        "skipped": processed - updated,
+        "elapsed_sec": elapsed,
+        "files_per_sec": processed / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+class RescoreService:
+    # 전처리된 이미지로 품질 지표를 다시 계산해 files.computed_json/blur_score/phash 밴드를 갱신하는 작업
+    # id 순 키셋 청크로 읽고, 청크마다 결과를 일괄 UPDATE한 뒤 체크포인트 → 재시도 시 이어서 처리
+    def __init__(self, pool: WorkerPool = worker_pool):
+        self.pool = pool
+
+    def enqueue(self, db: Session, chunk_size: Optional[int] = None, batch_size: Optional[int] = None) -> ProcessingJob:
+        return job_queue.enqueue(
+            db,
+            RESCORE_JOB,
+            {
+                "chunk_size": chunk_size or settings.rescore_chunk_size,
+                "batch_size": batch_size or settings.rescore_batch_size,
+            },
+        )
+
+    def _load_chunk(self, db: Session, cursor: str, limit: int) -> List[dict]:
+        stmt = (
+            select(*CHUNK_COLUMNS)
+            .where(File.media_type == "image", File.processed_path.isnot(None), File.id > cursor)
+            .order_by(File.id)
+            .limit(limit)
+        )
+        rows = [row._asdict() for row in db.execute(stmt)]
+        db.rollback()  # 읽기 트랜잭션을 길게 잡지 않음
+        return rows
+
+    def _write_chunk(self, db: Session, rows: List[dict], scores: List[Optional[dict]]) -> int:
+        updates = []
+        changes = []
+        by_hash: dict[str, dict] = {}
+        for row, score in zip(rows, scores):
+            if score is None:  # 파일 없음/디코드 실패
+                continue
+            computed = {**(row["computed_json"] or {}), **score}
+            updates.append(
+                {
+                    "id": row["id"],
+                    "blur_score": score["blur_score"],
+                    **phash_columns(score["phash"]),
+                    "computed_json": computed,
+                }
+            )
+            changes.append((row, score["blur_score"]))
+            by_hash[row["sha256"]] = score
+        if updates:
+            # 기본키 기준 ORM 일괄 UPDATE (executemany 한 번)
+            db.execute(update(File), updates)
+            adjust_blur_rollups(db, changes)
+            mark_changed(db, UPDATES)
+            if settings.dedup_mode:
+                # 이후 같은 내용의 업로드가 재사용하는 블롭 계산값도 맞춤
+                blobs = db.execute(select(Blob.sha256, Blob.computed_json).where(Blob.sha256.in_(list(by_hash)))).all()
+                if blobs:
+                    db.execute(
+                        update(Blob),
+                        [{"sha256": sha, "computed_json": {**(computed or {}), **by_hash[sha]}} for sha, computed in blobs],
+                    )
+        db.commit()
+        return len(updates)
+
+    def _finish(self, db: Session) -> int:
+        fixed = refresh_blur_extremes(db)
+        if fixed:
+            mark_changed(db, UPDATES)
+        db.commit()
+        return fixed
+
+    async def run(self, db: Session, job_id: Optional[int], chunk_size: int, batch_size: int) -> dict:
+        progress = await self.pool.run_io("rescore_checkpoint", job_queue.progress, db, job_id) if job_id else {}
+        cursor = progress.get("cursor", "")
+        processed = progress.get("processed", 0)
+        updated = progress.get("updated", 0)
+        elapsed = progress.get("elapsed_sec", 0.0)
+        while True:
+            started = time.perf_counter()
+            rows = await self.pool.run_io("rescore_load", self._load_chunk, db, cursor, chunk_size)
+            if not rows:
+                break
+            # 같은 파일을 가리키는 행(중복 제거 모드)은 한 번만 디코드, batch_size개씩 프로세스 풀에서 병렬 계산
+            locations = list(dict.fromkeys(row["processed_path"] for row in rows))
+            parts = [locations[i:i + batch_size] for i in range(0, len(locations), batch_size)]
+            results = await asyncio.gather(
+                *(self.pool.run_cpu("rescore_score", score_images, part, batch_size) for part in parts)
+            )
+            by_location = dict(zip(locations, chain.from_iterable(results)))
+            scores = [by_location[row["processed_path"]] for row in rows]
+            written = await self.pool.run_io("rescore_write", self._write_chunk, db, rows, scores)
+            metrics.incr("rescored_files", written)
+
+            cursor = rows[-1]["id"]
+            processed += len(rows)
+            updated += written
+            elapsed += time.perf_counter() - started
+            progress = _progress(cursor, processed, updated, elapsed)
+            if job_id:
+                await self.pool.run_io("rescore_checkpoint", job_queue.checkpoint, db, job_id, progress)
+
+        fixed = await self.pool.run_io("rescore_write", self._finish, db)
+        return {**_progress(cursor, processed, updated, elapsed), "rollup_extremes_fixed": fixed}
+
+    async def process_enqueued(self, db: Session, payload: dict) -> dict:
+        # 워커에서 호출
+        return await self.run(
+            db,
+            payload.get("job_id"),
+            payload.get("chunk_size", settings.rescore_chunk_size),
+            payload.get("batch_size", settings.rescore_batch_size),
+        )
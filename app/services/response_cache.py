@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.models.file import File
+from app.utils.json_codec import dumps
+
+# 세대 종류: inserts = 새 행 추가(목록/통계 결과가 바뀜), updates = 기존 행 수정(단건 응답까지 바뀜)
+INSERTS = "inserts"
+UPDATES = "updates"
+# 응답 종류별로 키에 넣는 세대 (단건 조회는 행이 추가돼도 결과가 같으므로 updates만)
+NAMESPACE_GENERATIONS = {
+    "file": (UPDATES,),
+    "files": (INSERTS, UPDATES),
+    "stats": (INSERTS, UPDATES),
+}
+_PENDING_KEY = "response_cache_pending"
+
+
+class ResponseCache:
+    # 직렬화된 JSON 응답 본문을 (종류, 정규화한 파라미터, 세대) 키로 보관하는 프로세스 내 LRU/TTL 캐시
+    # 쓰기 커밋 시 세대를 올리면 이전 세대 키는 더 이상 조회되지 않고 LRU로 밀려남 (명시적 삭제 없음)
+    def __init__(self, max_bytes: int, ttl_sec: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Tuple[bytes, str, float]]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[str, int] = {INSERTS: 0, UPDATES: 0}
+
+    def generation(self, namespace: str) -> tuple:
+        with self._lock:
+            return tuple(self._generations[kind] for kind in NAMESPACE_GENERATIONS[namespace])
+
+    def bump(self, kind: str) -> None:
+        with self._lock:
+            self._generations[kind] += 1
+
+    def key(self, namespace: str, params: dict) -> tuple:
+        # None인 파라미터는 빼고 이름순으로 정렬 → 생략과 기본값 없음이 같은 키
+        normalized = tuple(sorted((name, str(value)) for name, value in params.items() if value is not None))
+        return namespace, normalized, self.generation(namespace)
+
+    def get(self, key: tuple) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            body, etag, expires_at = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return body, etag
+
+    def put(self, key: tuple, body: bytes, etag: str) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (body, etag, time.monotonic() + self.ttl_sec)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                metrics.incr("response_cache_evictions")
+
+    def _drop(self, key: tuple) -> None:
+        body, _, _ = self._entries.pop(key)
+        self._bytes -= len(body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        # 응답 종류별 적중률 (/metrics 노출용)
+        counters = metrics.snapshot()["counters"]
+        result: Dict[str, Any] = {}
+        for namespace in NAMESPACE_GENERATIONS:
+            hits = counters.get(f"response_cache_hits.{namespace}", 0)
+            misses = counters.get(f"response_cache_misses.{namespace}", 0)
+            result[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "not_modified": counters.get(f"response_cache_not_modified.{namespace}", 0),
+            }
+        with self._lock:
+            result["entries"] = len(self._entries)
+            result["bytes"] = self._bytes
+        return result
+
+
+def cached_json(request: Request, namespace: str, params: dict, build: Callable[[], Any]) -> Response:
+    # 캐시에 있으면 저장된 본문을, 없으면 build() 결과를 JSON으로 직렬화해 저장 후 응답
+    # ETag는 본문 해시라 세대가 바뀌어도 내용이 같으면 If-None-Match에 304로 응답 (본문 전송 생략)
+    # build()가 HTTPException을 올리면 (404 등) 캐시하지 않고 그대로 전달
+    cached = None
+    if settings.response_cache:
+        key = response_cache.key(namespace, params)
+        cached = response_cache.get(key)
+        metrics.incr(f"response_cache_{'hits' if cached else 'misses'}.{namespace}")
+    if cached:
+        body, etag = cached
+    else:
+        body = dumps(build())
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        if settings.response_cache:
+            response_cache.put(key, body, etag)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # 재사용 전 항상 재검증
+    if etag in _if_none_match(request):
+        metrics.incr(f"response_cache_not_modified.{namespace}")
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _if_none_match(request: Request) -> set:
+    value = request.headers.get("if-none-match")
+    if not value:
+        return set()
+    # 약한 검증자(W/)도 같은 본문으로 취급
+    return {tag.strip().removeprefix("W/") for tag in value.split(",")}
+
+
+def mark_changed(db: Session, kind: str) -> None:
+    # 세대는 커밋이 끝난 뒤에 올림 → 커밋 전 데이터를 새 세대 키로 캐시하는 경쟁 방지
+    db.info.setdefault(_PENDING_KEY, set()).add(kind)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_orm_changes(db: Session, flush_context) -> None:
+    # insert_files 등 일괄 실행 경로 밖에서 ORM으로 추가/수정/삭제한 files 행도 반영
+    if any(isinstance(obj, File) for obj in db.new):
+        mark_changed(db, INSERTS)
+    if any(isinstance(obj, File) for obj in (*db.dirty, *db.deleted)):
+        mark_changed(db, UPDATES)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(db: Session) -> None:
+    for kind in db.info.pop(_PENDING_KEY, ()):
+        response_cache.bump(kind)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(db: Session) -> None:
+    db.info.pop(_PENDING_KEY, None)
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.response_cache_max_bytes,
+    ttl_sec=settings.response_cache_ttl_sec,
+)
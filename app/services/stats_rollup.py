@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import select, update, func, case, and_
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert_insert
+from app.models.file import File
+from app.models.stats_rollup import StatsRollup, StatsBlurBucket
+
+ROLLUP_KEY = ("day", "media_type", "vehicle_id", "route_id")
+
+# 블러 히스토그램 버킷: 0번은 1 미만, 이후 10^(1/20) 배 간격(10단위당 20개), 마지막은 10^6 이상
+BLUR_BUCKETS_PER_DECADE = 20
+BLUR_MAX_DECADE = 6
+BLUR_BUCKET_COUNT = BLUR_BUCKETS_PER_DECADE * BLUR_MAX_DECADE + 2
+
+Key = Tuple[date, str, str, str]
+
+
+def blur_bucket(value: float) -> int:
+    if value < 1.0:
+        return 0
+    return min(BLUR_BUCKET_COUNT - 1, 1 + int(math.log10(value) * BLUR_BUCKETS_PER_DECADE))
+
+
+def blur_bucket_bounds(bucket: int) -> Tuple[float, float]:
+    if bucket <= 0:
+        return 0.0, 1.0
+    if bucket >= BLUR_BUCKET_COUNT - 1:
+        return 10.0 ** BLUR_MAX_DECADE, math.inf
+    return 10.0 ** ((bucket - 1) / BLUR_BUCKETS_PER_DECADE), 10.0 ** (bucket / BLUR_BUCKETS_PER_DECADE)
+
+
+def percentile(hist: dict[int, int], q: float, lo: Optional[float], hi: Optional[float]) -> float:
+    # 히스토그램에서 근사 분위수 계산 (버킷 안은 선형 보간, 실제 min/max로 범위 제한)
+    n = sum(hist.values())
+    if n == 0 or lo is None or hi is None:
+        return 0.0
+    rank = q * n
+    seen = 0
+    for bucket in sorted(hist):
+        count = hist[bucket]
+        if count <= 0:
+            continue
+        if seen + count >= rank:
+            b_lo, b_hi = blur_bucket_bounds(bucket)
+            b_lo, b_hi = max(b_lo, lo), min(b_hi, hi)
+            if b_hi < b_lo:
+                b_hi = b_lo
+            return b_lo + (b_hi - b_lo) * ((rank - seen) / count)
+        seen += count
+    return hi
+
+
+def rollup_deltas(rows: Iterable[dict]) -> Tuple[dict[Key, dict], dict[Tuple[Key, int], int]]:
+    # 삽입할 files 행들을 (촬영일, 타입, 차량, 경로) 단위 증분으로 합침
+    rollups: dict[Key, dict] = {}
+    buckets: dict[Tuple[Key, int], int] = defaultdict(int)
+    for row in rows:
+        key = (row["captured_at"].date(), row["media_type"], row["vehicle_id"], row["route_id"])
+        agg = rollups.get(key)
+        if agg is None:
+            agg = rollups[key] = {
+                **dict(zip(ROLLUP_KEY, key)),
+                "file_count": 0,
+                "size_bytes_sum": 0,
+                "blur_count": 0,
+                "blur_sum": 0.0,
+                "blur_min": None,
+                "blur_max": None,
+            }
+        agg["file_count"] += 1
+        agg["size_bytes_sum"] += row["size_bytes"]
+        blur = row.get("blur_score")
+        if blur is not None:
+            agg["blur_count"] += 1
+            agg["blur_sum"] += blur
+            agg["blur_min"] = blur if agg["blur_min"] is None else min(agg["blur_min"], blur)
+            agg["blur_max"] = blur if agg["blur_max"] is None else max(agg["blur_max"], blur)
+            buckets[(key, blur_bucket(blur))] += 1
+    return rollups, buckets
+
+
+def apply_rollups(db: Session, rows: Iterable[dict]) -> None:
+    # files INSERT와 같은 트랜잭션에서 증분 반영 (커밋은 호출자가 담당)
+    rollups, buckets = rollup_deltas(rows)
+    if not rollups:
+        return
+    insert = upsert_insert(db)
+
+    # 키 순서를 고정해 동시 업로드 간 잠금 순서가 엇갈리지 않도록 함
+    stmt = insert(StatsRollup).values([rollups[k] for k in sorted(rollups)])
+    ex = stmt.excluded
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY),
+            set_={
+                "file_count": StatsRollup.file_count + ex.file_count,
+                "size_bytes_sum": StatsRollup.size_bytes_sum + ex.size_bytes_sum,
+                "blur_count": StatsRollup.blur_count + ex.blur_count,
+                "blur_sum": StatsRollup.blur_sum + ex.blur_sum,
+                "blur_min": case(
+                    (StatsRollup.blur_min.is_(None), ex.blur_min),
+                    (ex.blur_min < StatsRollup.blur_min, ex.blur_min),
+                    else_=StatsRollup.blur_min,
+                ),
+                "blur_max": case(
+                    (StatsRollup.blur_max.is_(None), ex.blur_max),
+                    (ex.blur_max > StatsRollup.blur_max, ex.blur_max),
+                    else_=StatsRollup.blur_max,
+                ),
+            },
+        )
+    )
+
+    if buckets:
+        stmt = insert(StatsBlurBucket).values(
+            [{**dict(zip(ROLLUP_KEY, key)), "bucket": b, "count": c} for (key, b), c in sorted(buckets.items())]
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[*ROLLUP_KEY, "bucket"],
+                set_={"count": StatsBlurBucket.count + stmt.excluded.count},
+            )
+        )
+
+
+def adjust_blur_rollups(db: Session, changes: Iterable[Tuple[dict, Optional[float]]]) -> None:
+    # 기존 files 행의 blur_score가 바뀔 때 (행, 새 값) 목록으로 합계/개수/히스토그램을 증분 보정
+    # min/max는 넓히는 방향만 반영되므로 작업이 끝나면 refresh_blur_extremes로 다시 맞춤
+    deltas: dict[Key, dict] = {}
+    buckets: dict[Tuple[Key, int], int] = defaultdict(int)
+    for row, new in changes:
+        old = row.get("blur_score")
+        if old == new:
+            continue
+        key = (row["captured_at"].date(), row["media_type"], row["vehicle_id"], row["route_id"])
+        agg = deltas.setdefault(key, {"count": 0, "sum": 0.0, "min": None, "max": None})
+        if old is not None:
+            agg["count"] -= 1
+            agg["sum"] -= old
+            buckets[(key, blur_bucket(old))] -= 1
+        if new is not None:
+            agg["count"] += 1
+            agg["sum"] += new
+            agg["min"] = new if agg["min"] is None else min(agg["min"], new)
+            agg["max"] = new if agg["max"] is None else max(agg["max"], new)
+            buckets[(key, blur_bucket(new))] += 1
+    if not deltas:
+        return
+
+    for key in sorted(deltas):
+        agg = deltas[key]
+        values = {
+            "blur_count": StatsRollup.blur_count + agg["count"],
+            "blur_sum": StatsRollup.blur_sum + agg["sum"],
+        }
+        if agg["min"] is not None:
+            values["blur_min"] = case(
+                (StatsRollup.blur_min.is_(None), agg["min"]),
+                (StatsRollup.blur_min > agg["min"], agg["min"]),
+                else_=StatsRollup.blur_min,
+            )
+            values["blur_max"] = case(
+                (StatsRollup.blur_max.is_(None), agg["max"]),
+                (StatsRollup.blur_max < agg["max"], agg["max"]),
+                else_=StatsRollup.blur_max,
+            )
+        db.execute(
+            update(StatsRollup)
+            .where(*(getattr(StatsRollup, name) == value for name, value in zip(ROLLUP_KEY, key)))
+            .values(**values)
+        )
+
+    changed = {k: c for k, c in buckets.items() if c}
+    if changed:
+        stmt = upsert_insert(db)(StatsBlurBucket).values(
+            [{**dict(zip(ROLLUP_KEY, key)), "bucket": b, "count": c} for (key, b), c in sorted(changed.items())]
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[*ROLLUP_KEY, "bucket"],
+                set_={"count": StatsBlurBucket.count + stmt.excluded.count},
+            )
+        )
+
+
+def refresh_blur_extremes(db: Session) -> int:
+    # files에서 키별 실제 blur min/max를 한 번의 GROUP BY로 다시 계산해 달라진 롤업만 갱신
+    stmt = select(
+        func.date(File.captured_at).label("day"),
+        File.media_type,
+        File.vehicle_id,
+        File.route_id,
+        func.min(File.blur_score),
+        func.max(File.blur_score),
+    ).group_by(func.date(File.captured_at), File.media_type, File.vehicle_id, File.route_id)
+    current = {
+        (r.day, r.media_type, r.vehicle_id, r.route_id): (r.blur_min, r.blur_max)
+        for r in db.execute(
+            select(*(getattr(StatsRollup, name) for name in ROLLUP_KEY), StatsRollup.blur_min, StatsRollup.blur_max)
+        )
+    }
+    fixes = []
+    for day, media_type, vehicle_id, route_id, lo, hi in db.execute(stmt):
+        if isinstance(day, str):  # SQLite의 date()는 문자열
+            day = date.fromisoformat(day)
+        key = (day, media_type, vehicle_id, route_id)
+        if key in current and current[key] != (lo, hi):
+            fixes.append({**dict(zip(ROLLUP_KEY, key)), "blur_min": lo, "blur_max": hi})
+    for fix in fixes:
+        db.execute(
+            update(StatsRollup)
+            .where(*(getattr(StatsRollup, name) == fix[name] for name in ROLLUP_KEY))
+            .values(blur_min=fix["blur_min"], blur_max=fix["blur_max"])
+        )
+    return len(fixes)
+
+
+def _conditions(model, media_type, vehicle_id, route_id, day_from, day_to) -> list:
+    conds = []
+    if media_type:
+        conds.append(model.media_type == media_type)
+    if vehicle_id:
+        conds.append(model.vehicle_id == vehicle_id)
+    if route_id:
+        conds.append(model.route_id == route_id)
+    if day_from:
+        conds.append(model.day >= day_from)
+    if day_to:
+        conds.append(model.day <= day_to)
+    return conds
+
+
+def _blur_summary(count: int, total: float, lo: Optional[float], hi: Optional[float], hist: dict[int, int]) -> dict:
+    return {
+        "min": float(lo) if lo is not None else 0.0,
+        "avg": float(total) / count if count else 0.0,
+        "max": float(hi) if hi is not None else 0.0,
+        "p50": percentile(hist, 0.50, lo, hi),
+        "p90": percentile(hist, 0.90, lo, hi),
+        "p99": percentile(hist, 0.99, lo, hi),
+    }
+
+
+def _aggregates():
+    return (
+        func.coalesce(func.sum(StatsRollup.file_count), 0),
+        func.coalesce(func.sum(StatsRollup.size_bytes_sum), 0),
+        func.coalesce(func.sum(StatsRollup.blur_count), 0),
+        func.coalesce(func.sum(StatsRollup.blur_sum), 0.0),
+        func.min(StatsRollup.blur_min),
+        func.max(StatsRollup.blur_max),
+    )
+
+
+def summarize(
+    db: Session,
+    group_by: Optional[str] = None,
+    media_type: Optional[str] = None,
+    vehicle_id: Optional[str] = None,
+    route_id: Optional[str] = None,
+    day_from: Optional[date] = None,
+    day_to: Optional[date] = None,
+) -> dict:
+    # files를 스캔하지 않고 집계 테이블만 읽음 (비용은 그룹 수에 비례)
+    filters = (media_type, vehicle_id, route_id, day_from, day_to)
+    conds = _conditions(StatsRollup, *filters)
+    bucket_conds = _conditions(StatsBlurBucket, *filters)
+    where = and_(*conds) if conds else True
+    bucket_where = and_(*bucket_conds) if bucket_conds else True
+
+    total, size, blur_count, blur_sum, blur_min, blur_max = db.execute(select(*_aggregates()).where(where)).one()
+    media_hist = {
+        m: int(c)
+        for m, c in db.execute(
+            select(StatsRollup.media_type, func.sum(StatsRollup.file_count)).where(where).group_by(StatsRollup.media_type)
+        )
+    }
+    hist = {
+        int(b): int(c)
+        for b, c in db.execute(
+            select(StatsBlurBucket.bucket, func.sum(StatsBlurBucket.count)).where(bucket_where).group_by(StatsBlurBucket.bucket)
+        )
+    }
+    result = {
+        "total_files": int(total),
+        "total_size_bytes": int(size),
+        "media_histogram": media_hist,
+        "blur_stats": _blur_summary(blur_count, blur_sum, blur_min, blur_max, hist),
+    }
+
+    if group_by is not None:
+        col = getattr(StatsRollup, group_by)
+        bucket_col = getattr(StatsBlurBucket, group_by)
+        group_hist: dict = defaultdict(dict)
+        for key, b, c in db.execute(
+            select(bucket_col, StatsBlurBucket.bucket, func.sum(StatsBlurBucket.count))
+            .where(bucket_where)
+            .group_by(bucket_col, StatsBlurBucket.bucket)
+        ):
+            group_hist[key][int(b)] = int(c)
+        result["breakdown"] = [
+            {
+                group_by: key.isoformat() if isinstance(key, date) else key,
+                "file_count": int(count),
+                "size_bytes": int(size_sum),
+                "blur_stats": _blur_summary(b_count, b_sum, b_min, b_max, group_hist.get(key, {})),
+            }
+            for key, count, size_sum, b_count, b_sum, b_min, b_max in db.execute(
+                select(col, *_aggregates()).where(where).group_by(col).order_by(col)
+            )
+        ]
+    return result
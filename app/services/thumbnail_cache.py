@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from uuid import uuid4
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.storage import is_remote, read_location
+from app.utils.media import render_thumbnail, video_thumbnail
+
+READ_RETRIES = 3
+
+
+class _Render:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.path: Optional[Path] = None
+        self.error: Optional[BaseException] = None
+
+
+class ThumbnailCache:
+    # 원본 해시 + 크기로 키를 잡는 썸네일 파생본 디스크 캐시, 전체 크기가 한도를 넘으면 LRU로 삭제
+    # (DatasetCache와 같이 최근 사용 시각은 mtime으로 관리, 파일 수가 많으므로 키 앞 2자리로 디렉터리 분산)
+    # 같은 키를 동시에 처음 요청하면 한 요청만 생성하고 나머지는 그 결과를 기다림
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Render] = {}
+        self._total: Optional[int] = None  # 추정 전체 크기 (처음 쓸 때 한 번 스캔, 이후 추가분만 더함)
+
+    @staticmethod
+    def key(content_hash: str, size: int) -> str:
+        # 처리 파일은 원본 내용에서 결정되므로 같은 내용의 업로드는 썸네일도 공유
+        return f"{content_hash}_{size}"
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.jpg"
+
+    def temp_path(self, key: str) -> Path:
+        return self.root / key[:2] / f".{key}.{uuid4().hex}.tmp"
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> Path:
+        path = self.get(key)
+        if path is not None:
+            metrics.incr("thumbnail_hits")
+            return path
+        with self._lock:
+            job = self._inflight.get(key)
+            leader = job is None
+            if leader:
+                job = self._inflight[key] = _Render()
+        if not leader:
+            metrics.incr("thumbnail_coalesced")
+            job.done.wait()
+            if job.error is not None:
+                raise job.error
+            return job.path
+        metrics.incr("thumbnail_misses")
+        try:
+            with metrics.timer("thumbnail_render"):
+                job.path = self.put(key, render())
+            return job.path
+        except BaseException as exc:
+            job.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            job.done.set()
+
+    def read_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        # get_or_render()가 돌려준 경로는 다른 요청의 evict()가 응답 전에 지울 수 있으므로 바로 열어서 읽음
+        # (열린 뒤에 지워져도 읽기는 계속됨), 여는 사이에 지워졌으면 다시 조회/생성
+        for _ in range(READ_RETRIES):
+            path = self.get_or_render(key, render)
+            try:
+                with path.open("rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                metrics.incr("thumbnail_evicted_before_read")
+        # 캐시가 한도에 비해 너무 작아 계속 밀려나면 캐시 없이 생성해서 응답
+        return render()
+
+    def put(self, key: str, data: bytes) -> Path:
+        # 임시 이름으로 다 쓴 뒤 rename → 읽는 쪽은 완성된 파일만 봄
+        tmp = self.temp_path(key)
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            tmp.write_bytes(data)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return self.adopt(tmp, key)
+
+    def adopt(self, tmp: Path, key: str) -> Path:
+        # 이미 써 둔 임시 파일(업로드 시 생성한 썸네일)을 캐시 항목으로 등록
+        final = self.path_for(key)
+        size = tmp.stat().st_size
+        os.replace(tmp, final)
+        with self._lock:
+            if self._total is not None:
+                self._total += size
+            over = self._total is None or self._total > self.max_bytes
+        if over:
+            self.evict(keep=final)
+        return final
+
+    def evict(self, keep: Optional[Path] = None) -> List[str]:
+        entries = []
+        for p in self.root.glob("*/*.jpg"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        # 매번 스캔하지 않도록 한도의 90%까지 비움
+        target = self.max_bytes * 0.9 if total > self.max_bytes else self.max_bytes
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= target:
+                break
+            if keep is not None and p == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+            removed.append(p.stem)
+        with self._lock:
+            self._total = total
+        return removed
+
+
+def render_file_thumbnail(location: str, media_type: str, size: int) -> bytes:
+    # 처리 파일(로컬/원격)에서 썸네일 생성 - 이미지는 바이트로 디코드, 동영상은 첫 프레임
+    if media_type == "image":
+        return render_thumbnail(b"".join(read_location(location)), size, settings.thumbnail_jpeg_quality)
+    if not is_remote(location):
+        return video_thumbnail(Path(location), size, settings.thumbnail_jpeg_quality)
+    with tempfile.NamedTemporaryFile(suffix=Path(location).suffix, dir=settings.storage_base_path) as tmp:
+        for chunk in read_location(location):
+            tmp.write(chunk)
+        tmp.flush()
+        return video_thumbnail(Path(tmp.name), size, settings.thumbnail_jpeg_quality)
+
+
+thumbnail_cache = ThumbnailCache(Path(settings.thumbnail_path), settings.thumbnail_cache_max_bytes)
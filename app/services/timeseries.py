@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert_insert
+from app.models.file import File
+from app.models.stats_rollup import StatsTimeseries
+
+GRANULARITIES = ("minute", "hour", "day")
+SERIES_KEY = ("granularity", "bucket_start", "vehicle_id", "route_id", "source")
+TIMELINE_YIELD_PER = 5000
+
+Key = Tuple[str, datetime, str, str, str]
+
+
+def bucket_start(ts: datetime, granularity: str) -> datetime:
+    # files.captured_at과 같은 기준(저장되는 벽시계 시각)으로 버킷 시작 시각 계산
+    ts = ts.replace(tzinfo=None, second=0, microsecond=0)
+    if granularity == "hour":
+        return ts.replace(minute=0)
+    if granularity == "day":
+        return ts.replace(hour=0, minute=0)
+    return ts
+
+
+def timeseries_deltas(rows: Iterable[dict]) -> dict[Key, dict]:
+    # 삽입할 files 행들을 (단위, 버킷, 차량, 경로, 소스) 증분으로 합침
+    deltas: dict[Key, dict] = {}
+    for row in rows:
+        for granularity in GRANULARITIES:
+            start = bucket_start(row["captured_at"], granularity)
+            key = (granularity, start, row["vehicle_id"], row["route_id"], row["source"])
+            agg = deltas.get(key)
+            if agg is None:
+                agg = deltas[key] = {**dict(zip(SERIES_KEY, key)), "file_count": 0, "size_bytes_sum": 0}
+            agg["file_count"] += 1
+            agg["size_bytes_sum"] += row["size_bytes"]
+    return deltas
+
+
+def apply_timeseries(db: Session, rows: Iterable[dict]) -> None:
+    # files INSERT와 같은 트랜잭션에서 증분 반영 (커밋은 호출자가 담당)
+    deltas = timeseries_deltas(rows)
+    if not deltas:
+        return
+    stmt = upsert_insert(db)(StatsTimeseries).values([deltas[k] for k in sorted(deltas)])
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=list(SERIES_KEY),
+            set_={
+                "file_count": StatsTimeseries.file_count + stmt.excluded.file_count,
+                "size_bytes_sum": StatsTimeseries.size_bytes_sum + stmt.excluded.size_bytes_sum,
+            },
+        )
+    )
+
+
+def timeseries(
+    db: Session,
+    granularity: str,
+    group_by: Optional[str] = None,
+    vehicle_id: Optional[str] = None,
+    route_id: Optional[str] = None,
+    source: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 10_000,
+) -> dict:
+    # 집계 테이블에서 요청 단위의 버킷만 읽음 (files 스캔 없음)
+    conds = [StatsTimeseries.granularity == granularity]
+    if vehicle_id:
+        conds.append(StatsTimeseries.vehicle_id == vehicle_id)
+    if route_id:
+        conds.append(StatsTimeseries.route_id == route_id)
+    if source:
+        conds.append(StatsTimeseries.source == source)
+    if start:
+        conds.append(StatsTimeseries.bucket_start >= bucket_start(start, granularity))
+    if end:
+        conds.append(StatsTimeseries.bucket_start <= bucket_start(end, granularity))
+
+    keys = [StatsTimeseries.bucket_start] + ([getattr(StatsTimeseries, group_by)] if group_by else [])
+    stmt = (
+        select(*keys, func.sum(StatsTimeseries.file_count), func.sum(StatsTimeseries.size_bytes_sum))
+        .where(and_(*conds))
+        .group_by(*keys)
+        .order_by(*keys)
+        .limit(limit + 1)
+    )
+    rows = db.execute(stmt).all()
+    buckets = []
+    for row in rows[:limit]:
+        item = {"bucket_start": row[0].isoformat()}
+        if group_by:
+            item[group_by] = row[1]
+        item["file_count"] = int(row[-2])
+        item["size_bytes"] = int(row[-1])
+        buckets.append(item)
+    return {"granularity": granularity, "group_by": group_by, "buckets": buckets, "truncated": len(rows) > limit}
+
+
+def route_timeline(
+    db: Session,
+    route_id: str,
+    gap_sec: float,
+    vehicle_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Optional[dict]:
+    # (route_id, captured_at) 인덱스 순서대로 한 번만 읽으면서 간격이 gap_sec 이하인 촬영을 한 구간으로 묶음
+    conds = [File.route_id == route_id]
+    if vehicle_id:
+        conds.append(File.vehicle_id == vehicle_id)
+    if start:
+        conds.append(File.captured_at >= start)
+    if end:
+        conds.append(File.captured_at <= end)
+    stmt = (
+        select(File.captured_at)
+        .where(and_(*conds))
+        .order_by(File.captured_at)
+        .execution_options(yield_per=TIMELINE_YIELD_PER)
+    )
+
+    segments = []
+    seg_start = prev = None
+    count = 0
+    for (ts,) in db.execute(stmt):
+        if prev is not None and (ts - prev).total_seconds() > gap_sec:
+            segments.append((seg_start, prev, count))
+            seg_start, count = ts, 0
+        if seg_start is None:
+            seg_start = ts
+        prev = ts
+        count += 1
+    if prev is None:
+        return None
+    segments.append((seg_start, prev, count))
+
+    gaps = [
+        {"start": a[1].isoformat(), "end": b[0].isoformat(), "duration_sec": (b[0] - a[1]).total_seconds()}
+        for a, b in zip(segments, segments[1:])
+    ]
+    covered = sum((e - s).total_seconds() for s, e, _ in segments)
+    return {
+        "route_id": route_id,
+        "gap_sec": gap_sec,
+        "file_count": sum(c for _, _, c in segments),
+        "span_sec": (segments[-1][1] - segments[0][0]).total_seconds(),
+        "covered_sec": covered,
+        "segments": [
+            {"start": s.isoformat(), "end": e.isoformat(), "duration_sec": (e - s).total_seconds(), "file_count": c}
+            for s, e, c in segments
+        ],
+        "gaps": gaps,
+    }
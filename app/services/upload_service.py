@@ -1,30 +1,44 @@
 from __future__ import annotations
 
 import json
-import tempfile
-from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
 from uuid import uuid4
 
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
 from app.core.settings import settings
+from app.core.workers import WorkerPool, worker_pool
 from app.models.file import File
+from app.models.processing_job import JOB_PENDING
+from app.schemas.job import JobAccepted
 from app.schemas.upload import Metadata, UploadResponse, MediaType
+from app.services.blob_store import find_blob, find_blobs
+from app.services.file_writer import build_file_row, file_record, insert_files
+from app.services.insert_coalescer import insert_coalescer
+from app.services.job_queue import job_queue
+from app.services.meta_log import meta_log
+from app.services.thumbnail_cache import ThumbnailCache, thumbnail_cache
+from app.storage import is_remote, object_storage, read_location, storage_for
 from app.storage.local import LocalStorage
 from app.utils.media import (
     detect_media_type,
-    check_size,
     preprocess_image,
-    extract_video_meta,
-    sha256_file,
+    analyze_video,
 )
 
+PROCESS_UPLOAD_JOB = "process_upload"
+
 
 class UploadService:
-    def __init__(self):
-        self.storage = LocalStorage(Path(settings.storage_base_path))
+    def __init__(self, pool: WorkerPool = worker_pool):
+        self.storage = LocalStorage(
+            Path(settings.storage_base_path), layout=settings.storage_layout, fsync=settings.storage_fsync
+        )
+        self.pool = pool
 
     def _parse_metadata(self, metadata_str: str) -> Metadata:
         # 메타 JSON 파싱 및 필수 필드 검증
@@ -37,80 +51,339 @@ class UploadService:
         except Exception as exc:  # noqa: BLE001
             raise HTTPException(status_code=400, detail=f"Metadata validation failed: {exc}") from exc
 
-    def _save_meta_file(self, record: dict) -> None:
-        meta_dir = Path(settings.meta_path)
-        meta_dir.mkdir(parents=True, exist_ok=True)
-        (meta_dir / f"{record['id']}.json").write_text(json.dumps(record, ensure_ascii=False, indent=2))
+    def _detect_media_type(self, filename: str) -> MediaType:
+        # 기본 검증 (확장자) - 바디를 읽기 전에 파일명으로 먼저 거절
+        try:
+            return detect_media_type(Path(filename), settings.allowed_image_exts, settings.allowed_video_exts)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    def process_upload(self, db: Session, file: UploadFile, metadata_str: str) -> UploadResponse:
-        meta = self._parse_metadata(metadata_str)
+    def _store_raw(self, src: BinaryIO, suffix: str, fsync: bool = False) -> Tuple[Path, int, str]:
+        # 원본은 청크 단위로 한 번만 읽어 raw/에 바로 저장 (크기 검사·해시 동시 계산)
+        try:
+            return self.storage.save_stream(
+                src,
+                subdir="raw",
+                suffix=suffix,
+                max_bytes=settings.max_file_size_mb * 1024 * 1024,
+                fsync=fsync,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    async def _process_media(
+        self, stored_path: Path, media_type: MediaType, suffix: str, file_hash: str
+    ) -> Tuple[Path, dict]:
+        # 전처리 / 메타 추출 (원본 파일을 그대로 입력으로 사용, OpenCV 작업은 프로세스 풀에서 실행)
+        try:
+            if media_type == "image":
+                # 임시 이름에 쓰고 rename → 중단돼도 최종 경로에 반쯤 쓴 파일이 남지 않음
+                processed_path = self.storage.new_path(subdir="processed/images", suffix=".jpg")
+                tmp_path = self.storage.temp_path(processed_path)
+                # THUMBNAIL_EAGER_SIZES: 리사이즈한 이미지에서 썸네일도 같이 만들어 캐시에 등록
+                thumbnails = {
+                    size: thumbnail_cache.temp_path(ThumbnailCache.key(file_hash, size))
+                    for size in settings.thumbnail_eager_sizes
+                }
+                try:
+                    computed = await self.pool.run_cpu(
+                        "preprocess_image",
+                        preprocess_image,
+                        src=stored_path,
+                        dst=tmp_path,
+                        resize=settings.image_resize,
+                        jpeg_quality=settings.jpeg_quality,
+                        reduced_decode=settings.image_reduced_decode,
+                        thumbnails=thumbnails,
+                        thumbnail_quality=settings.thumbnail_jpeg_quality,
+                    )
+                    await self.pool.run_io("commit_processed", self.storage.commit, tmp_path, processed_path)
+                    for size, thumb in thumbnails.items():
+                        await self.pool.run_io(
+                            "thumbnail_adopt", thumbnail_cache.adopt, thumb, ThumbnailCache.key(file_hash, size)
+                        )
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    for thumb in thumbnails.values():
+                        thumb.unlink(missing_ok=True)
+                    raise
+            else:
+                # 기본 메타 + 프레임 샘플 품질 분석 (프레임 수/시간 예산 안에서, 프로세스 풀에서 병렬 처리)
+                computed = await self.pool.run_cpu(
+                    "analyze_video",
+                    analyze_video,
+                    stored_path,
+                    max_frames=settings.video_sample_frames,
+                    budget_sec=settings.video_sample_budget_sec,
+                )
+                # 동영상은 재인코딩이 없으므로 복사 대신 원본을 하드링크로 참조
+                processed_path = await self.pool.run_io(
+                    "link_processed", self.storage.link, stored_path, subdir="processed/videos", suffix=suffix
+                )
+        except ValueError as exc:
+            if not settings.dedup_mode:
+                # 중복 제거 모드의 원본은 공유 경로라 _ingest가 참조를 확인한 뒤 정리
+                stored_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return processed_path, computed
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir) / file.filename
-            content = file.file.read()
-            tmp_path.write_bytes(content)
+    def _find_blobs(self, db: Session, hashes: list[str]) -> dict[str, dict]:
+        # 중복 제거 모드에서만 기존 블롭 조회
+        return find_blobs(db, hashes) if settings.dedup_mode else {}
 
-            # 기본 검증 (크기/확장자)
-            try:
-                check_size(tmp_path, settings.max_file_size_mb)
-                media_type: MediaType = detect_media_type(tmp_path, settings.allowed_image_exts, settings.allowed_video_exts)
-            except ValueError as exc:
-                raise HTTPException(status_code=400, detail=str(exc)) from exc
+    def _find_blob(self, db: Session, file_hash: str) -> Optional[dict]:
+        return self._find_blobs(db, [file_hash]).get(file_hash)
 
-            file_id = uuid4().hex
-            suffix = tmp_path.suffix.lower()
+    def _fetch(self, location: str, suffix: str) -> Path:
+        # 원격 저장소의 원본을 로컬 작업 공간으로 내려받음 (OpenCV는 로컬 파일만 읽음)
+        dest = self.storage.new_path(subdir="tmp", suffix=suffix)
+        with dest.open("wb") as out:
+            for chunk in read_location(location):
+                out.write(chunk)
+        return dest
 
-            # 전처리 / 메타 추출
-            if media_type == "image":
-                processed_path = self.storage.save(tmp_path, subdir="processed/images", suffix=".jpg")
-                computed = preprocess_image(
-                    src=tmp_path,
-                    dst=processed_path,
-                    resize=settings.image_resize,
-                    jpeg_quality=settings.jpeg_quality,
-                )
+    def _publish(
+        self, stored_path: Path, processed_path: Path, media_type: MediaType, queued: Optional[str]
+    ) -> Tuple[str, str]:
+        # 처리 끝난 로컬 파일을 설정된 백엔드로 올리고 로컬 사본은 삭제 (키 = 작업 공간 기준 상대 경로)
+        objects = object_storage()
+        if queued is not None and not settings.dedup_mode:
+            raw_location = queued
+        else:
+            raw_location = objects.put_file(stored_path, self.storage.key_for(stored_path))
+            if queued is not None:
+                storage_for(queued).delete(queued)
+        # 동영상은 재인코딩이 없으므로 처리 파일도 원본 객체를 그대로 참조
+        processed_location = (
+            raw_location
+            if media_type == "video"
+            else objects.put_file(processed_path, self.storage.key_for(processed_path))
+        )
+        stored_path.unlink(missing_ok=True)
+        processed_path.unlink(missing_ok=True)
+        return raw_location, processed_location
+
+    def _release_blob(self, pin: Path, file_hash: str, locations: list[str]) -> None:
+        # 실패한 업로드가 콘텐츠 주소 경로에 옮겨 둔 파일 정리
+        # 같은 해시를 처리 중인 다른 업로드(핀)도, 커밋된 참조(blobs 행)도 없을 때만 삭제
+        # 다른 업로드의 핀 생성과 같은 잠금 안에서 확인·삭제하므로 그 사이에 새 참조가 생기지 않음
+        with self.storage.blob_lock(file_hash):
+            self.storage.unpin_blob(pin)
+            if self.storage.blob_pinned(file_hash):
+                return
+            with SessionLocal() as db:
+                if find_blob(db, file_hash) is not None:
+                    return
+            for location in locations:
+                storage_for(location).delete(location)
+
+    async def _ingest(
+        self,
+        stored: Path | str,
+        media_type: MediaType,
+        suffix: str,
+        size_bytes: int,
+        file_hash: str,
+        blob: Optional[dict],
+        retry_owner: Optional[str] = None,
+    ) -> Tuple[str, str, dict, Optional[Path]]:
+        # (원본 위치, 처리 파일 위치, 계산값, 블롭 핀)
+        # - 중복 제거 모드: 콘텐츠 주소 경로를 사용하고, 같은 해시의 블롭이 이미 있으면
+        #   방금 받은 원본을 버리고 OpenCV 작업 없이 재사용
+        #   새 블롭은 핀을 남긴 채 반환 → 호출자가 커밋 후 unpin_blob, 커밋 실패 시 _release_blob
+        # - s3 모드: 로컬 작업 공간에서 처리한 뒤 업로드
+        # retry_owner: 재시도되는 작업이면 예상하지 못한 오류에도 원본 블롭과 핀을 남김
+        stored = str(stored)
+        if blob is not None:
+            await self.pool.run_io("dedup_discard", storage_for(stored).delete, stored)
+            metrics.incr("dedup_hits")
+            metrics.incr("dedup_bytes_saved", size_bytes)
+            return blob["stored_path"], blob["processed_path"], dict(blob["computed"]), None
+
+        pin = None
+        if settings.dedup_mode:
+            pin = await self.pool.run_io("blob_pin", self.storage.pin_blob, file_hash, retry_owner)
+        adopted: list[str] = []  # 이번 시도에서 콘텐츠 주소 경로로 옮긴 파일 (실패 시 정리 대상)
+        try:
+            # 비동기 모드에서 큐에 넣을 때 이미 원격에 올린 원본
+            queued = stored if is_remote(stored) else None
+            if queued is not None:
+                stored_path = await self.pool.run_io("fetch_raw", self._fetch, queued, suffix)
             else:
-                processed_path = self.storage.save(tmp_path, subdir="processed/videos", suffix=suffix)
-                computed = extract_video_meta(tmp_path)
-
-            stored_path = self.storage.save(tmp_path, subdir="raw", suffix=suffix)
-            file_hash = sha256_file(tmp_path)
-
-        # DB 저장
-        db_obj = File(
-            id=file_id,
-            original_filename=file.filename,
-            stored_path=str(stored_path),
-            processed_path=str(processed_path),
+                stored_path = Path(stored)
+            if settings.dedup_mode:
+                stored_path = await self.pool.run_io(
+                    "blob_adopt", self.storage.adopt, stored_path, "blobs/raw", file_hash, suffix
+                )
+                adopted.append(str(stored_path))
+            processed_path, computed = await self._process_media(stored_path, media_type, suffix, file_hash)
+            if settings.dedup_mode:
+                processed_path = await self.pool.run_io(
+                    "blob_adopt", self.storage.adopt, processed_path, "blobs/processed", file_hash, processed_path.suffix
+                )
+                adopted.append(str(processed_path))
+            if settings.storage_mode == "local":
+                return str(stored_path), str(processed_path), computed, pin
+            raw_location, processed_location = await self.pool.run_io(
+                "publish", self._publish, stored_path, processed_path, media_type, queued
+            )
+        except HTTPException:
+            # 잘못된 입력은 재시도해도 같으므로 항상 정리
+            if pin is not None:
+                await self.pool.run_io("blob_release", self._release_blob, pin, file_hash, adopted)
+            raise
+        except BaseException:
+            if pin is not None and retry_owner is None:
+                await self.pool.run_io("blob_release", self._release_blob, pin, file_hash, adopted)
+            raise
+        return raw_location, processed_location, computed, pin
+
+    def _insert_row(self, db: Session, row: dict) -> None:
+        insert_files(db, [row])
+        db.commit()
+
+    async def _persist(
+        self,
+        db: Session,
+        file_id: str,
+        original_filename: str,
+        stored_path: str,
+        processed_path: str,
+        media_type: MediaType,
+        size_bytes: int,
+        file_hash: str,
+        meta: Metadata,
+        computed: dict,
+    ) -> dict:
+        # DB 저장 (응답 레코드는 메모리 값으로 구성하므로 refresh 불필요)
+        row = build_file_row(
+            file_id=file_id,
+            original_filename=original_filename,
+            stored_path=stored_path,
+            processed_path=processed_path,
             media_type=media_type,
-            size_bytes=len(content),
-            sha256=file_hash,
-            vehicle_id=meta.vehicle_id,
-            captured_at=datetime.fromisoformat(meta.captured_at.replace("Z", "+00:00")),
-            source=meta.source,
-            route_id=meta.route_id,
-            location_lat=meta.location_lat,
-            location_lon=meta.location_lon,
-            weather=meta.weather,
-            note=meta.note,
-            meta_json=meta.model_dump(),
-            computed_json=computed,
+            size_bytes=size_bytes,
+            file_hash=file_hash,
+            meta=meta,
+            computed=computed,
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-
-        record = {
-            "id": db_obj.id,
-            "original_filename": db_obj.original_filename,
-            "stored_path": db_obj.stored_path,
-            "processed_path": db_obj.processed_path,
-            "media_type": db_obj.media_type,
-            "size_bytes": db_obj.size_bytes,
-            "sha256": db_obj.sha256,
-            "meta": db_obj.meta_json,
-            "computed": db_obj.computed_json,
-        }
-
-        self._save_meta_file(record)
+        if settings.insert_coalesce:
+            # 동시 업로드의 행을 모아 한 번의 INSERT + 커밋으로 기록
+            await insert_coalescer.insert(row)
+        else:
+            await self.pool.run_io("db_commit", self._insert_row, db, row)
+        return file_record(row)
+
+    async def process_upload(self, db: Session, file: UploadFile, metadata_str: str) -> UploadResponse:
+        meta = self._parse_metadata(metadata_str)
+        filename = file.filename or ""
+        media_type = self._detect_media_type(filename)
+
+        file_id = uuid4().hex
+        suffix = Path(filename).suffix.lower()
+
+        # 이벤트 루프에서는 조율만 하고, 블로킹 단계는 모두 워커 풀로 넘긴다
+        async with self.pool.slot():
+            stored_path, size_bytes, file_hash = await self.pool.run_io("store_raw", self._store_raw, file.file, suffix)
+            blob = await self.pool.run_io("dedup_lookup", self._find_blob, db, file_hash)
+            stored_path, processed_path, computed, pin = await self._ingest(
+                stored_path, media_type, suffix, size_bytes, file_hash, blob
+            )
+            try:
+                record = await self._persist(
+                    db,
+                    file_id=file_id,
+                    original_filename=filename,
+                    stored_path=stored_path,
+                    processed_path=processed_path,
+                    media_type=media_type,
+                    size_bytes=size_bytes,
+                    file_hash=file_hash,
+                    meta=meta,
+                    computed=computed,
+                )
+            except BaseException:
+                # 커밋 실패: 이번 업로드가 만든 블롭은 다른 참조가 없을 때만 정리
+                if pin is not None:
+                    await self.pool.run_io(
+                        "blob_release", self._release_blob, pin, file_hash, [stored_path, processed_path]
+                    )
+                raise
+            if pin is not None:
+                await self.pool.run_io("blob_unpin", self.storage.unpin_blob, pin)
+            if settings.meta_log:
+                await self.pool.run_io("meta_write", meta_log.append, record)
         return UploadResponse(**record)
+
+    def _stage_raw(self, stored_path: Path) -> str:
+        # s3 모드: 다른 노드의 워커도 읽을 수 있도록 큐에 넣기 전에 원본을 먼저 업로드
+        if settings.storage_mode == "local":
+            return str(stored_path)
+        location = object_storage().put_file(stored_path, self.storage.key_for(stored_path))
+        stored_path.unlink(missing_ok=True)
+        return location
+
+    def _enqueue(self, db: Session, payload: dict) -> int:
+        return job_queue.enqueue(db, PROCESS_UPLOAD_JOB, payload).id
+
+    async def enqueue_upload(self, db: Session, file: UploadFile, metadata_str: str) -> JobAccepted:
+        # 비동기 모드: 원본만 내구성 있게 저장하고 작업을 큐에 넣은 뒤 바로 응답 (전처리는 워커가 수행)
+        meta = self._parse_metadata(metadata_str)
+        filename = file.filename or ""
+        media_type = self._detect_media_type(filename)
+
+        file_id = uuid4().hex
+        suffix = Path(filename).suffix.lower()
+
+        async with self.pool.slot():
+            stored_path, size_bytes, file_hash = await self.pool.run_io(
+                "store_raw", self._store_raw, file.file, suffix, fsync=True
+            )
+            stored_location = await self.pool.run_io("stage_raw", self._stage_raw, stored_path)
+            payload = {
+                "file_id": file_id,
+                "original_filename": filename,
+                "stored_path": stored_location,
+                "media_type": media_type,
+                "suffix": suffix,
+                "size_bytes": size_bytes,
+                "sha256": file_hash,
+                "meta": meta.model_dump(),
+            }
+            job_id = await self.pool.run_io("db_commit", self._enqueue, db, payload)
+        return JobAccepted(job_id=job_id, file_id=file_id, status=JOB_PENDING)
+
+    async def process_enqueued(self, db: Session, payload: dict) -> dict:
+        # 워커에서 호출: 저장된 원본으로 전처리 후 DB/메타 기록
+        existing = await self.pool.run_io("db_get", db.get, File, payload["file_id"])
+        if existing is not None:
+            # 이전 시도에서 DB 기록까지 끝났다면 재처리하지 않음 (재시도 멱등성)
+            return file_record({c.name: getattr(existing, c.name) for c in File.__table__.columns})
+        blob = await self.pool.run_io("dedup_lookup", self._find_blob, db, payload["sha256"])
+        # 핀 이름을 파일 id로 고정 → 재시도가 같은 핀을 재사용하고, 실패해도 원본 블롭이 남아 다시 처리 가능
+        stored_path, processed_path, computed, pin = await self._ingest(
+            payload["stored_path"],
+            payload["media_type"],
+            payload["suffix"],
+            payload["size_bytes"],
+            payload["sha256"],
+            blob,
+            retry_owner=payload["file_id"],
+        )
+        record = await self._persist(
+            db,
+            file_id=payload["file_id"],
+            original_filename=payload["original_filename"],
+            stored_path=stored_path,
+            processed_path=processed_path,
+            media_type=payload["media_type"],
+            size_bytes=payload["size_bytes"],
+            file_hash=payload["sha256"],
+            meta=Metadata(**payload["meta"]),
+            computed=computed,
+        )
+        if pin is not None:
+            await self.pool.run_io("blob_unpin", self.storage.unpin_blob, pin)
+        if settings.meta_log:
+            await self.pool.run_io("meta_write", meta_log.append, record)
+        return record
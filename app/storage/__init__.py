@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.core.settings import settings
+from app.storage.base import ObjectStat, Storage
+from app.storage.local import LocalStorage
+
+
+@lru_cache(maxsize=None)
+def local_storage() -> LocalStorage:
+    return LocalStorage(Path(settings.storage_base_path), layout=settings.storage_layout, fsync=settings.storage_fsync)
+
+
+@lru_cache(maxsize=None)
+def s3_storage():
+    from app.storage.s3 import S3Storage
+
+    return S3Storage.from_settings()
+
+
+def object_storage() -> Storage:
+    # 새로 저장하는 파일의 최종 위치를 정하는 백엔드 (STORAGE_MODE)
+    if settings.storage_mode == "s3":
+        return s3_storage()
+    return local_storage()
+
+
+def is_remote(location: str) -> bool:
+    return str(location).startswith("s3://")
+
+
+def storage_for(location: str) -> Storage:
+    # 위치 문자열로 백엔드 선택 (모드를 바꿔도 기존 행은 원래 위치에서 읽음)
+    return s3_storage() if is_remote(location) else local_storage()
+
+
+def stat_location(location: str) -> Optional[ObjectStat]:
+    return storage_for(location).stat(location)
+
+
+def read_location(location: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    return storage_for(location).open_range(location, start, end)
+
+
+__all__ = [
+    "ObjectStat",
+    "Storage",
+    "LocalStorage",
+    "local_storage",
+    "object_storage",
+    "is_remote",
+    "storage_for",
+    "stat_location",
+    "read_location",
+]
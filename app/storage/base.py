@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Protocol
+
+
+class ObjectStat(NamedTuple):
+    size: int
+    mtime: float
+
+
+class Storage(Protocol):
+    # 저장소 백엔드 공통 인터페이스. 위치(location)는 DB의 stored_path/processed_path에 그대로 기록되는 문자열
+    # (로컬: 파일 경로, S3: s3://<bucket>/<key>)
+
+    def put_stream(self, src: BinaryIO, key: str) -> str:
+        # 스트림을 끝까지 읽어 key에 저장하고 위치를 반환
+        ...
+
+    def put_file(self, src: Path, key: str) -> str:
+        # 로컬 파일을 key에 저장하고 위치를 반환 (원본 파일은 그대로 둠)
+        ...
+
+    def open_range(self, location: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        # [start, end] 구간(양 끝 포함)을 청크로 읽음, end=None이면 끝까지
+        ...
+
+    def stat(self, location: str) -> Optional[ObjectStat]:
+        # 없으면 None
+        ...
+
+    def exists(self, location: str) -> bool:
+        ...
+
+    def delete(self, location: str) -> None:
+        # 없어도 오류 없음
+        ...
+
+    def presigned_url(self, location: str, expires_sec: int) -> Optional[str]:
+        # 클라이언트가 직접 받아갈 수 있는 임시 URL (지원하지 않으면 None)
+        ...
@@ -1,19 +1,270 @@
 from __future__ import annotations
 
+import fcntl
+import hashlib
+import os
 import shutil
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
+from app.storage.base import ObjectStat
+
+CHUNK_SIZE = 1024 * 1024  # 스트리밍 저장 시 한 번에 읽는 크기 (1MB)
+
+# 디렉터리 레이아웃
+# - sharded: <subdir>/YYYY/MM/DD/<이름 앞 2자리>/<이름> (하루 최대 256개 디렉터리로 분산)
+# - flat: <subdir>/<이름> (이전 방식, 벤치마크 비교용)
+LAYOUT_SHARDED = "sharded"
+LAYOUT_FLAT = "flat"
+
+
+def _fsync_dir(path: Path) -> None:
+    # rename 결과(디렉터리 엔트리)까지 디스크에 기록 (POSIX에서만 가능)
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
 
 class LocalStorage:
-    def __init__(self, base_path: Path):
+    # 로컬 디렉터리 백엔드 (업로드 처리 중 OpenCV 입력/출력 작업 공간으로도 사용)
+    # 모든 쓰기는 같은 디렉터리의 임시 이름에 쓴 뒤 rename → 중단돼도 최종 이름에 반쯤 쓴 파일이 남지 않음
+    def __init__(self, base_path: Path, layout: str = LAYOUT_SHARDED, fsync: bool = False):
         self.base_path = base_path
+        self.layout = layout
+        self.fsync = fsync  # True면 파일과 디렉터리 엔트리를 fsync한 뒤 반환
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self._dirs: set[Path] = set()  # 이미 만든 디렉터리 (반복 mkdir 시스템 호출 생략)
+
+    def _ensure_dir(self, path: Path) -> Path:
+        if path not in self._dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(path)
+        return path
+
+    def _shard_dir(self, subdir: str, name: str) -> Path:
+        if self.layout == LAYOUT_FLAT:
+            return self.base_path / subdir
+        return self.base_path / subdir / datetime.utcnow().strftime("%Y/%m/%d") / name[:2]
+
+    def _create(self, path: Path) -> BinaryIO:
+        try:
+            return path.open("xb")
+        except FileNotFoundError:
+            # 캐시된 디렉터리가 외부에서 지워진 경우
+            self._dirs.discard(path.parent)
+            self._ensure_dir(path.parent)
+            return path.open("xb")
+
+    @staticmethod
+    def temp_path(dest: Path) -> Path:
+        # 같은 디렉터리의 숨김 임시 이름 (확장자 유지 → OpenCV가 형식을 판단할 수 있음)
+        return dest.with_name(f".{dest.stem}.{uuid4().hex[:8]}.tmp{dest.suffix}")
+
+    def commit(self, tmp: Path, dest: Path, fsync: Optional[bool] = None) -> Path:
+        # 임시 파일을 최종 이름으로 원자적 교체 (외부 프로그램이 쓴 임시 파일용)
+        fsync = self.fsync if fsync is None else fsync
+        if fsync:
+            with tmp.open("rb") as f:
+                os.fsync(f.fileno())
+        os.replace(tmp, dest)
+        if fsync:
+            _fsync_dir(dest.parent)
+        return dest
+
+    def _write_atomic(self, src: BinaryIO, dest: Path, fsync: bool, sync_dir: bool = True) -> None:
+        tmp = self.temp_path(dest)
+        try:
+            with self._create(tmp) as out:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+                if fsync:
+                    out.flush()
+                    os.fsync(out.fileno())
+            os.replace(tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        if fsync and sync_dir:
+            _fsync_dir(dest.parent)
+
+    def new_path(self, subdir: str, suffix: str) -> Path:
+        # 하위 디렉터리(샤드)에 새 UUID 파일 경로를 할당 (파일은 만들지 않음)
+        name = uuid4().hex
+        return self._ensure_dir(self._shard_dir(subdir, name)) / f"{name}{suffix}"
 
     def save(self, src: Path, subdir: str, suffix: str) -> Path:
         # 하위 디렉터리에 UUID 파일명으로 저장하고 경로를 반환
-        dest_dir = self.base_path / subdir
-        dest_dir.mkdir(parents=True, exist_ok=True)
-        dest = dest_dir / f"{uuid4().hex}{suffix}"
-        shutil.copy2(src, dest)
+        return self.save_many([src], subdir, suffix)[0]
+
+    def save_many(
+        self,
+        sources: Sequence[Path],
+        subdir: str,
+        suffix: Optional[str] = None,
+        fsync: Optional[bool] = None,
+    ) -> List[Path]:
+        # 여러 파일을 한 번에 저장: 대상 디렉터리는 한 번씩만 만들고, fsync도 디렉터리마다 한 번만 수행
+        # suffix가 None이면 원본 확장자 사용
+        fsync = self.fsync if fsync is None else fsync
+        names = [uuid4().hex for _ in sources]
+        dirs = [self._shard_dir(subdir, name) for name in names]
+        for d in sorted(set(dirs)):
+            self._ensure_dir(d)
+        dests = []
+        for src, name, d in zip(sources, names, dirs):
+            dest = d / f"{name}{src.suffix if suffix is None else suffix}"
+            with src.open("rb") as f:
+                self._write_atomic(f, dest, fsync, sync_dir=False)
+            shutil.copystat(src, dest)
+            dests.append(dest)
+        if fsync:
+            for d in sorted(set(dirs)):
+                _fsync_dir(d)
+        return dests
+
+    def save_stream(
+        self,
+        src: BinaryIO,
+        subdir: str,
+        suffix: str,
+        max_bytes: int | None = None,
+        fsync: bool = False,
+    ) -> Tuple[Path, int, str]:
+        # 스트림을 청크 단위로 한 번만 읽으면서 크기 검사·SHA256 계산·기록을 동시에 수행
+        fsync = fsync or self.fsync
+        dest = self.new_path(subdir, suffix)
+        tmp = self.temp_path(dest)
+        h = hashlib.sha256()
+        size = 0
+        try:
+            with self._create(tmp) as out:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        # 한도를 넘는 순간 중단 (나머지 바디는 읽지 않음)
+                        raise ValueError(f"File too large: > {max_bytes / (1024 * 1024):.0f}MB")
+                    h.update(chunk)
+                    out.write(chunk)
+                if fsync:
+                    # 응답 전에 디스크 기록을 보장해야 하는 경우 (비동기 처리 모드 등)
+                    out.flush()
+                    os.fsync(out.fileno())
+            os.replace(tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        if fsync:
+            _fsync_dir(dest.parent)
+        return dest, size, h.hexdigest()
+
+    def link(self, src: Path, subdir: str, suffix: str) -> Path:
+        # 이미 저장된 파일을 복사 없이 하드링크로 참조 (다른 파일시스템이면 복사로 대체)
+        dest = self.new_path(subdir, suffix)
+        try:
+            os.link(src, dest)
+        except OSError:
+            with src.open("rb") as f:
+                self._write_atomic(f, dest, self.fsync)
+            return dest
+        if self.fsync:
+            _fsync_dir(dest.parent)
         return dest
+
+    def blob_path(self, subdir: str, file_hash: str, suffix: str) -> Path:
+        # 해시에서 정해지는 콘텐츠 주소 경로 (앞 2+2자리로 디렉터리 분산)
+        return self._ensure_dir(self.base_path / subdir / file_hash[:2] / file_hash[2:4]) / f"{file_hash}{suffix}"
+
+    def adopt(self, src: Path, subdir: str, file_hash: str, suffix: str) -> Path:
+        # 임시 위치에 쓴 파일을 콘텐츠 주소 경로로 원자적으로 이동
+        # 같은 내용이 동시에 들어와도 결과는 동일하고, 재시도 시 이미 이동된 경우 그대로 사용
+        dest = self.blob_path(subdir, file_hash, suffix)
+        try:
+            os.replace(src, dest)
+        except FileNotFoundError:
+            if not dest.exists():
+                raise
+        if self.fsync:
+            _fsync_dir(dest.parent)
+        return dest
+
+    @contextmanager
+    def blob_lock(self, file_hash: str) -> Iterator[None]:
+        # 같은 해시의 핀 생성과 정리 판단을 프로세스 간에 직렬화 (해시 앞 2자리로 256개 잠금 파일에 분산)
+        path = self._ensure_dir(self.base_path / "blobs" / ".locks") / f"{file_hash[:2]}.lock"
+        with path.open("ab") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def pin_blob(self, file_hash: str, owner: Optional[str] = None) -> Path:
+        # 콘텐츠 주소 경로로 옮기기 전에 "처리 중" 표시를 남김 (커밋 후 unpin, 실패 시 정리하면서 제거)
+        # 표시가 남아 있는 해시의 블롭 파일은 다른 업로드의 정리 단계가 지우지 않음
+        # owner를 주면 같은 이름을 재사용 (재시도되는 작업이 시도마다 핀을 늘리지 않도록)
+        with self.blob_lock(file_hash):
+            pin = self._ensure_dir(self.base_path / "blobs" / ".pins") / f"{file_hash}.{owner or uuid4().hex}"
+            pin.touch()
+        return pin
+
+    def unpin_blob(self, pin: Path) -> None:
+        pin.unlink(missing_ok=True)
+
+    def blob_pinned(self, file_hash: str) -> bool:
+        # 호출자가 blob_lock을 잡은 상태에서 사용
+        return any((self.base_path / "blobs" / ".pins").glob(f"{file_hash}.*"))
+
+    # --- Storage 프로토콜 (위치 = 파일 경로 문자열) ---
+
+    def key_path(self, key: str) -> Path:
+        return self.base_path / key
+
+    def key_for(self, path: Path) -> str:
+        # 작업 공간 안의 파일 → 다른 백엔드에서 쓸 key (base 기준 상대 경로)
+        return path.resolve().relative_to(self.base_path.resolve()).as_posix()
+
+    def put_stream(self, src: BinaryIO, key: str) -> str:
+        dest = self.key_path(key)
+        self._ensure_dir(dest.parent)
+        self._write_atomic(src, dest, self.fsync)
+        return str(dest)
+
+    def put_file(self, src: Path, key: str) -> str:
+        dest = self.key_path(key)
+        if dest.resolve() == src.resolve():
+            return str(dest)
+        self._ensure_dir(dest.parent)
+        with src.open("rb") as f:
+            self._write_atomic(f, dest, self.fsync)
+        return str(dest)
+
+    def open_range(self, location: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        with open(location, "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def stat(self, location: str) -> Optional[ObjectStat]:
+        try:
+            st = os.stat(location)
+        except FileNotFoundError:
+            return None
+        return ObjectStat(size=st.st_size, mtime=st.st_mtime)
+
+    def exists(self, location: str) -> bool:
+        return os.path.exists(location)
+
+    def delete(self, location: str) -> None:
+        Path(location).unlink(missing_ok=True)
+
+    def presigned_url(self, location: str, expires_sec: int) -> Optional[str]:
+        return None
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import math
+from typing import List, Optional, Tuple
+
+# 지오해시: 위도/경도를 번갈아 이분한 비트를 base32로 표기 → 앞부분이 같으면 같은 셀 안에 있음
+# 알파벳이 ASCII 오름차순이라 문자열 정렬 = Z-order 곡선 순서 → B-tree 범위 조회로 셀을 찾을 수 있음
+ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+_INDEX = {c: i for i, c in enumerate(ALPHABET)}
+PRECISION = 9  # 저장 정밀도 (약 4.8m x 4.8m)
+MAX_COVER_CELLS = 24  # 영역을 덮는 셀(범위 조건) 수 상한
+
+EARTH_RADIUS_M = 6_371_008.8
+
+BBox = Tuple[float, float, float, float]  # (west, south, east, north)
+
+
+def encode(lat: float, lon: float, precision: int = PRECISION) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    out = []
+    bits = 0
+    value = 0
+    even = True  # 짝수 번째 비트는 경도
+    while len(out) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            bit = lon >= mid
+            lon_lo, lon_hi = (mid, lon_hi) if bit else (lon_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            bit = lat >= mid
+            lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+        value = (value << 1) | bit
+        even = not even
+        bits += 1
+        if bits == 5:
+            out.append(ALPHABET[value])
+            bits = value = 0
+    return "".join(out)
+
+
+def cell_bounds(cell: str) -> BBox:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    even = True
+    for c in cell:
+        v = _INDEX[c]
+        for shift in range(4, -1, -1):
+            bit = (v >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                lon_lo, lon_hi = (mid, lon_hi) if bit else (lon_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return lon_lo, lat_lo, lon_hi, lat_hi
+
+
+def next_prefix(prefix: str) -> Optional[str]:
+    # prefix로 시작하는 모든 해시보다 큰 가장 작은 문자열 (범위 조회 상한, 없으면 None)
+    chars = list(prefix)
+    while chars:
+        i = _INDEX[chars[-1]]
+        if i + 1 < len(ALPHABET):
+            chars[-1] = ALPHABET[i + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+def _intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _contains(outer: BBox, inner: BBox) -> bool:
+    return outer[0] <= inner[0] and inner[2] <= outer[2] and outer[1] <= inner[1] and inner[3] <= outer[3]
+
+
+def cover(bbox: BBox, max_cells: int = MAX_COVER_CELLS, max_precision: int = PRECISION) -> List[str]:
+    # bbox를 덮는 셀 목록: 완전히 포함된 셀은 그대로 두고 걸친 셀만 한 단계씩 쪼개며,
+    # 셀 수가 max_cells를 넘기 직전에서 멈춤 (경계 셀의 바깥 부분은 좌표 조건으로 걸러냄)
+    cells = [c for c in ALPHABET if _intersects(bbox, cell_bounds(c))]
+    for _ in range(1, max_precision):
+        inside = [c for c in cells if _contains(bbox, cell_bounds(c))]
+        partial = [c for c in cells if not _contains(bbox, cell_bounds(c))]
+        children = [p + c for p in partial for c in ALPHABET if _intersects(bbox, cell_bounds(p + c))]
+        if not partial or len(inside) + len(children) > max_cells:
+            break
+        cells = sorted(inside + children)
+    return cells
+
+
+def cell_ranges(cells: List[str]) -> List[Tuple[str, Optional[str]]]:
+    # 셀마다 [prefix, next_prefix) 범위 → 이어지는 범위는 하나로 합침
+    ranges: List[Tuple[str, Optional[str]]] = []
+    for cell in sorted(cells):
+        hi = next_prefix(cell)
+        if ranges and ranges[-1][1] == cell:
+            ranges[-1] = (ranges[-1][0], hi)
+        else:
+            ranges.append((cell, hi))
+    return ranges
+
+
+def radius_bbox(lat: float, lon: float, radius_m: float) -> BBox:
+    # 반경 원을 감싸는 bbox (경도 폭은 위도에 따라 넓어짐)
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    dlon = math.degrees(radius_m / (EARTH_RADIUS_M * max(math.cos(math.radians(lat)), 1e-6)))
+    return max(-180.0, lon - dlon), max(-90.0, lat - dlat), min(180.0, lon + dlon), min(90.0, lat + dlat)
+
+
+def meters_per_degree(lat: float) -> Tuple[float, float]:
+    # 위도 lat 부근 (경도 1도, 위도 1도)의 거리(m) - 짧은 거리용 등장방형 근사
+    m = math.radians(1.0) * EARTH_RADIUS_M
+    return m * math.cos(math.radians(lat)), m
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import re
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.utils.zipstream import ZipStream
+
+CHUNK_SIZE = 1024 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, total: int) -> Optional[Tuple[int, int]]:
+    # 단일 구간만 지원 (bytes=a-b, bytes=a-, bytes=-n), 형식이 다르면 None → 전체 응답
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None
+    first, last = m.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{total}"})
+        return max(0, total - length), total - 1
+    start = int(first)
+    end = int(last) if last else total - 1
+    if start >= total or end < start:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{total}"})
+    return start, min(end, total - 1)
+
+
+def _requested_range(request: Request, total: int, etag: str) -> Optional[Tuple[int, int]]:
+    # If-Range가 현재 ETag와 다르면 Range를 무시하고 전체를 보냄
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range == etag):
+        return parse_range(range_header, total)
+    return None
+
+
+def _ranged_response(
+    body: Iterator[bytes], byte_range: Optional[Tuple[int, int]], total: int, headers: dict, media_type: str
+) -> Response:
+    headers = {**headers, "Accept-Ranges": "bytes"}
+    if byte_range is None:
+        headers["Content-Length"] = str(total)
+        return StreamingResponse(body, media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+    return StreamingResponse(body, status_code=206, media_type=media_type, headers=headers)
+
+
+def zip_stream_response(request: Request, stream: ZipStream, filename: str, etag: Optional[str] = None) -> Response:
+    # 전체 길이/ETag를 먼저 계산(파일 stat만)하고, Range 요청이면 해당 구간만 스트리밍
+    total, planned_etag, _ = stream.plan()
+    etag = etag or planned_etag
+    byte_range = _requested_range(request, total, etag)
+    start, end = byte_range if byte_range else (0, None)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "ETag": etag}
+    return _ranged_response(stream.iter_bytes(start, end), byte_range, total, headers, "application/zip")
+
+
+def _iter_file(f: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    with f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_range_response(request: Request, f: BinaryIO, filename: str, etag: str, media_type: str) -> Response:
+    # 이미 연 완성 파일을 Range 지원과 함께 전송 (응답이 파일을 닫음)
+    # 경로가 아니라 열린 파일을 받으므로 응답 도중 캐시에서 지워져도 크기/본문이 어긋나지 않음
+    try:
+        total = os.fstat(f.fileno()).st_size
+        byte_range = _requested_range(request, total, etag)
+    except BaseException:
+        f.close()
+        raise
+    start, end = byte_range if byte_range else (0, total - 1)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "ETag": etag}
+    return _ranged_response(_iter_file(f, start, end), byte_range, total, headers, media_type)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+try:  # 선택 의존성: 있으면 C 구현 직렬화 (datetime/dict/list를 파이썬 순회 없이 바로 바이트로)
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    # JSONResponse와 같은 형식(공백 없음, 비ASCII 그대로)의 UTF-8 바이트
+    # 기본 타입이 아닌 값(ORM 객체, date 등)은 jsonable_encoder로 변환
+    if orjson is not None:
+        return orjson.dumps(value, default=jsonable_encoder)
+    return json.dumps(
+        value, default=jsonable_encoder, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
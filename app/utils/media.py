@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import hashlib
+import threading
+import time
 from pathlib import Path
-from typing import Tuple, Literal
+from typing import Dict, Literal, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from app.utils.phash import dhash, to_hex
+from app.utils.quality import gray_metrics
+
 MediaType = Literal["image", "video"]
 
 
@@ -36,29 +41,144 @@ def check_size(path: Path, max_mb: int) -> None:
         raise ValueError(f"File too large: {size_mb:.1f}MB > {max_mb}MB")
 
 
+_local = threading.local()
+
+
+def _buffer(name: str, shape: tuple, dtype) -> np.ndarray:
+    # 작업 버퍼를 스레드(워커 프로세스)마다 재사용 → 같은 크기로 반복 호출할 때 매번 할당하지 않음
+    bufs = getattr(_local, "bufs", None)
+    if bufs is None:
+        bufs = _local.bufs = {}
+    buf = bufs.get(name)
+    if buf is None or buf.shape != shape or buf.dtype != dtype:
+        buf = bufs[name] = np.empty(shape, dtype)
+    return buf
+
+
 def compute_blur_score(image: np.ndarray) -> float:
     # 라플라시안 분산으로 선명도 측정 (낮을수록 흐림)
-    return float(cv2.Laplacian(image, cv2.CV_64F).var())
+    # 그레이스케일 1채널 + float32 결과 버퍼 재사용 (BGR 3채널 float64 대비 메모리/연산 1/6)
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=_buffer("gray", image.shape[:2], np.uint8))
+    lap = cv2.Laplacian(image, cv2.CV_32F, dst=_buffer("laplacian", image.shape[:2], np.float32))
+    _, std = cv2.meanStdDev(lap)
+    return float(std[0, 0] ** 2)
+
+
+def jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    # JPEG 헤더의 SOF 마커에서 (폭, 높이)만 읽음 (디코드 없음). JPEG가 아니거나 못 찾으면 None
+    if data[:2] != b"\xff\xd8":
+        return None
+    i, n = 2, len(data)
+    while i + 9 <= n:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # 채움 바이트
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # 길이 없는 마커
+            i += 2
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            return int.from_bytes(data[i + 7:i + 9], "big"), int.from_bytes(data[i + 5:i + 7], "big")
+        i += 2 + int.from_bytes(data[i + 2:i + 4], "big")
+    return None
+
+
+# JPEG DCT 단계 축소 디코드 (1/8, 1/4, 1/2 순으로 가능한 가장 작은 배율)
+REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def decode_flag(size: Optional[Tuple[int, int]], target: Tuple[int, int]) -> int:
+    # 축소 디코드 결과가 목표 크기보다 작아지지 않는 배율만 사용 (업스케일 방지)
+    # EXIF 회전으로 가로/세로가 바뀌어도 안전하도록 짧은 변과 목표의 긴 변을 비교
+    if size is None:
+        return cv2.IMREAD_COLOR
+    short, need = min(size), max(target)
+    for factor, flag in REDUCED_FLAGS:
+        if short // factor >= need:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_image(data: bytes, target: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+    # 메모리의 바이트에서 디코드. target이 주어지면 JPEG는 필요한 만큼만 축소 디코드
+    flag = decode_flag(jpeg_size(data), target) if target else cv2.IMREAD_COLOR
+    return cv2.imdecode(np.frombuffer(data, np.uint8), flag)
+
+
+def fit_within(image: np.ndarray, size: int) -> np.ndarray:
+    # 긴 변을 size에 맞춰 비율 유지 축소 (이미 작으면 그대로, 확대 없음)
+    h, w = image.shape[:2]
+    scale = size / max(h, w)
+    if scale >= 1.0:
+        return image
+    return cv2.resize(image, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def encode_jpeg(image: np.ndarray, quality: int) -> bytes:
+    ok, buf = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buf.tobytes()
+
+
+def render_thumbnail(data: bytes, size: int, jpeg_quality: int) -> bytes:
+    # 처리 이미지 바이트 → 긴 변 size의 JPEG 썸네일 (필요한 만큼만 축소 디코드)
+    img = decode_image(data, (size, size))
+    if img is None:
+        raise ValueError("Invalid image data")
+    return encode_jpeg(fit_within(img, size), jpeg_quality)
+
+
+def video_thumbnail(src: Path, size: int, jpeg_quality: int) -> bytes:
+    # 동영상 첫 프레임으로 썸네일 생성 (재인코딩/전체 디코드 없음)
+    cap = cv2.VideoCapture(str(src))
+    try:
+        ok, frame = cap.read() if cap.isOpened() else (False, None)
+    finally:
+        cap.release()
+    if not ok:
+        raise ValueError("Invalid video data")
+    return encode_jpeg(fit_within(frame, size), jpeg_quality)
 
 
 def preprocess_image(
-    src: Path,
+    src: Path | bytes,
     dst: Path,
     resize: Tuple[int, int],
     jpeg_quality: int,
+    reduced_decode: bool = True,
+    thumbnails: Optional[Dict[int, Path]] = None,
+    thumbnail_quality: int = 80,
 ) -> dict:
-    img = cv2.imread(str(src))
+    # src는 파일 경로 또는 이미 메모리에 있는 업로드 바이트 (파일을 한 번만 읽어 헤더 확인과 디코드에 같이 사용)
+    data = src if isinstance(src, (bytes, bytearray, memoryview)) else Path(src).read_bytes()
+    img = decode_image(data, resize if reduced_decode else None)
     if img is None:
         raise ValueError("Invalid image data")
-    resized = cv2.resize(img, resize)
-    blur = compute_blur_score(resized)
+    w, h = resize
+    resized = cv2.resize(img, (w, h), dst=_buffer("resized", (h, w, 3), np.uint8))
+    gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY, dst=_buffer("gray", (h, w), np.uint8))
+    blur = compute_blur_score(gray)
     dst.parent.mkdir(parents=True, exist_ok=True)
     params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)] if dst.suffix.lower() in {".jpg", ".jpeg"} else []
     cv2.imwrite(str(dst), resized, params)
+    # 업로드 시점 썸네일: 이미 디코드/리사이즈한 이미지에서 바로 생성 ({긴 변: 저장 경로})
+    for size, path in (thumbnails or {}).items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(encode_jpeg(fit_within(resized, size), thumbnail_quality))
     return {
         "width": resized.shape[1],
         "height": resized.shape[0],
         "blur_score": blur,
+        **gray_metrics(gray),
+        "phash": to_hex(dhash(gray)),  # 유사 중복 탐색용 지각 해시
     }
 
 
@@ -80,3 +200,124 @@ def extract_video_meta(src: Path) -> dict:
         "width": width,
         "height": height,
     }
+
+
+# 동영상 샘플 분석 기준값
+ANALYSIS_WIDTH = 320  # 샘플 프레임을 이 폭으로 줄여 분석 (프레임당 비용 고정)
+SEEK_MIN_STRIDE = 8  # 샘플 간격이 이보다 짧으면 seek 대신 순차 grab이 더 쌈
+DARK_LEVEL, BRIGHT_LEVEL = 16, 240  # 노출 부족/과다 픽셀 기준 (0~255)
+CLIPPED_RATIO = 0.5  # 프레임의 절반 이상이 기준을 넘으면 노출 부족/과다 프레임
+FROZEN_DIFF = 1.0  # 이전 샘플과의 평균 절대 차이가 이보다 작으면 정지(중복) 프레임
+
+
+def _sample_stats(frame: np.ndarray, prev: np.ndarray | None) -> tuple[np.ndarray, dict]:
+    h, w = frame.shape[:2]
+    if w > ANALYSIS_WIDTH:
+        frame = cv2.resize(frame, (ANALYSIS_WIDTH, max(1, h * ANALYSIS_WIDTH // w)), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    n = gray.size
+    stats = {
+        "blur": compute_blur_score(gray),
+        "brightness": float(gray.mean()),
+        "dark": float(np.count_nonzero(gray < DARK_LEVEL)) / n,
+        "bright": float(np.count_nonzero(gray > BRIGHT_LEVEL)) / n,
+        "frozen": prev is not None and prev.shape == gray.shape and float(cv2.absdiff(gray, prev).mean()) < FROZEN_DIFF,
+    }
+    return gray, stats
+
+
+def _sample_frames(cap, frame_count: int, fps: float, max_frames: int, deadline: float):
+    # 균등 간격으로 최대 max_frames개 프레임을 디코드. 간격이 넓으면 seek(가까운 키프레임부터 디코드),
+    # 좁으면 순차 grab으로 건너뜀. 시간 예산을 넘기면 중단
+    if frame_count > 0:
+        n = min(max_frames, frame_count)
+        targets = [int(i * frame_count / n) for i in range(n)]
+        stride = frame_count / n
+    else:
+        # 프레임 수를 모르는 컨테이너: 1초 간격 순차 샘플
+        stride = max(1.0, round(fps) if fps > 0 else 1.0)
+        targets = None
+    pos = 0
+    taken = 0
+    planned = len(targets) if targets is not None else max_frames
+    while taken < planned and time.perf_counter() < deadline:
+        target = targets[taken] if targets is not None else int(taken * stride)
+        if stride >= SEEK_MIN_STRIDE and target != pos:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        else:
+            while pos < target:
+                if not cap.grab():
+                    return
+                pos += 1
+        ok, frame = cap.read()
+        if not ok:
+            return
+        pos = target + 1
+        taken += 1
+        yield target, frame
+
+
+def analyze_video(src: Path, max_frames: int, budget_sec: float) -> dict:
+    # 기본 메타 + 프레임 샘플 품질 지표 (블러/노출/정지 프레임)
+    # 디코드 비용은 max_frames개 프레임과 budget_sec 시간으로 제한 (영상 길이와 무관)
+    started = time.perf_counter()
+    cap = cv2.VideoCapture(str(src))
+    if not cap.isOpened():
+        raise ValueError("Invalid video data")
+    try:
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        result = {
+            "frame_count": frame_count,
+            "fps": fps,
+            "duration_sec": frame_count / fps if fps > 0 else 0.0,
+            "width": width,
+            "height": height,
+        }
+        if max_frames <= 0:
+            return result
+
+        samples = []
+        prev = None
+        deadline = started + budget_sec
+        for _, frame in _sample_frames(cap, frame_count, fps, max_frames, deadline):
+            prev, stats = _sample_stats(frame, prev)
+            samples.append(stats)
+    finally:
+        cap.release()
+
+    elapsed = time.perf_counter() - started
+    planned = min(max_frames, frame_count) if frame_count > 0 else max_frames
+    # 시간 예산 때문에 계획한 샘플 수를 채우지 못한 경우
+    truncated = len(samples) < planned and elapsed >= budget_sec
+    if not samples:
+        result["video_quality"] = {"samples": 0, "elapsed_sec": elapsed, "truncated": truncated}
+        return result
+
+    blur = np.array([s["blur"] for s in samples])
+    brightness = np.array([s["brightness"] for s in samples])
+    frozen = [s["frozen"] for s in samples]
+    longest = run = 0
+    for f in frozen:
+        run = run + 1 if f else 0
+        longest = max(longest, run)
+    pairs = max(1, len(samples) - 1)
+    result["blur_score"] = float(np.median(blur))  # 대표값 (이미지와 같은 컬럼/필터로 사용)
+    result["video_quality"] = {
+        "samples": len(samples),
+        "blur_mean": float(blur.mean()),
+        "blur_min": float(blur.min()),
+        "blur_max": float(blur.max()),
+        "brightness_mean": float(brightness.mean()),
+        "brightness_min": float(brightness.min()),
+        "brightness_max": float(brightness.max()),
+        "underexposed_ratio": sum(s["dark"] >= CLIPPED_RATIO for s in samples) / len(samples),
+        "overexposed_ratio": sum(s["bright"] >= CLIPPED_RATIO for s in samples) / len(samples),
+        "frozen_ratio": sum(frozen) / pairs,
+        "max_frozen_run": longest,
+        "elapsed_sec": elapsed,
+        "truncated": truncated,
+    }
+    return result
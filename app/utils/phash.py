@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# 64비트 dHash를 16비트 밴드 4개로 나눠 저장 (다중 인덱스 해싱)
+# 해밍 거리 k 이내인 두 해시는 비둘기집 원리로 적어도 한 밴드가 k // 4 이내
+HASH_BITS = 64
+BAND_BITS = 16
+BAND_COUNT = HASH_BITS // BAND_BITS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def dhash(gray: np.ndarray) -> int:
+    # 9x8로 줄인 뒤 가로로 이웃한 픽셀의 밝기 대소를 비트로 (리사이즈/재압축/노이즈에 둔감)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def to_hex(value: int) -> str:
+    return format(value, "016x")
+
+
+def from_hex(value: str) -> int:
+    return int(value, 16)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def bands(value: int) -> Tuple[int, ...]:
+    return tuple((value >> (BAND_BITS * i)) & BAND_MASK for i in range(BAND_COUNT))
+
+
+def from_bands(parts: Tuple[int, ...]) -> int:
+    return sum(part << (BAND_BITS * i) for i, part in enumerate(parts))
+
+
+def band_neighbors(band: int, radius: int) -> List[int]:
+    # 밴드 값에서 radius 비트 이내로 바꾼 모든 값 (radius 2면 1 + 16 + 120 = 137개)
+    out = [band]
+    for r in range(1, radius + 1):
+        for bits in combinations(range(BAND_BITS), r):
+            flip = 0
+            for b in bits:
+                flip |= 1 << b
+            out.append(band ^ flip)
+    return out
+
+
+class BKTree:
+    # 해밍 거리용 BK-트리: 삼각 부등식으로 거리 범위 밖 가지를 건너뛰어 k 이내 이웃만 탐색
+    def __init__(self) -> None:
+        self._root: Optional[list] = None  # [값, {거리: 자식 노드}]
+        self.size = 0
+
+    def add(self, value: int) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = [value, {}]
+            return
+        node = self._root
+        while True:
+            d = hamming(value, node[0])
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [value, {}]
+                return
+            node = child
+
+    def search(self, value: int, k: int) -> Iterator[Tuple[int, int]]:
+        # (값, 거리) for 거리 <= k
+        if self._root is None:
+            return
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            d = hamming(value, node[0])
+            if d <= k:
+                yield node[0], d
+            for dist, child in node[1].items():
+                if d - k <= dist <= d + k:
+                    stack.append(child)
+
+    def has_within(self, value: int, k: int) -> bool:
+        return next(self.search(value, k), None) is not None
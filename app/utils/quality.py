@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from app.storage import read_location
+from app.utils.phash import dhash, to_hex
+
+# 재채점 시 계산하는 품질 지표 (computed_json 키)
+QUALITY_METRICS = ("blur_score", "brightness", "contrast", "entropy")
+
+
+def _entropy(hist: np.ndarray) -> np.ndarray:
+    # 256단계 히스토그램 → 섀넌 엔트로피(bit, 0~8)
+    p = hist / np.maximum(hist.sum(axis=-1, keepdims=True), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(p > 0, p * np.log2(p), 0.0)
+    return -terms.sum(axis=-1)
+
+
+def gray_metrics(gray: np.ndarray) -> dict:
+    # 단일 그레이스케일 이미지의 밝기/대비(표준편차)/엔트로피 (블러는 compute_blur_score)
+    mean, std = cv2.meanStdDev(gray)
+    hist = np.bincount(gray.ravel(), minlength=256)
+    return {
+        "brightness": float(mean[0, 0]),
+        "contrast": float(std[0, 0]),
+        "entropy": float(_entropy(hist)),
+    }
+
+
+def stack_metrics(batch: np.ndarray) -> dict[str, np.ndarray]:
+    # 같은 크기 그레이스케일 프레임 묶음 (N, H, W) uint8 → 지표별 길이 N 배열 (한 번의 벡터 연산)
+    n = batch.shape[0]
+    # 라플라시안(3x3, ksize=1)을 BORDER_REFLECT_101 패딩으로 직접 계산 → cv2.Laplacian과 같은 값
+    p = np.pad(batch, ((0, 0), (1, 1), (1, 1)), mode="reflect").astype(np.float32)
+    lap = p[:, :-2, 1:-1] + p[:, 2:, 1:-1] + p[:, 1:-1, :-2] + p[:, 1:-1, 2:]
+    lap -= 4.0 * p[:, 1:-1, 1:-1]
+    flat = batch.reshape(n, -1)
+    # 프레임마다 256칸씩 오프셋을 더해 bincount 한 번으로 전체 히스토그램 계산
+    offsets = (np.arange(n, dtype=np.int32) * 256)[:, None]
+    hist = np.bincount((flat + offsets).ravel(), minlength=n * 256).reshape(n, 256)
+    return {
+        "blur_score": lap.reshape(n, -1).var(axis=1, dtype=np.float64),
+        "brightness": flat.mean(axis=1, dtype=np.float64),
+        "contrast": flat.std(axis=1, dtype=np.float64),
+        "entropy": _entropy(hist),
+    }
+
+
+def _load_gray(location: str) -> Optional[np.ndarray]:
+    # 위치 하나의 읽기/디코드 실패(파일 없음, S3 자격 증명/NoSuchKey/타임아웃, 깨진 데이터)는 그 행만 건너뜀
+    # (예외가 올라가면 작업 전체가 같은 체크포인트에서 재시도를 반복하다 실패함)
+    try:
+        data = b"".join(read_location(location))
+        return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def score_images(locations: Sequence[str], batch_size: int = 32) -> List[Optional[dict]]:
+    # 처리 워커(프로세스 풀)에서 실행: 디코드 후 같은 크기끼리 batch_size개씩 쌓아 한 번에 계산
+    # 읽을 수 없거나 디코드에 실패한 위치는 None
+    frames = [_load_gray(loc) for loc in locations]
+    groups: dict[tuple, list[int]] = defaultdict(list)
+    for i, frame in enumerate(frames):
+        if frame is not None:
+            groups[frame.shape].append(i)
+
+    results: List[Optional[dict]] = [None] * len(locations)
+    for idxs in groups.values():
+        for start in range(0, len(idxs), batch_size):
+            part = idxs[start:start + batch_size]
+            metrics = stack_metrics(np.stack([frames[i] for i in part]))
+            for j, i in enumerate(part):
+                results[i] = {name: float(metrics[name][j]) for name in QUALITY_METRICS}
+                results[i]["phash"] = to_hex(dhash(frames[i]))
+    return results
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import tempfile
+import time
+import zlib
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+CD_SPOOL_MAX = 8 * 1024 * 1024  # 중앙 디렉터리는 이 크기를 넘으면 임시 파일로 넘김
+ENTRIES_SPOOL_MAX = 8 * 1024 * 1024  # plan()에서 고정한 엔트리 목록도 같은 방식으로 넘김
+CRC_FLUSH = 1000  # 새로 계산한 CRC를 이 개수마다 on_crcs로 넘김
+
+# ZIP64가 필요한 경계값 (테스트에서 낮춰서 ZIP64 경로를 검증할 수 있도록 모듈 상수로 둠)
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_VERSION = 20
+_VERSION_ZIP64 = 45
+
+
+class ZipEntry(NamedTuple):
+    name: str
+    path: Path | str  # 로컬 경로 또는 저장소 위치 (reader가 해석)
+    size: int
+    mtime: float
+    crc: Optional[int] = None  # 저장해 둔 데이터 CRC-32 (있으면 이어받기 구간 앞의 데이터를 읽지 않음)
+    file_id: Optional[str] = None  # 새로 계산한 CRC를 저장할 files 행
+
+
+def entry_name(file_id: str, location: str) -> str:
+    # 처리 파일 이름은 중복 제거 모드에서 같은 내용의 업로드끼리 공유되므로 파일 id로 이름을 정함 (확장자는 유지)
+    return f"{file_id}{PurePosixPath(str(location)).suffix}"
+
+
+class ZipBase(NamedTuple):
+    # 이어 붙일 기존 아카이브: 엔트리 영역 길이(=중앙 디렉터리 시작 위치), 중앙 디렉터리 크기, 엔트리 수
+    path: Path
+    data_len: int
+    cd_size: int
+    count: int
+
+
+def _dos_datetime(ts: float) -> Tuple[int, int]:
+    t = time.localtime(ts)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def _encode_name(name: str) -> Tuple[bytes, int]:
+    try:
+        return name.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return name.encode("utf-8"), _FLAG_UTF8
+
+
+def _local_header_len(name_len: int, zip64: bool) -> int:
+    return 30 + name_len + (20 if zip64 else 0)
+
+
+def _descriptor_len(zip64: bool) -> int:
+    return 24 if zip64 else 16
+
+
+def _cd_entry_len(name_len: int, zip64: bool) -> int:
+    return 46 + name_len + (28 if zip64 else 0)
+
+
+def _entry_zip64(size: int) -> bool:
+    return size >= ZIP64_LIMIT
+
+
+def _local_header(name: bytes, flags: int, dos_time: int, dos_date: int, zip64: bool) -> bytes:
+    # STORED + 데이터 디스크립터: CRC는 데이터를 다 보낸 뒤 디스크립터에 기록
+    extra = struct.pack("<HHQQ", 0x0001, 16, 0, 0) if zip64 else b""
+    size_field = 0xFFFFFFFF if zip64 else 0
+    return (
+        struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50,
+            _VERSION_ZIP64 if zip64 else _VERSION,
+            flags,
+            0,  # STORED (JPEG/MP4는 이미 압축되어 있음)
+            dos_time,
+            dos_date,
+            0,
+            size_field,
+            size_field,
+            len(name),
+            len(extra),
+        )
+        + name
+        + extra
+    )
+
+
+def _descriptor(crc: int, size: int, zip64: bool) -> bytes:
+    if zip64:
+        return struct.pack("<IIQQ", 0x08074B50, crc, size, size)
+    return struct.pack("<IIII", 0x08074B50, crc, size, size)
+
+
+def _cd_entry(name: bytes, flags: int, dos_time: int, dos_date: int, crc: int, size: int, offset: int) -> bytes:
+    zip64 = _entry_zip64(size) or offset >= ZIP64_LIMIT
+    extra = struct.pack("<HHQQQ", 0x0001, 24, size, size, offset) if zip64 else b""
+    version = _VERSION_ZIP64 if zip64 else _VERSION
+    return (
+        struct.pack(
+            "<IHHHHHHIIIHHHHHII",
+            0x02014B50,
+            (3 << 8) | version,  # made by: UNIX
+            version,
+            flags,
+            0,
+            dos_time,
+            dos_date,
+            crc,
+            0xFFFFFFFF if zip64 else size,
+            0xFFFFFFFF if zip64 else size,
+            len(name),
+            len(extra),
+            0,
+            0,
+            0,
+            0o100644 << 16,
+            0xFFFFFFFF if zip64 else offset,
+        )
+        + name
+        + extra
+    )
+
+
+def _end_records(count: int, cd_size: int, cd_offset: int) -> bytes:
+    zip64 = count >= ZIP64_COUNT_LIMIT or cd_size >= ZIP64_LIMIT or cd_offset >= ZIP64_LIMIT
+    out = b""
+    if zip64:
+        eocd64_offset = cd_offset + cd_size
+        out += struct.pack(
+            "<IQHHIIQQQQ", 0x06064B50, 44, _VERSION_ZIP64, _VERSION_ZIP64, 0, 0, count, count, cd_size, cd_offset
+        )
+        out += struct.pack("<IIQI", 0x07064B50, 0, eocd64_offset, 1)
+    out += struct.pack(
+        "<IHHHHIIH",
+        0x06054B50,
+        0,
+        0,
+        min(count, 0xFFFF),
+        min(count, 0xFFFF),
+        min(cd_size, 0xFFFFFFFF),
+        min(cd_offset, 0xFFFFFFFF),
+        0,
+    )
+    return out
+
+
+def read_zip_base(path: Path) -> ZipBase:
+    # 이 모듈이 만든(주석 없는) 아카이브의 종료 레코드를 읽어 증분 빌드의 기준으로 사용
+    with path.open("rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(size - 22)
+        sig, _, _, _, count, cd_size, cd_offset, _ = struct.unpack("<IHHHHIIH", f.read(22))
+        if sig != 0x06054B50:
+            raise ValueError(f"Not a streamed ZIP archive: {path}")
+        if size >= 22 + 20 + 56:
+            f.seek(size - 22 - 20)
+            loc_sig, _, eocd64_offset, _ = struct.unpack("<IIQI", f.read(20))
+            if loc_sig == 0x07064B50:
+                f.seek(eocd64_offset)
+                rec = struct.unpack("<IQHHIIQQQQ", f.read(56))
+                count, cd_size, cd_offset = rec[7], rec[8], rec[9]
+    return ZipBase(path=path, data_len=cd_offset, cd_size=cd_size, count=count)
+
+
+def _end_records_len(count: int, cd_size: int, cd_offset: int) -> int:
+    zip64 = count >= ZIP64_COUNT_LIMIT or cd_size >= ZIP64_LIMIT or cd_offset >= ZIP64_LIMIT
+    return 22 + (76 if zip64 else 0)
+
+
+class ZipStream:
+    # 파일을 임시 디렉터리에 모으지 않고 ZIP 바이트를 바로 생성하는 스트리밍 작성기
+    # 레이아웃이 엔트리 이름/크기만으로 결정되므로 전체 길이를 미리 계산할 수 있고,
+    # 같은 엔트리 목록이면 항상 같은 바이트를 내므로 HTTP Range 이어받기가 가능하다
+    # base가 주어지면 기존 아카이브의 엔트리를 그대로 복사하고 그 뒤에 새 엔트리를 이어 붙인다 (증분 빌드)
+    # plan()을 호출하면 그때 조회한 엔트리 목록을 고정해 iter_bytes()에도 사용 (길이/ETag와 본문이 항상 일치)
+    def __init__(
+        self,
+        entries: Callable[[], Iterable[ZipEntry]],
+        chunk_size: int = CHUNK_SIZE,
+        base: Optional[ZipBase] = None,
+        reader: Optional[Callable[[ZipEntry, int], Iterable[bytes]]] = None,
+        on_crcs: Optional[Callable[[List[Tuple[ZipEntry, int]]], None]] = None,
+    ):
+        self._entries = entries
+        self.chunk_size = chunk_size
+        self.base = base
+        # 엔트리 데이터를 지정한 위치부터 청크로 읽는 함수 (기본: 로컬 파일, 원격 저장소는 호출자가 지정)
+        self.reader = reader or self._read_file
+        # CRC가 없던 엔트리를 끝까지 읽어 계산한 CRC를 넘겨받아 저장하는 함수 (다음 이어받기부터 건너뜀)
+        self.on_crcs = on_crcs
+        self._snapshot = None
+
+    def _read_file(self, entry: ZipEntry, start: int = 0) -> Iterator[bytes]:
+        with Path(entry.path).open("rb") as f:
+            f.seek(start)
+            yield from iter(lambda: f.read(self.chunk_size), b"")
+
+    def _iter_entries(self) -> Iterator[ZipEntry]:
+        if self._snapshot is None:
+            yield from self._entries()
+            return
+        self._snapshot.seek(0)
+        for line in self._snapshot:
+            name, path, size, mtime, crc, file_id = json.loads(line)
+            yield ZipEntry(name=name, path=path, size=size, mtime=mtime, crc=crc, file_id=file_id)
+
+    def plan(self) -> Tuple[int, str, int]:
+        # (전체 바이트 수, ETag, 엔트리 수) - 파일 내용은 읽지 않음
+        # 조회한 엔트리는 임시 파일에 기록해 두고 iter_bytes()에서 다시 조회하지 않음
+        h = hashlib.sha1()
+        offset = 0
+        cd_size = 0
+        count = 0
+        if self.base is not None:
+            offset, cd_size, count = self.base.data_len, self.base.cd_size, self.base.count
+            h.update(f"{self.base.path}\0{self.base.data_len}\0{self.base.count}\n".encode("utf-8"))
+        snapshot = tempfile.SpooledTemporaryFile(max_size=ENTRIES_SPOOL_MAX, mode="w+", encoding="utf-8")
+        for entry in self._entries():
+            name, _ = _encode_name(entry.name)
+            zip64 = _entry_zip64(entry.size)
+            cd_size += _cd_entry_len(len(name), zip64 or offset >= ZIP64_LIMIT)
+            offset += _local_header_len(len(name), zip64) + entry.size + _descriptor_len(zip64)
+            count += 1
+            h.update(f"{entry.name}\0{entry.size}\0{int(entry.mtime)}\n".encode("utf-8"))
+            snapshot.write(
+                json.dumps([entry.name, str(entry.path), entry.size, entry.mtime, entry.crc, entry.file_id]) + "\n"
+            )
+        if self._snapshot is not None:
+            self._snapshot.close()
+        self._snapshot = snapshot
+        total = offset + cd_size + _end_records_len(count, cd_size, offset)
+        return total, f'"{h.hexdigest()}"', count
+
+    def iter_bytes(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        # [start, end] 구간(양 끝 포함)만 내보냄, end=None이면 끝까지
+        pos = 0
+
+        def clip(data: bytes) -> bytes:
+            nonlocal pos
+            lo = pos
+            pos += len(data)
+            if pos <= start or (end is not None and lo > end):
+                return b""
+            a = max(0, start - lo)
+            b = len(data) if end is None else min(len(data), end - lo + 1)
+            return data[a:b]
+
+        def done() -> bool:
+            return end is not None and pos > end
+
+        offset = 0
+        count = 0
+        found: List[Tuple[ZipEntry, int]] = []
+
+        def flush() -> None:
+            if found and self.on_crcs is not None:
+                self.on_crcs(list(found))
+            found.clear()
+
+        with tempfile.SpooledTemporaryFile(max_size=CD_SPOOL_MAX) as cd:
+            try:
+                if self.base is not None:
+                    with self.base.path.open("rb") as f:
+                        # 기존 엔트리 영역은 그대로 복사하므로 구간 시작 위치로 바로 이동
+                        pos = min(start, self.base.data_len)
+                        f.seek(pos)
+                        remaining = self.base.data_len - pos
+                        while remaining > 0:
+                            chunk = f.read(min(self.chunk_size, remaining))
+                            if not chunk:
+                                raise RuntimeError(f"Base archive truncated: {self.base.path}")
+                            remaining -= len(chunk)
+                            out = clip(chunk)
+                            if out:
+                                yield out
+                            if done():
+                                return
+                        # 기존 중앙 디렉터리 항목은 그대로 재사용 (오프셋이 바뀌지 않음)
+                        f.seek(self.base.data_len)
+                        remaining = self.base.cd_size
+                        while remaining > 0:
+                            chunk = f.read(min(self.chunk_size, remaining))
+                            if not chunk:
+                                raise RuntimeError(f"Base archive truncated: {self.base.path}")
+                            remaining -= len(chunk)
+                            cd.write(chunk)
+                    offset = self.base.data_len
+                    count = self.base.count
+                for entry in self._iter_entries():
+                    name, utf8_flag = _encode_name(entry.name)
+                    flags = _FLAG_DATA_DESCRIPTOR | utf8_flag
+                    zip64 = _entry_zip64(entry.size)
+                    dos_time, dos_date = _dos_datetime(entry.mtime)
+                    entry_offset = offset
+
+                    out = clip(_local_header(name, flags, dos_time, dos_date, zip64))
+                    if out:
+                        yield out
+                    data_end = pos + entry.size
+                    if entry.crc is not None and data_end <= start:
+                        # 이어받기 구간 이전 데이터는 저장된 CRC를 쓰고 읽지 않음
+                        crc = entry.crc
+                        pos = data_end
+                    else:
+                        # CRC를 모르면 처음부터 읽어 계산, 알면 구간 시작 위치부터만 읽음
+                        skip = min(max(0, start - pos), entry.size) if entry.crc is not None else 0
+                        pos += skip
+                        crc = 0
+                        written = skip
+                        chunks = self.reader(entry, skip)
+                        try:
+                            for chunk in chunks:
+                                crc = zlib.crc32(chunk, crc)
+                                written += len(chunk)
+                                out = clip(chunk)
+                                if out:
+                                    yield out
+                                if done():
+                                    return
+                        finally:
+                            close = getattr(chunks, "close", None)
+                            if close is not None:
+                                close()
+                        if written != entry.size:
+                            raise RuntimeError(f"File changed during export: {entry.path}")
+                        if skip:
+                            crc = entry.crc
+                        elif entry.crc is None:
+                            found.append((entry, crc))
+                            if len(found) >= CRC_FLUSH:
+                                flush()
+                        elif crc != entry.crc:
+                            raise RuntimeError(f"File changed during export: {entry.path}")
+                    out = clip(_descriptor(crc, entry.size, zip64))
+                    if out:
+                        yield out
+                    if done():
+                        return
+                    offset = pos
+                    cd.write(_cd_entry(name, flags, dos_time, dos_date, crc, entry.size, entry_offset))
+                    count += 1
+
+                cd_size = cd.tell()
+                cd.seek(0)
+                for chunk in iter(lambda: cd.read(self.chunk_size), b""):
+                    out = clip(chunk)
+                    if out:
+                        yield out
+                    if done():
+                        return
+                out = clip(_end_records(count, cd_size, offset))
+                if out:
+                    yield out
+            finally:
+                # 응답이 중간에 끊겨도 그때까지 계산한 CRC는 저장
+                flush()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Dict
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.settings import settings
+from app.core.workers import WorkerPool, worker_pool
+from app.services.dataset_service import BUILD_DATASET_JOB, DatasetService
+from app.services.job_queue import job_queue
+from app.services.rescore_service import RESCORE_JOB, RescoreService
+from app.services.upload_service import PROCESS_UPLOAD_JOB, UploadService
+
+logger = logging.getLogger(__name__)
+
+upload_service = UploadService()
+dataset_service = DatasetService()
+rescore_service = RescoreService()
+
+# job_type → 처리 함수 (결과 dict는 processing_jobs.result에 기록)
+HANDLERS: Dict[str, Callable[[Session, dict], Awaitable[dict]]] = {
+    PROCESS_UPLOAD_JOB: upload_service.process_enqueued,
+    BUILD_DATASET_JOB: dataset_service.process_enqueued,
+    RESCORE_JOB: rescore_service.process_enqueued,
+}
+
+
+async def run_once(worker_id: str, pool: WorkerPool = worker_pool) -> bool:
+    # 작업 하나를 선점해 처리, 처리할 작업이 없으면 False
+    db = SessionLocal()
+    try:
+        job = await pool.run_io("job_claim", job_queue.claim, db, worker_id, list(HANDLERS))
+        if job is None:
+            return False
+        handler = HANDLERS[job.job_type]
+        try:
+            # 작업 ID도 함께 전달 (긴 작업의 체크포인트/재개용)
+            result = await handler(db, {**(job.payload or {}), "job_id": job.id})
+        except HTTPException as exc:
+            # 잘못된 입력(깨진 이미지 등)은 재시도해도 같으므로 바로 실패 처리
+            db.rollback()
+            await pool.run_io("job_update", job_queue.fail, db, job, str(exc.detail), retryable=False)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("job %s failed (attempt %s)", job.id, job.attempts)
+            db.rollback()
+            await pool.run_io("job_update", job_queue.fail, db, job, repr(exc))
+        else:
+            await pool.run_io("job_update", job_queue.complete, db, job, result)
+        return True
+    finally:
+        db.close()
+
+
+async def _loop(worker_id: str, pool: WorkerPool) -> None:
+    while True:
+        if not await run_once(worker_id, pool):
+            await asyncio.sleep(settings.worker_poll_interval_sec)
+
+
+async def run_worker(concurrency: int, pool: WorkerPool = worker_pool) -> None:
+    # 한 프로세스 안에서 concurrency개의 작업을 동시에 처리 (OpenCV 작업은 프로세스 풀로 분산)
+    base_id = f"{socket.gethostname()}-{os.getpid()}"
+    try:
+        await asyncio.gather(*(_loop(f"{base_id}-{i}", pool) for i in range(concurrency)))
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="processing_jobs 큐를 처리하는 로컬 워커")
+    parser.add_argument("--concurrency", type=int, default=4, help="프로세스당 동시에 처리할 작업 수")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run_worker(args.concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
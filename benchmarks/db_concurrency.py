@@ -0,0 +1,171 @@
+"""DB 동시성 벤치마크 (기본 SQLite 엔진 vs 현재 엔진: WAL/busy_timeout + 쓰기 트랜잭션 BEGIN IMMEDIATE)
+
+    python -m benchmarks.db_concurrency --writers 8 --readers 8 --duration 10
+    python -m benchmarks.db_concurrency --engines tuned --database-url postgresql+psycopg://.../bench
+
+업로드처럼 한 행씩 INSERT + 커밋하는 쓰기 스레드와 GET /files 목록 쿼리를 반복하는 읽기 스레드를
+동시에 돌려 초당 처리량, 지연(p50/p99), 잠금 대기 시간(트랜잭션 시작부터 쓰기 잠금을 얻고 INSERT 문들이
+끝날 때까지, 커밋 제외), "database is locked" 오류 수를 엔진 설정별로 비교한다.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (모델을 메타데이터에 등록)
+from app.core.database import Base, create_db_engine
+from app.models.file import File
+from app.schemas.upload import Metadata
+from app.services.file_query import build_file_filters
+from app.services.file_writer import build_file_row, insert_files
+
+VEHICLES = 20
+
+
+def make_row(i: int) -> dict:
+    captured = datetime(2025, 1, 1) + timedelta(seconds=i)
+    meta = Metadata(vehicle_id=f"car-{i % VEHICLES}", captured_at=captured.isoformat(), source="cam", route_id="r")
+    return build_file_row(
+        file_id=uuid4().hex,
+        original_filename="f.jpg",
+        stored_path="raw",
+        processed_path="processed",
+        media_type="image",
+        size_bytes=1000,
+        file_hash="0" * 64,
+        meta=meta,
+        computed={"blur_score": float(i % 500)},
+    )
+
+
+def seed(engine, rows: int) -> None:
+    with Session(engine) as db:
+        for start in range(0, rows, 5000):
+            insert_files(db, [make_row(i) for i in range(start, min(rows, start + 5000))])
+            db.commit()
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.latency: list[float] = []
+        self.lock_wait: list[float] = []
+        self.errors = 0
+
+    def add(self, latency: float, lock_wait: float = 0.0) -> None:
+        with self.lock:
+            self.latency.append(latency)
+            self.lock_wait.append(lock_wait)
+
+    def error(self) -> None:
+        with self.lock:
+            self.errors += 1
+
+
+def writer(engine, stats: Stats, deadline: float, offset: int) -> None:
+    i = offset
+    while time.perf_counter() < deadline:
+        row = make_row(i)
+        i += 1
+        start = time.perf_counter()
+        with Session(engine) as db:
+            try:
+                insert_files(db, [row])
+                acquired = time.perf_counter()
+                db.commit()
+            except OperationalError:
+                db.rollback()
+                stats.error()
+                continue
+        stats.add(time.perf_counter() - start, acquired - start)
+
+
+def reader(engine, stats: Stats, deadline: float, seed_id: int) -> None:
+    i = seed_id
+    while time.perf_counter() < deadline:
+        filters = build_file_filters(vehicle_id=f"car-{i % VEHICLES}", min_blur=100.0)
+        i += 1
+        stmt = select(File).where(*filters).order_by(File.captured_at.desc()).limit(50)
+        start = time.perf_counter()
+        with Session(engine) as db:
+            try:
+                db.scalars(stmt).all()
+            except OperationalError:
+                stats.error()
+                continue
+        stats.add(time.perf_counter() - start)
+
+
+def ms(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return statistics.quantiles(values, n=100)[int(q) - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+
+def run(name: str, engine, args) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    seed(engine, args.rows)
+
+    writes, reads = Stats(), Stats()
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=writer, args=(engine, writes, deadline, args.rows + n * 10_000_000))
+        for n in range(args.writers)
+    ] + [threading.Thread(target=reader, args=(engine, reads, deadline, n)) for n in range(args.readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"[{name}]")
+    print(
+        f"  writes {len(writes.latency) / args.duration:8.1f}/s  p50 {ms(writes.latency, 50):7.2f} ms"
+        f"  p99 {ms(writes.latency, 99):8.2f} ms  errors {writes.errors}"
+    )
+    print(
+        f"         lock wait total {sum(writes.lock_wait):6.2f} s  p50 {ms(writes.lock_wait, 50):7.2f} ms"
+        f"  p99 {ms(writes.lock_wait, 99):8.2f} ms"
+    )
+    print(
+        f"  reads  {len(reads.latency) / args.duration:8.1f}/s  p50 {ms(reads.latency, 50):7.2f} ms"
+        f"  p99 {ms(reads.latency, 99):8.2f} ms  errors {reads.errors}"
+    )
+    with Session(engine) as db:
+        db.execute(delete(File))
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="동시 업로드/목록 조회 처리량: 기본 엔진 vs 튜닝 엔진")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0, help="설정별 실행 시간(초)")
+    parser.add_argument("--rows", type=int, default=20_000, help="시작 전에 넣어 둘 행 수")
+    parser.add_argument("--engines", nargs="+", default=["baseline", "tuned"], choices=["baseline", "tuned"])
+    parser.add_argument("--database-url", default=None, help="기본: 설정마다 새 임시 SQLite 파일")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="db-bench-") as tmpdir:
+        for name in args.engines:
+            url = args.database_url or f"sqlite:///{Path(tmpdir) / f'{name}.db'}"
+            # baseline: 이전 database.py와 같은 기본 엔진 (rollback journal, 기본 잠금 대기)
+            engine = create_engine(url, future=True) if name == "baseline" else create_db_engine(url)
+            try:
+                run(name, engine, args)
+            finally:
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
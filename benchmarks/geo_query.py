@@ -0,0 +1,130 @@
+"""위치 조회 벤치마크 (지오해시 셀 범위 인덱스 vs 좌표 전체 스캔)
+
+    python -m benchmarks.geo_query --rows 1000000 --radius 500
+    python -m benchmarks.geo_query --rows 200000 --database-url postgresql+psycopg://.../bench
+
+임시 DB(기본 SQLite)에 서울 부근 50km 범위의 위치가 있는 files 행을 만들고, 임의 지점 반경 쿼리를
+두 방식으로 실행해 결과 수가 같은지 확인하며 쿼리당 지연(ms)을 비교한다.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import and_, create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.file import File
+from app.services.file_query import build_file_filters
+from app.utils.geohash import encode, meters_per_degree, radius_bbox
+
+CENTER = (37.55, 126.99)
+SPAN_DEG = 0.45  # 약 50km
+
+
+def seed(db: Session, rows: int, batch: int = 20_000) -> None:
+    rng = random.Random(0)
+    now = datetime(2025, 1, 1)
+    for start in range(0, rows, batch):
+        values = []
+        for i in range(start, min(rows, start + batch)):
+            lat = CENTER[0] + rng.uniform(-SPAN_DEG, SPAN_DEG)
+            lon = CENTER[1] + rng.uniform(-SPAN_DEG, SPAN_DEG)
+            values.append(
+                {
+                    "id": f"{i:032x}",
+                    "original_filename": "f.jpg",
+                    "stored_path": "r",
+                    "processed_path": "p",
+                    "media_type": "image",
+                    "size_bytes": 1,
+                    "sha256": "0",
+                    "vehicle_id": f"car-{i % 50}",
+                    "captured_at": now,
+                    "source": "cam",
+                    "route_id": "r",
+                    "location_lat": lat,
+                    "location_lon": lon,
+                    "geohash": encode(lat, lon),
+                    "meta_json": {},
+                    "computed_json": {},
+                    "created_at": now,
+                }
+            )
+        db.execute(insert(File), values)
+        db.commit()
+
+
+def full_scan_filters(lat: float, lon: float, radius_m: float) -> list:
+    # 기준선: 셀 조건 없이 좌표만으로 거름 (location 컬럼에 인덱스가 없어 전체 스캔)
+    west, south, east, north = radius_bbox(lat, lon, radius_m)
+    kx, ky = meters_per_degree(lat)
+    dx = (File.location_lon - lon) * kx
+    dy = (File.location_lat - lat) * ky
+    return [
+        File.location_lon.between(west, east),
+        File.location_lat.between(south, north),
+        dx * dx + dy * dy <= radius_m * radius_m,
+    ]
+
+
+def timed_count(db: Session, filters: list) -> tuple[int, float]:
+    start = time.perf_counter()
+    n = db.scalar(select(func.count()).select_from(File).where(and_(*filters)))
+    return n, (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="반경 조회: 지오해시 인덱스 vs 전체 스캔")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--radius", type=float, default=500.0, help="반경(m)")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--database-url", default=None, help="기본: 임시 SQLite 파일")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.database_url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="geo-bench-")
+        url = f"sqlite:///{Path(tmpdir.name) / 'bench.db'}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine, tables=[File.__table__])
+    Base.metadata.create_all(engine, tables=[File.__table__])
+
+    try:
+        with Session(engine) as db:
+            start = time.perf_counter()
+            seed(db, args.rows)
+            print(f"seeded {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+
+            rng = random.Random(1)
+            points = [
+                (CENTER[0] + rng.uniform(-0.3, 0.3), CENTER[1] + rng.uniform(-0.3, 0.3)) for _ in range(args.queries)
+            ]
+            scan_ms, index_ms, matched = [], [], 0
+            for lat, lon in points:
+                n_scan, t_scan = timed_count(db, full_scan_filters(lat, lon, args.radius))
+                filters = build_file_filters(near_lat=lat, near_lon=lon, radius_m=args.radius)
+                n_index, t_index = timed_count(db, filters)
+                assert n_scan == n_index, (lat, lon, n_scan, n_index)
+                scan_ms.append(t_scan)
+                index_ms.append(t_index)
+                matched += n_index
+
+        print(f"radius {args.radius:.0f}m, {args.queries} queries, avg {matched / args.queries:.0f} matches")
+        print(f"  full scan   p50 {statistics.median(scan_ms):8.2f} ms   max {max(scan_ms):8.2f} ms")
+        print(f"  geohash     p50 {statistics.median(index_ms):8.2f} ms   max {max(index_ms):8.2f} ms")
+    finally:
+        engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""files INSERT 묶음 처리 벤치마크 (행마다 커밋 vs 창 단위 그룹 커밋)
+
+    python -m benchmarks.insert_coalesce --uploads 2000 --concurrency 200
+    python -m benchmarks.insert_coalesce --windows 1 5 10 --max-rows 200 --target-ms 20
+
+임시 SQLite DB에 동시 업로드 concurrency개가 계속 한 행씩 기록하는 상황을 만들고, 행마다 INSERT + 커밋하는
+기존 방식과 InsertCoalescer(창 크기별)의 초당 기록 행 수와 요청별 지연(p50/p99), 배치 수를 비교한다.
+지연 목표(--target-ms)에 맞는 창 크기를 고르는 데 사용한다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import app.models  # noqa: F401  (모델을 메타데이터에 등록)
+from app.core.database import Base, SessionLocal, create_db_engine
+from app.core.metrics import metrics
+from app.core.workers import WorkerPool
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row, insert_files
+from app.services.insert_coalescer import InsertCoalescer
+
+
+def make_row(i: int) -> dict:
+    captured = datetime(2025, 1, 1) + timedelta(seconds=i)
+    meta = Metadata(vehicle_id=f"car-{i % 20}", captured_at=captured.isoformat(), source="cam", route_id="r")
+    return build_file_row(
+        file_id=uuid4().hex,
+        original_filename="f.jpg",
+        stored_path="raw",
+        processed_path="processed",
+        media_type="image",
+        size_bytes=1000,
+        file_hash="0" * 64,
+        meta=meta,
+        computed={"blur_score": float(i % 500)},
+    )
+
+
+def insert_one(row: dict) -> None:
+    with SessionLocal() as db:
+        insert_files(db, [row])
+        db.commit()
+
+
+async def run(name: str, insert, uploads: int, concurrency: int) -> None:
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+    batches_before = metrics.snapshot()["counters"].get("insert_batches", 0)
+
+    async def upload(i: int) -> None:
+        async with sem:
+            row = make_row(i)
+            start = time.perf_counter()
+            await insert(row)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(upload(i) for i in range(uploads)))
+    elapsed = time.perf_counter() - start
+    batches = metrics.snapshot()["counters"].get("insert_batches", 0) - batches_before
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"  {name:<16} {uploads / elapsed:9.0f} rows/s   p50 {q[49] * 1000:8.2f} ms   p99 {q[98] * 1000:8.2f} ms"
+        f"   batches {batches or uploads}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="행마다 커밋 vs InsertCoalescer")
+    parser.add_argument("--uploads", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100, help="동시에 기록을 기다리는 업로드 수")
+    parser.add_argument("--windows", type=float, nargs="+", default=[1.0, 5.0, 10.0], help="창 크기(ms)")
+    parser.add_argument("--max-rows", type=int, default=200)
+    parser.add_argument("--target-ms", type=float, default=0.0)
+    parser.add_argument("--io-workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="coalesce-bench-") as tmpdir:
+        engine = create_db_engine(f"sqlite:///{Path(tmpdir) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        SessionLocal.configure(bind=engine)
+        pool = WorkerPool(media_workers=0, io_workers=args.io_workers, max_inflight=1, max_queued=1)
+        try:
+            print(f"{args.uploads} uploads, concurrency {args.concurrency}")
+            per_row = lambda row: pool.run_io("db_commit", insert_one, row)  # noqa: E731
+            asyncio.run(run("per-row commit", per_row, args.uploads, args.concurrency))
+            for window in args.windows:
+                coalescer = InsertCoalescer(pool, window_ms=window, max_rows=args.max_rows, target_ms=args.target_ms)
+                asyncio.run(run(f"window {window:g} ms", coalescer.insert, args.uploads, args.concurrency))
+        finally:
+            pool.shutdown()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""GET /files 목록 직렬화 벤치마크 (ORM 객체 + jsonable_encoder vs 컬럼 선택 + json_codec)
+
+    python -m benchmarks.list_serialization --rows 20000 --limit 200
+    python -m benchmarks.list_serialization --fields id,stored_path,processed_path
+
+임시 SQLite DB에 files 행을 넣고, 한 페이지(limit행)를 조회해 응답 바이트를 만들기까지의 시간(쿼리 포함)과
+본문 크기를 기존 방식(select(File) → jsonable_encoder → JSONResponse), 전체 컬럼 선택, --fields 선택별로 비교한다.
+orjson 설치 여부에 따라 json_codec 경로가 달라지므로 둘 다 재려면 설치/미설치 상태에서 각각 실행한다.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (모델을 메타데이터에 등록)
+from app.core.database import Base, create_db_engine
+from app.models.file import File
+from app.schemas.upload import Metadata
+from app.services.file_query import FILE_FIELDS, file_columns, parse_fields
+from app.services.file_writer import build_file_row, insert_files
+from app.utils import json_codec
+
+
+def make_row(i: int) -> dict:
+    captured = datetime(2025, 1, 1) + timedelta(seconds=i)
+    meta = Metadata(
+        vehicle_id=f"car-{i % 20}",
+        captured_at=captured.isoformat(),
+        source="camera_front",
+        route_id="route-1",
+        location_lat=37.5 + i * 1e-6,
+        location_lon=127.0,
+        weather="clear",
+        extra={"lidar": {"points": 120_000, "sensor": "hdl-64"}, "tags": ["day", "urban"]},
+    )
+    computed = {
+        "blur_score": float(i % 500),
+        "width": 1920,
+        "height": 1080,
+        "brightness": 0.51,
+        "phash": "8f0e3c1a22b4d6e9",
+    }
+    return build_file_row(
+        file_id=uuid4().hex,
+        original_filename=f"frame_{i:06d}.jpg",
+        stored_path=f"data/raw/2025/01/01/{uuid4().hex}.jpg",
+        processed_path=f"data/processed/2025/01/01/{uuid4().hex}.jpg",
+        media_type="image",
+        size_bytes=850_000,
+        file_hash="0" * 64,
+        meta=meta,
+        computed=computed,
+    )
+
+
+def orm_page(db: Session, limit: int, offset: int) -> bytes:
+    # 변경 전 list_files 경로
+    objs = db.scalars(select(File).order_by(File.captured_at).offset(offset).limit(limit)).all()
+    return JSONResponse(jsonable_encoder(objs)).body
+
+
+def projected_page(db: Session, fields: tuple, limit: int, offset: int) -> bytes:
+    stmt = select(*file_columns(fields)).order_by(File.captured_at).offset(offset).limit(limit)
+    return json_codec.dumps([dict(zip(fields, row)) for row in db.execute(stmt)])
+
+
+def run(name: str, page, engine, args) -> None:
+    times = []
+    size = 0
+    for n in range(args.repeat):
+        offset = (n * args.limit) % max(1, args.rows - args.limit)
+        with Session(engine) as db:
+            start = time.perf_counter()
+            body = page(db, args.limit, offset)
+            times.append(time.perf_counter() - start)
+        size = len(body)
+    print(
+        f"  {name:<40} p50 {statistics.median(times) * 1000:7.2f} ms   "
+        f"min {min(times) * 1000:7.2f} ms   body {size / 1024:8.1f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="목록 응답 직렬화: ORM + jsonable_encoder vs 컬럼 선택")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--fields", default="id,stored_path,processed_path")
+    args = parser.parse_args()
+    fields = parse_fields(args.fields)
+
+    with tempfile.TemporaryDirectory(prefix="list-bench-") as tmpdir:
+        engine = create_db_engine(f"sqlite:///{Path(tmpdir) / 'bench.db'}")
+        try:
+            Base.metadata.create_all(engine)
+            with Session(engine) as db:
+                for start in range(0, args.rows, 5000):
+                    insert_files(db, [make_row(i) for i in range(start, min(args.rows, start + 5000))])
+                    db.commit()
+            codec = "orjson" if json_codec.orjson is not None else "json"
+            print(f"{args.rows} rows, page {args.limit}, codec {codec}")
+            run("orm + jsonable_encoder", orm_page, engine, args)
+            run("all columns", lambda db, limit, offset: projected_page(db, FILE_FIELDS, limit, offset), engine, args)
+            run(f"fields={args.fields}", lambda db, limit, offset: projected_page(db, fields, limit, offset), engine, args)
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
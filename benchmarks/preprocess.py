@@ -0,0 +1,91 @@
+"""이미지 전처리 마이크로 벤치마크 (이전 방식 vs 축소 디코드/그레이 블러/버퍼 재사용)
+
+    python -m benchmarks.preprocess --images 50 --size 4000x3000
+    python -m benchmarks.preprocess --src /mnt/data/samples --repeat 3
+
+--src를 주지 않으면 카메라 프레임과 비슷한 합성 JPEG를 만들어 사용한다.
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import cv2
+import numpy as np
+
+from app.utils.media import preprocess_image
+
+
+def legacy_preprocess(src: Path, dst: Path, resize: Tuple[int, int], jpeg_quality: int) -> dict:
+    # 변경 전 구현: 전체 해상도 디코드 + BGR 3채널 float64 라플라시안
+    img = cv2.imread(str(src))
+    resized = cv2.resize(img, resize)
+    blur = float(cv2.Laplacian(resized, cv2.CV_64F).var())
+    cv2.imwrite(str(dst), resized, [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)])
+    return {"width": resized.shape[1], "height": resized.shape[0], "blur_score": blur}
+
+
+def make_images(root: Path, count: int, size: Tuple[int, int]) -> List[Path]:
+    # 노이즈 + 블러로 실제 사진에 가까운 압축률을 만든 JPEG
+    w, h = size
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (h, w, 3), dtype=np.uint8), (9, 9), 0)
+    paths = []
+    for i in range(count):
+        p = root / f"frame_{i:04d}.jpg"
+        cv2.imwrite(str(p), np.roll(base, i * 7, axis=1), [int(cv2.IMWRITE_JPEG_QUALITY), 92])
+        paths.append(p)
+    return paths
+
+
+def bench(name: str, fn: Callable, paths: List[Path], out: Path, repeat: int) -> float:
+    fn(paths[0], out / "warmup.jpg")
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for i, p in enumerate(paths):
+            fn(p, out / f"{name}_{i}.jpg")
+    elapsed = time.perf_counter() - start
+    return len(paths) * repeat / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="preprocess_image 처리량 비교")
+    parser.add_argument("--src", type=Path, default=None, help="JPEG 샘플 디렉터리 (기본: 합성 이미지)")
+    parser.add_argument("--images", type=int, default=30)
+    parser.add_argument("--size", default="4000x3000", help="합성 이미지 크기 WxH")
+    parser.add_argument("--resize", default="640x640")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)  # 워커 프로세스 1개 기준 처리량
+    resize = tuple(int(v) for v in args.resize.split("x"))
+    root = Path(tempfile.mkdtemp(prefix="preprocess-bench-"))
+    try:
+        if args.src:
+            paths = sorted(p for p in args.src.iterdir() if p.suffix.lower() in {".jpg", ".jpeg"})[: args.images]
+        else:
+            paths = make_images(root, args.images, tuple(int(v) for v in args.size.split("x")))
+        out = root / "out"
+        out.mkdir()
+
+        cases = [
+            ("legacy", lambda p, d: legacy_preprocess(p, d, resize, 90)),
+            ("full-decode", lambda p, d: preprocess_image(p, d, resize, 90, reduced_decode=False)),
+            ("reduced", lambda p, d: preprocess_image(p, d, resize, 90)),
+        ]
+        print(f"{len(paths)} images x {args.repeat}, resize={resize}")
+        baseline = None
+        for name, fn in cases:
+            rate = bench(name, fn, paths, out, args.repeat)
+            baseline = baseline or rate
+            print(f"  {name:<12} {rate:>8.1f} images/sec  (x{rate / baseline:.2f})")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
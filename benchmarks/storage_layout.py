@@ -0,0 +1,90 @@
+"""LocalStorage 디렉터리 레이아웃 벤치마크 (flat vs sharded)
+
+    python -m benchmarks.storage_layout --files 1000000 --root /mnt/data/bench
+    python -m benchmarks.storage_layout --files 200000 --layouts sharded --fsync
+
+구간(--report-every)마다 저장 속도(saves/sec)를 출력해 파일 수가 늘어날 때의 저하를 비교하고,
+마지막에 임의 파일 stat 지연과 하위 디렉터리 나열 시간을 잰다.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from app.storage.local import LAYOUT_FLAT, LAYOUT_SHARDED, LocalStorage
+
+
+def bench_layout(root: Path, layout: str, files: int, payload: bytes, report_every: int, fsync: bool) -> dict:
+    storage = LocalStorage(root / layout, layout=layout, fsync=fsync)
+    paths = []
+    start = window_start = time.perf_counter()
+    for i in range(1, files + 1):
+        dest, _, _ = storage.save_stream(io.BytesIO(payload), subdir="raw", suffix=".jpg")
+        paths.append(dest)
+        if i % report_every == 0:
+            now = time.perf_counter()
+            print(f"  [{layout}] {i:>10,} files  {report_every / (now - window_start):>10,.0f} saves/sec")
+            window_start = now
+    total_sec = time.perf_counter() - start
+
+    # 임의 파일 조회 (다운로드/내보내기의 stat 경로)
+    sample = random.sample(paths, min(10_000, len(paths)))
+    t = time.perf_counter()
+    for p in sample:
+        os.stat(p)
+    stat_us = (time.perf_counter() - t) / len(sample) * 1e6
+
+    # 가장 큰 디렉터리 하나를 나열 (백업/정리 도구가 겪는 비용)
+    biggest = max({p.parent for p in sample}, key=lambda d: sum(1 for _ in os.scandir(d)))
+    t = time.perf_counter()
+    entries = sum(1 for _ in os.scandir(biggest))
+    list_ms = (time.perf_counter() - t) * 1000
+    return {
+        "layout": layout,
+        "files": files,
+        "saves_per_sec": files / total_sec,
+        "stat_us": stat_us,
+        "largest_dir_entries": entries,
+        "largest_dir_list_ms": list_ms,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LocalStorage flat/sharded 저장 벤치마크")
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=1024, help="파일당 바이트 수")
+    parser.add_argument("--layouts", nargs="+", default=[LAYOUT_FLAT, LAYOUT_SHARDED])
+    parser.add_argument("--report-every", type=int, default=100_000)
+    parser.add_argument("--fsync", action="store_true", help="파일/디렉터리 fsync 포함")
+    parser.add_argument("--root", type=Path, default=None, help="기본: 임시 디렉터리 (끝나면 삭제)")
+    parser.add_argument("--keep", action="store_true", help="생성한 파일을 지우지 않음")
+    args = parser.parse_args()
+
+    root = args.root or Path(tempfile.mkdtemp(prefix="storage-bench-"))
+    payload = os.urandom(args.size)
+    results = []
+    try:
+        for layout in args.layouts:
+            print(f"{layout}: {args.files:,} files x {args.size} bytes (fsync={args.fsync})")
+            results.append(bench_layout(root, layout, args.files, payload, args.report_every, args.fsync))
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print()
+    print(f"{'layout':<8} {'saves/sec':>12} {'stat(us)':>10} {'max dir':>10} {'list(ms)':>10}")
+    for r in results:
+        print(
+            f"{r['layout']:<8} {r['saves_per_sec']:>12,.0f} {r['stat_us']:>10.1f}"
+            f" {r['largest_dir_entries']:>10,} {r['largest_dir_list_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""initial schema (files, datasets, processing_jobs)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "files",
+        sa.Column("id", sa.String(length=64), nullable=False),
+        sa.Column("original_filename", sa.String(length=255), nullable=False),
+        sa.Column("stored_path", sa.String(length=1024), nullable=False),
+        sa.Column("processed_path", sa.String(length=1024), nullable=False),
+        sa.Column("media_type", sa.String(length=16), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("sha256", sa.String(length=128), nullable=False),
+        sa.Column("vehicle_id", sa.String(length=128), nullable=False),
+        sa.Column("captured_at", sa.DateTime(), nullable=False),
+        sa.Column("source", sa.String(length=64), nullable=False),
+        sa.Column("route_id", sa.String(length=128), nullable=False),
+        sa.Column("location_lat", sa.Float(), nullable=True),
+        sa.Column("location_lon", sa.Float(), nullable=True),
+        sa.Column("weather", sa.String(length=64), nullable=True),
+        sa.Column("note", sa.String(length=255), nullable=True),
+        sa.Column("meta_json", sa.JSON(), nullable=False),
+        sa.Column("computed_json", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "datasets",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.Column("version", sa.String(length=64), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("path", sa.String(length=1024), nullable=False),
+        sa.Column("filters", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("created_by", sa.String(length=128), nullable=True),
+        sa.Column("manifest_hash", sa.String(length=64), nullable=False),
+        sa.Column("file_count", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("base_dataset_id", sa.Integer(), nullable=True),
+        sa.Column("job_id", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name", "version", name="uq_datasets_name_version"),
+    )
+    op.create_index("ix_datasets_manifest_hash", "datasets", ["manifest_hash"])
+    op.create_table(
+        "processing_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_type", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("lease_owner", sa.String(length=128), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.String(length=1024), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_processing_jobs_status_available_at", "processing_jobs", ["status", "available_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_processing_jobs_status_available_at", table_name="processing_jobs")
+    op.drop_table("processing_jobs")
+    op.drop_index("ix_datasets_manifest_hash", table_name="datasets")
+    op.drop_table("datasets")
+    op.drop_table("files")
@@ -0,0 +1,35 @@
+"""files: composite indexes for list filters and keyset pagination
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_files_vehicle_id_captured_at", ["vehicle_id", "captured_at"]),
+    ("ix_files_route_id_captured_at", ["route_id", "captured_at"]),
+    ("ix_files_source_captured_at", ["source", "captured_at"]),
+    ("ix_files_media_type_captured_at", ["media_type", "captured_at"]),
+    ("ix_files_captured_at_id", ["captured_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, "files", columns)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="files")
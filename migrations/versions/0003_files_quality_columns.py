@@ -0,0 +1,61 @@
+"""files: promote computed quality metrics to indexed columns
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ("blur_score", sa.Float()),
+    ("width", sa.Integer()),
+    ("height", sa.Integer()),
+    ("fps", sa.Float()),
+    ("duration_sec", sa.Float()),
+    ("frame_count", sa.Integer()),
+]
+
+INDEXES = [
+    ("ix_files_blur_score", ["blur_score"]),
+    ("ix_files_media_type_blur_score", ["media_type", "blur_score"]),
+    ("ix_files_duration_sec", ["duration_sec"]),
+]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("files") as batch:
+        for name, type_ in COLUMNS:
+            batch.add_column(sa.Column(name, type_, nullable=True))
+
+    # 기존 행은 computed_json에서 한 번의 UPDATE로 채움 (computed_json은 그대로 유지)
+    files = sa.table("files", sa.column("computed_json", sa.JSON()), *(sa.column(n, t) for n, t in COLUMNS))
+    values = {
+        name: (
+            files.c.computed_json[name].as_integer()
+            if isinstance(type_, sa.Integer)
+            else files.c.computed_json[name].as_float()
+        )
+        for name, type_ in COLUMNS
+    }
+    op.execute(files.update().values(**values))
+
+    for name, columns in INDEXES:
+        op.create_index(name, "files", columns)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="files")
+    with op.batch_alter_table("files") as batch:
+        for name, _ in reversed(COLUMNS):
+            batch.drop_column(name)
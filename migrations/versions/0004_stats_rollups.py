@@ -0,0 +1,114 @@
+"""stats rollup tables maintained on file insert
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+import math
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEY_COLUMNS = [
+    ("day", sa.Date()),
+    ("media_type", sa.String(length=16)),
+    ("vehicle_id", sa.String(length=128)),
+    ("route_id", sa.String(length=128)),
+]
+
+# 이 리비전 시점의 집계 규칙을 고정한 사본 (app/services/stats_rollup.py가 바뀌어도 이 마이그레이션 결과는 그대로)
+BLUR_BUCKETS_PER_DECADE = 20
+BLUR_MAX_DECADE = 6
+BLUR_BUCKET_COUNT = BLUR_BUCKETS_PER_DECADE * BLUR_MAX_DECADE + 2
+
+
+def blur_bucket(value: float) -> int:
+    if value < 1.0:
+        return 0
+    return min(BLUR_BUCKET_COUNT - 1, 1 + int(math.log10(value) * BLUR_BUCKETS_PER_DECADE))
+
+
+def rollup_deltas(rows):
+    # (촬영일, 타입, 차량, 경로) 단위 합계와 블러 히스토그램
+    keys = [name for name, _ in KEY_COLUMNS]
+    rollups = {}
+    buckets = defaultdict(int)
+    for row in rows:
+        key = (row["captured_at"].date(), row["media_type"], row["vehicle_id"], row["route_id"])
+        agg = rollups.get(key)
+        if agg is None:
+            agg = rollups[key] = {
+                **dict(zip(keys, key)),
+                "file_count": 0,
+                "size_bytes_sum": 0,
+                "blur_count": 0,
+                "blur_sum": 0.0,
+                "blur_min": None,
+                "blur_max": None,
+            }
+        agg["file_count"] += 1
+        agg["size_bytes_sum"] += row["size_bytes"]
+        blur = row["blur_score"]
+        if blur is not None:
+            agg["blur_count"] += 1
+            agg["blur_sum"] += blur
+            agg["blur_min"] = blur if agg["blur_min"] is None else min(agg["blur_min"], blur)
+            agg["blur_max"] = blur if agg["blur_max"] is None else max(agg["blur_max"], blur)
+            buckets[(key, blur_bucket(blur))] += 1
+    return rollups, buckets
+
+
+def upgrade() -> None:
+    rollups = op.create_table(
+        "stats_rollups",
+        *(sa.Column(name, type_, nullable=False) for name, type_ in KEY_COLUMNS),
+        sa.Column("file_count", sa.Integer(), nullable=False),
+        sa.Column("size_bytes_sum", sa.BigInteger(), nullable=False),
+        sa.Column("blur_count", sa.Integer(), nullable=False),
+        sa.Column("blur_sum", sa.Float(), nullable=False),
+        sa.Column("blur_min", sa.Float(), nullable=True),
+        sa.Column("blur_max", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("day", "media_type", "vehicle_id", "route_id"),
+    )
+    buckets = op.create_table(
+        "stats_blur_buckets",
+        *(sa.Column(name, type_, nullable=False) for name, type_ in KEY_COLUMNS),
+        sa.Column("bucket", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "media_type", "vehicle_id", "route_id", "bucket"),
+    )
+
+    # 기존 files 행으로 집계를 채움 (그룹 단위 합계만 메모리에 유지)
+    files = sa.table(
+        "files",
+        sa.column("captured_at", sa.DateTime()),
+        sa.column("media_type", sa.String()),
+        sa.column("vehicle_id", sa.String()),
+        sa.column("route_id", sa.String()),
+        sa.column("size_bytes", sa.Integer()),
+        sa.column("blur_score", sa.Float()),
+    )
+    conn = op.get_bind()
+    result = conn.execute(sa.select(files).execution_options(yield_per=1000))
+    agg, hist = rollup_deltas(row._asdict() for row in result)
+    if agg:
+        op.bulk_insert(rollups, list(agg.values()))
+    if hist:
+        keys = [name for name, _ in KEY_COLUMNS]
+        op.bulk_insert(
+            buckets, [{**dict(zip(keys, key)), "bucket": b, "count": c} for (key, b), c in hist.items()]
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("stats_blur_buckets")
+    op.drop_table("stats_rollups")
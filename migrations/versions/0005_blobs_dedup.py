@@ -0,0 +1,38 @@
+"""content-addressed blobs with reference counts, files.sha256 index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("media_type", sa.String(length=16), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("stored_path", sa.String(length=1024), nullable=False),
+        sa.Column("processed_path", sa.String(length=1024), nullable=False),
+        sa.Column("computed_json", sa.JSON(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.create_index("ix_files_sha256", "files", ["sha256"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_files_sha256", table_name="files")
+    op.drop_table("blobs")
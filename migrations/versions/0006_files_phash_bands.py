@@ -0,0 +1,36 @@
+"""files: perceptual hash bands for near-duplicate lookup
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ["phash_b0", "phash_b1", "phash_b2", "phash_b3"]
+
+
+def upgrade() -> None:
+    # 기존 행은 NULL로 두고 재채점 작업(POST /api/jobs/rescore)이 이미지를 다시 읽어 채움
+    with op.batch_alter_table("files") as batch:
+        for name in COLUMNS:
+            batch.add_column(sa.Column(name, sa.Integer(), nullable=True))
+    for name in COLUMNS:
+        op.create_index(f"ix_files_{name}", "files", [name])
+
+
+def downgrade() -> None:
+    for name in reversed(COLUMNS):
+        op.drop_index(f"ix_files_{name}", table_name="files")
+    with op.batch_alter_table("files") as batch:
+        for name in reversed(COLUMNS):
+            batch.drop_column(name)
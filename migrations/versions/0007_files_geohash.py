@@ -0,0 +1,88 @@
+"""files: geohash column for spatial filters
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+
+# 이 리비전 시점의 지오해시 인코딩을 고정한 사본 (app/utils/geohash.py가 바뀌어도 이 마이그레이션 결과는 그대로)
+ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9
+
+
+def encode(lat: float, lon: float, precision: int = PRECISION) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    out = []
+    bits = 0
+    value = 0
+    even = True  # 짝수 번째 비트는 경도
+    while len(out) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            bit = lon >= mid
+            lon_lo, lon_hi = (mid, lon_hi) if bit else (lon_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            bit = lat >= mid
+            lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+        value = (value << 1) | bit
+        even = not even
+        bits += 1
+        if bits == 5:
+            out.append(ALPHABET[value])
+            bits = value = 0
+    return "".join(out)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("files") as batch:
+        batch.add_column(sa.Column("geohash", sa.String(length=12), nullable=True))
+
+    # 좌표가 있는 기존 행은 id 순서로 BATCH개씩 읽어(키셋) 파이썬에서 인코딩하고 배치마다 executemany로 채움
+    # (전체 행을 메모리에 올리지 않음)
+    files = sa.table(
+        "files",
+        sa.column("id", sa.String()),
+        sa.column("location_lat", sa.Float()),
+        sa.column("location_lon", sa.Float()),
+        sa.column("geohash", sa.String()),
+    )
+    conn = op.get_bind()
+    stmt = files.update().where(files.c.id == sa.bindparam("b_id")).values(geohash=sa.bindparam("b_geohash"))
+    last_id = None
+    while True:
+        query = (
+            sa.select(files.c.id, files.c.location_lat, files.c.location_lon)
+            .where(files.c.location_lat.isnot(None), files.c.location_lon.isnot(None))
+            .order_by(files.c.id)
+            .limit(BATCH)
+        )
+        if last_id is not None:
+            query = query.where(files.c.id > last_id)
+        rows = conn.execute(query).all()
+        if not rows:
+            break
+        conn.execute(stmt, [{"b_id": r.id, "b_geohash": encode(r.location_lat, r.location_lon)} for r in rows])
+        last_id = rows[-1].id
+
+    op.create_index("ix_files_geohash", "files", ["geohash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_files_geohash", table_name="files")
+    with op.batch_alter_table("files") as batch:
+        batch.drop_column("geohash")
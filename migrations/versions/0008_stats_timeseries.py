@@ -0,0 +1,82 @@
+"""stats_timeseries: per-minute/hour/day capture counts maintained on insert
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 이 리비전 시점의 버킷 규칙을 고정한 사본 (app/services/timeseries.py가 바뀌어도 이 마이그레이션 결과는 그대로)
+GRANULARITIES = ("minute", "hour", "day")
+SERIES_KEY = ("granularity", "bucket_start", "vehicle_id", "route_id", "source")
+
+
+def bucket_start(ts, granularity: str):
+    ts = ts.replace(tzinfo=None, second=0, microsecond=0)
+    if granularity == "hour":
+        return ts.replace(minute=0)
+    if granularity == "day":
+        return ts.replace(hour=0, minute=0)
+    return ts
+
+
+def timeseries_deltas(rows) -> dict:
+    # (단위, 버킷, 차량, 경로, 소스) 단위 합계
+    deltas = {}
+    for row in rows:
+        for granularity in GRANULARITIES:
+            start = bucket_start(row["captured_at"], granularity)
+            key = (granularity, start, row["vehicle_id"], row["route_id"], row["source"])
+            agg = deltas.get(key)
+            if agg is None:
+                agg = deltas[key] = {**dict(zip(SERIES_KEY, key)), "file_count": 0, "size_bytes_sum": 0}
+            agg["file_count"] += 1
+            agg["size_bytes_sum"] += row["size_bytes"]
+    return deltas
+
+
+def upgrade() -> None:
+    series = op.create_table(
+        "stats_timeseries",
+        sa.Column("granularity", sa.String(length=8), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("vehicle_id", sa.String(length=128), nullable=False),
+        sa.Column("route_id", sa.String(length=128), nullable=False),
+        sa.Column("source", sa.String(length=64), nullable=False),
+        sa.Column("file_count", sa.Integer(), nullable=False),
+        sa.Column("size_bytes_sum", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("granularity", "bucket_start", "vehicle_id", "route_id", "source"),
+    )
+    op.create_index("ix_stats_timeseries_vehicle", "stats_timeseries", ["granularity", "vehicle_id", "bucket_start"])
+    op.create_index("ix_stats_timeseries_route", "stats_timeseries", ["granularity", "route_id", "bucket_start"])
+
+    # 기존 files 행으로 채움 (버킷 단위 합계만 메모리에 유지)
+    files = sa.table(
+        "files",
+        sa.column("captured_at", sa.DateTime()),
+        sa.column("vehicle_id", sa.String()),
+        sa.column("route_id", sa.String()),
+        sa.column("source", sa.String()),
+        sa.column("size_bytes", sa.Integer()),
+    )
+    conn = op.get_bind()
+    result = conn.execute(sa.select(files).execution_options(yield_per=1000))
+    deltas = timeseries_deltas(row._asdict() for row in result)
+    if deltas:
+        op.bulk_insert(series, list(deltas.values()))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stats_timeseries_route", table_name="stats_timeseries")
+    op.drop_index("ix_stats_timeseries_vehicle", table_name="stats_timeseries")
+    op.drop_table("stats_timeseries")
@@ -0,0 +1,30 @@
+"""files: processed file CRC-32 and size for ZIP streaming
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 행은 NULL로 두고 ZIP 스트리밍이 처리 파일을 처음 끝까지 읽을 때 채움
+    with op.batch_alter_table("files") as batch:
+        batch.add_column(sa.Column("crc32", sa.BigInteger(), nullable=True))
+        batch.add_column(sa.Column("processed_size", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("files") as batch:
+        batch.drop_column("processed_size")
+        batch.drop_column("crc32")
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.database import SessionLocal, async_database_url, create_db_engine
+from app.core.settings import settings
+from app.main import app
+from app.models.processing_job import ProcessingJob
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 't.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.sqlite_busy_timeout_ms
+    finally:
+        engine.dispose()
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./data.db") == "sqlite+aiosqlite:///./data.db"
+    assert async_database_url("postgresql://u:p@db/x") == "postgresql+asyncpg://u:p@db/x"
+    assert async_database_url("mysql://u:p@db/x") is None
+
+
+def test_job_polling_with_async_session(monkeypatch):
+    pytest.importorskip("aiosqlite")
+    monkeypatch.setattr(settings, "database_async", True)
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_async_sessionmaker", None)
+    with SessionLocal() as db:
+        job = ProcessingJob(job_type="noop", payload={})
+        db.add(job)
+        db.commit()
+        job_id = job.id
+
+    client = TestClient(app)
+    try:
+        resp = client.get(f"/api/jobs/{job_id}")
+        assert resp.status_code == 200
+        assert resp.json()["job_type"] == "noop"
+        assert database.async_engine() is not None
+        assert client.get("/api/jobs/999999999").status_code == 404
+    finally:
+        database._async_engine.sync_engine.dispose()
+
+
+def test_sqlite_writes_begin_immediate_and_nested_session_fails_fast(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sqlite_busy_timeout_ms", 200)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'w.db'}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        maker = sessionmaker(bind=engine)
+
+        with maker() as first, maker() as second:
+            first.execute(text("SELECT 1"))
+            assert not first.connection().connection.dbapi_connection.in_transaction  # 읽기는 잠금 없음
+            first.execute(text("INSERT INTO t VALUES (1)"))
+            # 같은 스레드의 두 번째 세션: 읽기는 되고, 쓰기는 busy_timeout만 기다린 뒤 실패 (그 이상 멈추지 않음)
+            assert second.execute(text("SELECT count(*) FROM t")).scalar() == 0
+            start = time.perf_counter()
+            with pytest.raises(OperationalError, match="locked"):
+                second.execute(text("INSERT INTO t VALUES (2)"))
+            assert time.perf_counter() - start < 2
+            second.rollback()
+            first.commit()
+            # 앞 세션이 커밋하면 바로 쓸 수 있음
+            second.execute(text("INSERT INTO t VALUES (2)"))
+            second.commit()
+            assert second.execute(text("SELECT count(*) FROM t")).scalar() == 2
+
+        # 커밋 없이 닫힌 세션은 반납 시 롤백되어 잠금을 남기지 않음
+        leaked = maker()
+        leaked.execute(text("INSERT INTO t VALUES (3)"))
+        leaked.close()
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO t VALUES (4)"))
+    finally:
+        engine.dispose()
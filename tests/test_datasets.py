@@ -0,0 +1,140 @@
+import asyncio
+import io
+import json
+import os
+import zipfile
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.controllers.datasets_controller import service
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.dataset import Dataset
+from app.services.dataset_cache import DatasetCache
+from app.workers.processing_worker import run_once
+
+
+def upload_image(client: TestClient, vehicle_id: str, shade: int) -> dict:
+    ok, buf = cv2.imencode(".jpg", np.full((40, 40, 3), shade, dtype=np.uint8))
+    assert ok
+    meta = {
+        "vehicle_id": vehicle_id,
+        "captured_at": "2025-01-01T10:00:00Z",
+        "source": "camera_front",
+        "route_id": "route-ds",
+    }
+    resp = client.post(
+        "/api/upload",
+        files={"file": ("f.jpg", buf.tobytes(), "image/jpeg")},
+        data={"metadata": json.dumps(meta)},
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def drain() -> None:
+    while asyncio.run(run_once("test-worker")):
+        pass
+
+
+def test_dataset_snapshot_cached_and_incremental():
+    client = TestClient(app)
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    name = f"ds-{uuid4().hex[:8]}"
+    for shade in (10, 20):
+        upload_image(client, vehicle_id, shade)
+
+    resp = client.post("/api/datasets", json={"name": name, "filters": {"vehicle_id": vehicle_id}})
+    assert resp.status_code == 201, resp.text
+    v1 = resp.json()
+    assert v1["version"] == "v1"
+    assert v1["file_count"] == 2
+    assert v1["status"] == "pending"
+
+    # 빌드 전에도 매니페스트로부터 스트리밍 다운로드 가능
+    streamed = client.get(f"/api/datasets/{v1['id']}/download")
+    assert streamed.status_code == 200
+
+    drain()
+    assert client.get(f"/api/jobs/{v1['job_id']}").json()["status"] == "succeeded"
+    assert client.get(f"/api/datasets/{v1['id']}").json()["status"] == "ready"
+
+    cached = client.get(f"/api/datasets/{v1['id']}/download")
+    assert cached.headers["etag"] == f'"{v1["manifest_hash"]}"'
+    assert cached.content == streamed.content
+
+    # 같은 필터로 다시 고정 → 파일이 추가됐으므로 v1 아카이브에 이어 붙여 빌드
+    added = upload_image(client, vehicle_id, 30)
+    v2 = client.post("/api/datasets", json={"name": name, "filters": {"vehicle_id": vehicle_id}}).json()
+    assert v2["version"] == "v2"
+    assert v2["file_count"] == 3
+    assert v2["base_dataset_id"] == v1["id"]
+
+    drain()
+    job = client.get(f"/api/jobs/{v2['job_id']}").json()
+    assert job["result"]["incremental"] is True
+
+    body = client.get(f"/api/datasets/{v2['id']}/download").content
+    with zipfile.ZipFile(io.BytesIO(body)) as zf:
+        assert zf.testzip() is None
+        assert len(zf.namelist()) == 3
+        assert zf.read(f"{added['id']}.jpg") == Path(added["processed_path"]).read_bytes()
+    # 증분 빌드 결과는 처음부터 스트리밍한 결과와 바이트 단위로 같음
+    with SessionLocal() as db:
+        full = b"".join(service.stream(db.get(Dataset, v2["id"])).iter_bytes())
+    assert body == full
+
+    part = client.get(f"/api/datasets/{v2['id']}/download", headers={"Range": "bytes=100-"})
+    assert part.status_code == 206
+    assert part.content == body[100:]
+
+    # 내용이 같은 v3은 캐시를 그대로 사용
+    v3 = client.post("/api/datasets", json={"name": name, "filters": {"vehicle_id": vehicle_id}}).json()
+    assert v3["manifest_hash"] == v2["manifest_hash"]
+    assert v3["status"] == "ready"
+    assert v3["job_id"] is None
+
+
+def test_dataset_cache_lru_eviction(tmp_path: Path):
+    cache = DatasetCache(tmp_path, max_bytes=250)
+    for i, key in enumerate(["a", "b"]):
+        cache.put(key, lambda f: f.write(b"x" * 100))
+        os.utime(cache.path_for(key), (1000 + i, 1000 + i))
+    # a를 최근 사용으로 만든 뒤 c 추가 → 한도 초과, 가장 오래 안 쓴 b 삭제
+    assert cache.get("a") is not None
+    cache.put("c", lambda f: f.write(b"x" * 100))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cached_download_survives_eviction(monkeypatch):
+    client = TestClient(app)
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    upload_image(client, vehicle_id, 40)
+    ds = client.post("/api/datasets", json={"name": f"ds-{uuid4().hex[:8]}", "filters": {"vehicle_id": vehicle_id}})
+    ds = ds.json()
+    drain()
+    body = client.get(f"/api/datasets/{ds['id']}/download").content
+    original = service.cache.open
+
+    def evicted_after_open(manifest_hash: str):
+        # 응답용으로 연 직후 다른 요청의 evict()가 아카이브를 지운 상황
+        f = original(manifest_hash)
+        service.cache.path_for(manifest_hash).unlink()
+        return f
+
+    monkeypatch.setattr(service.cache, "open", evicted_after_open)
+    resp = client.get(f"/api/datasets/{ds['id']}/download", headers={"Range": "bytes=10-"})
+    assert resp.status_code == 206
+    assert resp.content == body[10:]
+
+    # 이미 밀려났으면 매니페스트로부터 같은 바이트를 스트리밍
+    monkeypatch.setattr(service.cache, "open", original)
+    streamed = client.get(f"/api/datasets/{ds['id']}/download")
+    assert streamed.status_code == 200
+    assert streamed.content == body
@@ -0,0 +1,90 @@
+import asyncio
+import io
+import json
+import zipfile
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.workers.processing_worker import run_once
+
+
+def make_unique_image(tmpdir: Path) -> Path:
+    # 다른 테스트의 업로드와 해시가 겹치지 않도록 매번 다른 내용
+    img = np.random.default_rng().integers(0, 255, (64, 64, 3), dtype=np.uint8)
+    p = tmpdir / f"{uuid4().hex}.png"
+    cv2.imwrite(str(p), img)
+    return p
+
+
+def base_meta():
+    return {
+        "vehicle_id": "car-001",
+        "captured_at": "2025-01-01T10:00:00Z",
+        "source": "camera_front",
+        "route_id": "route-1",
+    }
+
+
+def upload(client: TestClient, path: Path, meta: dict) -> dict:
+    with path.open("rb") as f:
+        resp = client.post(
+            "/api/upload",
+            files={"file": (path.name, f, "image/png")},
+            data={"metadata": json.dumps(meta)},
+        )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_duplicate_upload_reuses_blob(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "dedup_mode", True)
+    img_path = make_unique_image(tmp_path)
+    client = TestClient(app)
+    before = client.get("/api/stats/dedup").json()
+
+    first = upload(client, img_path, base_meta())
+    processed_count = client.get("/api/metrics").json()["stages"]["preprocess_image"]["count"]
+    second = upload(client, img_path, {**base_meta(), "vehicle_id": "car-retry"})
+
+    assert second["id"] != first["id"]
+    assert second["stored_path"] == first["stored_path"]
+    assert second["processed_path"] == first["processed_path"]
+    assert second["computed"] == first["computed"]
+    assert second["meta"]["vehicle_id"] == "car-retry"
+    assert f"/blobs/raw/{first['sha256'][:2]}/" in first["stored_path"]
+    assert Path(first["stored_path"]).exists()
+    # 중복 업로드는 OpenCV 작업을 하지 않음
+    assert client.get("/api/metrics").json()["stages"]["preprocess_image"]["count"] == processed_count
+
+    after = client.get("/api/stats/dedup").json()
+    assert after["blobs"] - before["blobs"] == 1
+    assert after["references"] - before["references"] == 2
+    assert after["bytes_saved"] - before["bytes_saved"] == first["size_bytes"]
+
+
+def test_dedup_uploads_get_distinct_zip_entries(tmp_path: Path, monkeypatch):
+    # 같은 내용의 업로드는 처리 파일을 공유하지만 ZIP 엔트리 이름은 파일 id로 구분
+    monkeypatch.setattr(settings, "dedup_mode", True)
+    img_path = make_unique_image(tmp_path)
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    client = TestClient(app)
+    first = upload(client, img_path, {**base_meta(), "vehicle_id": vehicle_id})
+    second = upload(client, img_path, {**base_meta(), "vehicle_id": vehicle_id})
+    assert first["processed_path"] == second["processed_path"]
+    expected = sorted(f"{r['id']}.jpg" for r in (first, second))
+
+    resp = client.get("/api/download/dataset", params={"vehicle_id": vehicle_id})
+    assert resp.status_code == 200
+    assert sorted(zipfile.ZipFile(io.BytesIO(resp.content)).namelist()) == expected
+
+    dataset = client.post("/api/datasets", json={"name": vehicle_id, "filters": {"vehicle_id": vehicle_id}}).json()
+    while asyncio.run(run_once("test-dedup")):
+        pass
+    archive = client.get(f"/api/datasets/{dataset['id']}/download").content
+    assert sorted(zipfile.ZipFile(io.BytesIO(archive)).namelist()) == expected
@@ -0,0 +1,175 @@
+import io
+import json
+import zipfile
+import zlib
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.controllers import download_controller
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.file import File
+from app.utils import zipstream
+from app.utils.zipstream import ZipEntry, ZipStream
+
+
+def upload_images(client: TestClient, vehicle_id: str, n: int) -> list[dict]:
+    records = []
+    for i in range(n):
+        img = np.full((60, 80, 3), i * 40, dtype=np.uint8)
+        ok, buf = cv2.imencode(".jpg", img)
+        assert ok
+        meta = {
+            "vehicle_id": vehicle_id,
+            "captured_at": f"2025-01-01T10:00:0{i}Z",
+            "source": "camera_front",
+            "route_id": "route-dl",
+        }
+        resp = client.post(
+            "/api/upload",
+            files={"file": (f"{i}.jpg", buf.tobytes(), "image/jpeg")},
+            data={"metadata": json.dumps(meta)},
+        )
+        assert resp.status_code == 200, resp.text
+        records.append(resp.json())
+    return records
+
+
+def test_download_dataset_streams_valid_zip():
+    client = TestClient(app)
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    processed = upload_images(client, vehicle_id, 3)
+
+    resp = client.get(f"/api/download/dataset?vehicle_id={vehicle_id}")
+    assert resp.status_code == 200, resp.text
+    assert int(resp.headers["content-length"]) == len(resp.content)
+    assert resp.headers["accept-ranges"] == "bytes"
+
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        assert zf.testzip() is None
+        # 엔트리 이름은 파일 id + 확장자
+        assert sorted(zf.namelist()) == sorted(f"{r['id']}.jpg" for r in processed)
+        for info in zf.infolist():
+            assert info.compress_type == zipfile.ZIP_STORED
+        assert zf.read(f"{processed[0]['id']}.jpg") == Path(processed[0]["processed_path"]).read_bytes()
+
+
+def test_download_dataset_range_resume():
+    client = TestClient(app)
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    upload_images(client, vehicle_id, 3)
+    url = f"/api/download/dataset?vehicle_id={vehicle_id}"
+
+    full = client.get(url)
+    etag = full.headers["etag"]
+    cut = len(full.content) // 2
+
+    part = client.get(url, headers={"Range": f"bytes={cut}-", "If-Range": etag})
+    assert part.status_code == 206
+    assert part.headers["content-range"] == f"bytes {cut}-{len(full.content) - 1}/{len(full.content)}"
+    assert full.content[:cut] + part.content == full.content
+
+    middle = client.get(url, headers={"Range": "bytes=10-99"})
+    assert middle.status_code == 206
+    assert middle.content == full.content[10:100]
+
+    # ETag가 다르면 전체를 다시 보냄
+    stale = client.get(url, headers={"Range": f"bytes={cut}-", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == full.content
+
+    bad = client.get(url, headers={"Range": f"bytes={len(full.content)}-"})
+    assert bad.status_code == 416
+
+
+def test_download_dataset_not_found():
+    client = TestClient(app)
+    resp = client.get(f"/api/download/dataset?vehicle_id=missing-{uuid4().hex}")
+    assert resp.status_code == 404
+
+
+def test_zipstream_zip64_records(tmp_path: Path, monkeypatch):
+    # 경계값을 낮춰 ZIP64 확장 필드/종료 레코드 경로를 작은 파일로 검증
+    monkeypatch.setattr(zipstream, "ZIP64_LIMIT", 16)
+    monkeypatch.setattr(zipstream, "ZIP64_COUNT_LIMIT", 2)
+    entries = []
+    for i in range(3):
+        p = tmp_path / f"f{i}.bin"
+        p.write_bytes(bytes([i]) * (10 + i * 20))
+        st = p.stat()
+        entries.append(ZipEntry(name=f"f{i}.bin", path=p, size=st.st_size, mtime=st.st_mtime))
+
+    stream = ZipStream(lambda: iter(entries), chunk_size=7)
+    total, _, count = stream.plan()
+    data = b"".join(stream.iter_bytes())
+    assert len(data) == total
+    assert count == 3
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        for e in entries:
+            assert zf.read(e.name) == e.path.read_bytes()
+    assert b"".join(stream.iter_bytes(5, 60)) == data[5:61]
+
+
+def test_zipstream_seeks_past_entries_with_stored_crc(tmp_path: Path):
+    entries = []
+    for i in range(3):
+        p = tmp_path / f"f{i}.bin"
+        p.write_bytes(bytes([i + 1]) * 50)
+        st = p.stat()
+        entries.append(ZipEntry(name=f"f{i}.bin", path=p, size=st.st_size, mtime=st.st_mtime))
+    queries = []
+
+    def list_entries():
+        queries.append(1)
+        return iter(entries)
+
+    found = []
+    cold = ZipStream(list_entries, on_crcs=found.extend)
+    total, _, _ = cold.plan()
+    data = b"".join(cold.iter_bytes())
+    # plan()과 iter_bytes()는 한 번 조회한 목록을 같이 사용
+    assert len(queries) == 1 and len(data) == total
+    assert [(e.name, crc) for e, crc in found] == [(e.name, zlib.crc32(e.path.read_bytes())) for e in entries]
+
+    # 저장된 CRC가 있으면 구간 이전 엔트리는 읽지 않고, 걸친 엔트리는 구간 시작 위치부터 읽음
+    reads = []
+
+    def reader(entry: ZipEntry, start: int):
+        reads.append((entry.name, start))
+        with open(entry.path, "rb") as f:
+            f.seek(start)
+            yield f.read()
+
+    warm = ZipStream(lambda: iter([e._replace(crc=crc) for e, crc in found]), reader=reader, on_crcs=found.extend)
+    warm.plan()
+    start = data.index(bytes([2]) * 50) + 10
+    assert b"".join(warm.iter_bytes(start)) == data[start:]
+    assert reads == [("f1.bin", 10), ("f2.bin", 0)]
+    assert len(found) == 3
+
+
+def test_download_dataset_persists_crcs(monkeypatch):
+    client = TestClient(app)
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    records = upload_images(client, vehicle_id, 2)
+    url = f"/api/download/dataset?vehicle_id={vehicle_id}"
+
+    full = client.get(url)
+    with SessionLocal() as db:
+        for r in records:
+            row = db.get(File, r["id"])
+            data = Path(r["processed_path"]).read_bytes()
+            assert (row.crc32, row.processed_size) == (zlib.crc32(data), len(data))
+    # 크기/CRC를 아는 항목은 저장소에 조회하지 않고 목록을 만듦 (s3 모드의 객체별 head_object 방지)
+    stats = []
+    monkeypatch.setattr(download_controller, "stat_location", lambda location: stats.append(location))
+    cut = len(full.content) - 30
+    part = client.get(url, headers={"Range": f"bytes={cut}-", "If-Range": full.headers["etag"]})
+    assert part.status_code == 206
+    assert full.content[:cut] + part.content == full.content
+    assert stats == []
@@ -0,0 +1,81 @@
+import io
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.file import File
+from app.schemas.upload import Metadata
+from app.services import columnar_export
+from app.services.file_writer import build_file_row, insert_files
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+
+def seed(vehicle_id: str, items: list[tuple[str, dict, dict]]) -> None:
+    rows = []
+    for captured_at, extra_meta, computed in items:
+        meta = Metadata(vehicle_id=vehicle_id, captured_at=captured_at, source="cam", route_id="r", **extra_meta)
+        rows.append(
+            build_file_row(
+                file_id=uuid4().hex,
+                original_filename="f.jpg",
+                stored_path="/nonexistent/raw",
+                processed_path="/nonexistent/processed",
+                media_type="image",
+                size_bytes=10,
+                file_hash="0" * 64,
+                meta=meta,
+                computed=computed,
+            )
+        )
+    with SessionLocal() as db:
+        insert_files(db, rows)
+        db.commit()
+
+
+def test_export_parquet_flattens_json_in_batches():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    seed(
+        vehicle_id,
+        [
+            ("2025-07-01T10:00:02Z", {"lane": 2}, {"blur_score": 10.0, "video_quality": {"dark_ratio": 0.5}}),
+            ("2025-07-01T10:00:01Z", {"lane": 1}, {"blur_score": 20.0, "video_quality": {"dark_ratio": 0.25}}),
+            ("2025-07-01T10:00:03Z", {"lane": "left"}, {"blur_score": 30.0, "new_metric": 1}),
+        ],
+    )
+    # 배치를 작게 잡아 여러 row group + 첫 배치 이후 처음 보는 키/다른 타입 경로도 확인
+    chunks = list(columnar_export.export_files([File.vehicle_id == vehicle_id], "parquet", batch_rows=2))
+    assert len(chunks) == 3
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.column("captured_at").to_pylist()[0].second == 1  # 촬영 순서
+    assert table.column("meta.lane").to_pylist() == [1, 2, None]
+    assert table.column("computed.video_quality.dark_ratio").to_pylist() == [0.25, 0.5, None]
+    assert table.column("blur_score").to_pylist() == [20.0, 10.0, 30.0]
+    assert "computed.blur_score" not in table.column_names
+    assert table.column("meta_extra").to_pylist()[2] == '{"lane": "left"}'
+    assert table.column("computed_extra").to_pylist()[2] == '{"new_metric": 1}'
+
+
+def test_export_endpoint_formats():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    seed(vehicle_id, [("2025-07-01T10:00:00Z", {}, {"blur_score": 5.0}), ("2025-07-02T10:00:00Z", {}, {})])
+    client = TestClient(app)
+
+    resp = client.get("/api/download/export", params={"vehicle_id": vehicle_id, "captured_to": "2025-07-01T23:00:00Z"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.apache.parquet"
+    assert pq.read_table(io.BytesIO(resp.content)).num_rows == 1
+
+    resp = client.get("/api/download/export", params={"vehicle_id": vehicle_id, "format": "arrow"})
+    assert resp.status_code == 200
+    assert pa.ipc.open_stream(resp.content).read_all().column("id").length() == 2
+
+    # 결과가 없어도 읽을 수 있는 빈 파일
+    resp = client.get("/api/download/export", params={"vehicle_id": "no-such-vehicle"})
+    assert pq.read_table(io.BytesIO(resp.content)).num_rows == 0
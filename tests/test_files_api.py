@@ -0,0 +1,140 @@
+import json
+from datetime import date, datetime
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.file import File
+from app.schemas.upload import Metadata
+from app.services.file_query import FILE_FIELDS
+from app.services.file_writer import build_file_row, insert_files
+from app.utils import json_codec
+
+
+def seed_files(vehicle_id: str, captured: list[str], blur: list[float] | None = None) -> list[str]:
+    rows = []
+    for i, ts in enumerate(captured):
+        meta = Metadata(vehicle_id=vehicle_id, captured_at=ts, source="camera_front", route_id="route-q")
+        rows.append(
+            build_file_row(
+                file_id=uuid4().hex,
+                original_filename="f.jpg",
+                stored_path="/nonexistent/raw.jpg",
+                processed_path="/nonexistent/processed.jpg",
+                media_type="image",
+                size_bytes=1,
+                file_hash="0" * 64,
+                meta=meta,
+                computed={"blur_score": blur[i] if blur else 1.0},
+            )
+        )
+    with SessionLocal() as db:
+        insert_files(db, rows)
+        db.commit()
+    return [r["id"] for r in sorted(rows, key=lambda r: (r["captured_at"], r["id"]))]
+
+
+def test_list_files_cursor_pagination():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    # 같은 시각이 겹쳐도 id로 순서가 정해짐
+    expected = seed_files(
+        vehicle_id,
+        [
+            "2025-01-01T10:00:03Z",
+            "2025-01-01T10:00:01Z",
+            "2025-01-01T10:00:02Z",
+            "2025-01-01T10:00:02Z",
+            "2025-01-01T10:00:00Z",
+        ],
+    )
+    client = TestClient(app)
+
+    seen, cursor = [], None
+    while True:
+        params = {"vehicle_id": vehicle_id, "limit": 2, "pagination": "cursor"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/files", params=params).json()
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_list_files_offset_mode_unchanged():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    seed_files(vehicle_id, ["2025-01-01T10:00:00Z", "2025-01-01T10:00:01Z"])
+    client = TestClient(app)
+    body = client.get("/api/files", params={"vehicle_id": vehicle_id}).json()
+    assert isinstance(body, list)
+    assert len(body) == 2
+
+
+def test_list_files_invalid_cursor():
+    client = TestClient(app)
+    resp = client.get("/api/files", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+def test_list_files_min_blur_uses_column():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    seed_files(vehicle_id, ["2025-01-01T10:00:00Z", "2025-01-01T10:00:01Z"], blur=[5.0, 50.0])
+    client = TestClient(app)
+    body = client.get("/api/files", params={"vehicle_id": vehicle_id, "min_blur": 10}).json()
+    assert [item["computed_json"]["blur_score"] for item in body] == [50.0]
+
+
+def test_list_files_fields_projection():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    expected = seed_files(vehicle_id, ["2025-01-01T10:00:01Z", "2025-01-01T10:00:00Z"])
+    client = TestClient(app)
+    full = client.get("/api/files", params={"vehicle_id": vehicle_id})
+    assert set(full.json()[0]) == set(File.__table__.columns.keys()) == set(FILE_FIELDS)
+
+    lean = client.get("/api/files", params={"vehicle_id": vehicle_id, "fields": "id, processed_path,id"})
+    assert [set(item) for item in lean.json()] == [{"id", "processed_path"}] * 2
+    assert len(lean.content) * 5 < len(full.content)
+
+    # cursor 모드는 고르지 않은 captured_at/id로도 다음 커서를 만듦
+    params = {"vehicle_id": vehicle_id, "fields": "stored_path", "limit": 1, "pagination": "cursor"}
+    page = client.get("/api/files", params=params).json()
+    assert page["items"] == [{"stored_path": "/nonexistent/raw.jpg"}]
+    page = client.get("/api/files", params={**params, "cursor": page["next_cursor"]}).json()
+    assert page["next_cursor"] is None and len(page["items"]) == 1
+
+    assert client.get("/api/files", params={"fields": "id,secret"}).status_code == 400
+    page = client.get("/api/files", params={"vehicle_id": vehicle_id, "fields": "id", "pagination": "cursor"}).json()
+    assert page["items"] == [{"id": file_id} for file_id in expected]
+
+
+def test_list_files_ndjson_stream():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    expected = seed_files(vehicle_id, [f"2025-01-02T10:00:{i:02d}Z" for i in range(5)])
+    client = TestClient(app)
+    params = {"vehicle_id": vehicle_id, "fields": "id,captured_at", "format": "ndjson", "limit": 1000}
+    resp = client.get("/api/files", params=params)
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["id"] for line in lines] == expected
+    assert lines[0]["captured_at"] == "2025-01-02T10:00:00"
+
+    resp = client.get("/api/files", params={**params, "offset": 1, "limit": 2})
+    assert [json.loads(line)["id"] for line in resp.text.splitlines()] == expected[1:3]
+    # JSON 페이지는 기존 한도 유지
+    assert client.get("/api/files", params={"vehicle_id": vehicle_id, "limit": 1000}).status_code == 400
+
+
+def test_json_codec_matches_without_orjson(monkeypatch):
+    value = {
+        "id": "a",
+        "captured_at": datetime(2025, 1, 1, 10, 0, 0, 123456),
+        "day": date(2025, 1, 1),
+        "meta": {"note": "주행"},
+        "x": [1.5, None, 3],
+    }
+    fast = json_codec.dumps(value)
+    monkeypatch.setattr(json_codec, "orjson", None)
+    assert json_codec.dumps(value) == fast
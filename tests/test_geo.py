@@ -0,0 +1,124 @@
+import io
+import json
+import math
+import zipfile
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.main import app
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row, insert_files
+from app.utils.geohash import cell_ranges, cover, encode, radius_bbox
+
+CENTER = (37.5665, 126.9780)
+
+
+def offset(north_m: float, east_m: float) -> tuple[float, float]:
+    lat = CENTER[0] + math.degrees(north_m / 6_371_008.8)
+    lon = CENTER[1] + math.degrees(east_m / (6_371_008.8 * math.cos(math.radians(CENTER[0]))))
+    return lat, lon
+
+
+def seed(vehicle_id: str, points: dict[str, tuple[float, float] | None]) -> dict[str, str]:
+    rows, ids = [], {}
+    for name, point in points.items():
+        lat, lon = point if point else (None, None)
+        meta = Metadata(
+            vehicle_id=vehicle_id,
+            captured_at="2025-05-01T10:00:00Z",
+            source="cam",
+            route_id="r",
+            location_lat=lat,
+            location_lon=lon,
+        )
+        row = build_file_row(
+            file_id=uuid4().hex,
+            original_filename=name,
+            stored_path="/nonexistent/raw",
+            processed_path="/nonexistent/processed",
+            media_type="image",
+            size_bytes=1,
+            file_hash="0" * 64,
+            meta=meta,
+            computed={},
+        )
+        rows.append(row)
+        ids[row["id"]] = name
+    with SessionLocal() as db:
+        insert_files(db, rows)
+        db.commit()
+    return ids
+
+
+def test_cover_contains_every_point_in_area():
+    area = radius_bbox(*CENTER, 500)
+    ranges = cell_ranges(cover(area))
+    rng = np.random.default_rng(0)
+    for lat, lon in zip(rng.uniform(area[1], area[3], 2000), rng.uniform(area[0], area[2], 2000)):
+        gh = encode(lat, lon)
+        assert any(lo <= gh and (hi is None or gh < hi) for lo, hi in ranges)
+
+
+def test_radius_and_bbox_filters():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    ids = seed(
+        vehicle_id,
+        {
+            "center": CENTER,
+            "north-300": offset(300, 0),
+            "east-450": offset(0, 450),
+            "diag-600": offset(424, 424),  # 약 600m, bbox 안이지만 원 밖
+            "far-5km": offset(5000, 0),
+            "no-location": None,
+        },
+    )
+    client = TestClient(app)
+
+    def names(**params) -> set[str]:
+        resp = client.get("/api/files", params={"vehicle_id": vehicle_id, "limit": 200, **params})
+        assert resp.status_code == 200, resp.text
+        return {ids[f["id"]] for f in resp.json()}
+
+    assert names(near_lat=CENTER[0], near_lon=CENTER[1], radius_m=500) == {"center", "north-300", "east-450"}
+    assert names(near_lat=CENTER[0], near_lon=CENTER[1], radius_m=50) == {"center"}
+
+    west, south, east, north = radius_bbox(*CENTER, 500)
+    bbox = f"{west},{south},{east},{north}"
+    assert names(bbox=bbox) == {"center", "north-300", "east-450", "diag-600"}
+
+    assert client.get("/api/files", params={"bbox": "1,2,3"}).status_code == 400
+    assert client.get("/api/files", params={"bbox": "10,5,0,6"}).status_code == 400
+    assert client.get("/api/files", params={"near_lat": 1.0, "radius_m": 10}).status_code == 400
+
+
+def test_download_within_radius(tmp_path: Path):
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    client = TestClient(app)
+    for i, point in enumerate((CENTER, offset(2000, 0))):
+        img = np.full((48, 64, 3), 40 * (i + 1), dtype=np.uint8)
+        path = tmp_path / f"{i}.png"
+        cv2.imwrite(str(path), img)
+        meta = {
+            "vehicle_id": vehicle_id,
+            "captured_at": "2025-05-01T10:00:00Z",
+            "source": "cam",
+            "route_id": "r",
+            "location_lat": point[0],
+            "location_lon": point[1],
+        }
+        with path.open("rb") as f:
+            resp = client.post(
+                "/api/upload", files={"file": (path.name, f, "image/png")}, data={"metadata": json.dumps(meta)}
+            )
+        assert resp.status_code == 200, resp.text
+
+    params = {"vehicle_id": vehicle_id, "near_lat": CENTER[0], "near_lon": CENTER[1], "radius_m": 500}
+    resp = client.get("/api/download/dataset", params=params)
+    assert resp.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        assert len(zf.namelist()) == 1
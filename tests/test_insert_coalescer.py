@@ -0,0 +1,77 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.workers import worker_pool
+from app.main import app  # noqa: F401  (테이블 생성)
+from app.models.file import File
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row
+from app.services.insert_coalescer import InsertCoalescer
+
+
+def make_row(file_id: str | None = None) -> dict:
+    meta = Metadata(vehicle_id="car-coalesce", captured_at="2025-09-01T10:00:00Z", source="cam", route_id="r")
+    return build_file_row(
+        file_id=file_id or uuid4().hex,
+        original_filename="f.jpg",
+        stored_path="/nonexistent/raw",
+        processed_path="/nonexistent/processed",
+        media_type="image",
+        size_bytes=1,
+        file_hash="0" * 64,
+        meta=meta,
+        computed={},
+    )
+
+
+def stored(ids: list[str]) -> set[str]:
+    with SessionLocal() as db:
+        return set(db.scalars(select(File.id).where(File.id.in_(ids))))
+
+
+def test_concurrent_inserts_share_batches():
+    coalescer = InsertCoalescer(worker_pool, window_ms=50, max_rows=10)
+    rows = [make_row() for _ in range(25)]
+    before = metrics.snapshot()["counters"].get("insert_batches", 0)
+
+    async def main():
+        await asyncio.gather(*(coalescer.insert(row) for row in rows))
+
+    asyncio.run(main())
+    batches = metrics.snapshot()["counters"]["insert_batches"] - before
+    assert batches == 3  # 10 + 10 + 5
+    ids = [row["id"] for row in rows]
+    assert stored(ids) == set(ids)
+
+
+def test_failed_row_does_not_fail_batch():
+    coalescer = InsertCoalescer(worker_pool, window_ms=50, max_rows=200)
+    existing = make_row()
+
+    async def first():
+        await coalescer.insert(existing)
+
+    asyncio.run(first())
+    rows = [make_row() for _ in range(5)] + [make_row(existing["id"])]
+
+    async def main():
+        return await asyncio.gather(*(coalescer.insert(row) for row in rows), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [type(r) for r in results] == [type(None)] * 5 + [IntegrityError]
+    ids = [row["id"] for row in rows[:5]]
+    assert stored(ids) == set(ids)
+
+
+def test_latency_target_shrinks_window():
+    coalescer = InsertCoalescer(worker_pool, window_ms=20, max_rows=200, target_ms=25)
+    assert coalescer.current_window_ms() == 20
+    coalescer._write_ms = 15
+    assert coalescer.current_window_ms() == 10
+    coalescer._write_ms = 40
+    assert coalescer.current_window_ms() == 0
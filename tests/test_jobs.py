@@ -0,0 +1,105 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.processing_job import ProcessingJob
+from app.services.job_queue import JobQueue
+from app.workers.processing_worker import run_once
+
+
+def base_meta():
+    return {
+        "vehicle_id": "car-async",
+        "captured_at": "2025-01-01T10:00:00Z",
+        "source": "camera_front",
+        "route_id": "route-1",
+    }
+
+
+def drain(worker_id: str = "test-worker") -> None:
+    while asyncio.run(run_once(worker_id)):
+        pass
+
+
+def test_async_upload_processed_by_worker(tmp_path: Path):
+    img = np.zeros((100, 200, 3), dtype=np.uint8)
+    cv2.rectangle(img, (20, 20), (180, 80), (255, 255, 255), 2)
+    img_path = tmp_path / "test.jpg"
+    cv2.imwrite(str(img_path), img)
+
+    client = TestClient(app)
+    with img_path.open("rb") as f:
+        resp = client.post(
+            "/api/upload?mode=async",
+            files={"file": ("test.jpg", f, "image/jpeg")},
+            data={"metadata": json.dumps(base_meta())},
+        )
+    assert resp.status_code == 202, resp.text
+    accepted = resp.json()
+    assert accepted["status"] == "pending"
+    assert client.get(f"/api/files/{accepted['file_id']}").status_code == 404
+
+    drain()
+
+    job = client.get(f"/api/jobs/{accepted['job_id']}").json()
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 1
+    assert job["result"]["id"] == accepted["file_id"]
+    assert "blur_score" in job["result"]["computed"]
+    assert Path(job["result"]["processed_path"]).exists()
+    assert client.get(f"/api/files/{accepted['file_id']}").status_code == 200
+
+
+def test_async_upload_invalid_media_fails_without_retry(tmp_path: Path):
+    client = TestClient(app)
+    resp = client.post(
+        "/api/upload?mode=async",
+        files={"file": ("broken.jpg", b"not an image", "image/jpeg")},
+        data={"metadata": json.dumps(base_meta())},
+    )
+    assert resp.status_code == 202, resp.text
+
+    drain()
+
+    job = client.get(f"/api/jobs/{resp.json()['job_id']}").json()
+    assert job["status"] == "failed"
+    assert job["attempts"] == 1
+    assert "Invalid image data" in job["last_error"]
+
+
+def test_queue_retry_backoff_and_expired_lease():
+    queue = JobQueue(lease_sec=60, max_attempts=2, backoff_base_sec=30, backoff_max_sec=60)
+    db = SessionLocal()
+    try:
+        job = queue.enqueue(db, "test_job", {"n": 1})
+        claimed = queue.claim(db, "w1", ["test_job"])
+        assert claimed.id == job.id and claimed.lease_owner == "w1"
+        # 선점된 작업은 다른 워커가 가져가지 못함
+        assert queue.claim(db, "w2", ["test_job"]) is None
+
+        queue.fail(db, claimed, "boom")
+        db.refresh(claimed)
+        assert claimed.status == "pending"
+        assert claimed.available_at > datetime.utcnow() + timedelta(seconds=20)
+        assert queue.claim(db, "w2", ["test_job"]) is None
+
+        # 백오프 시간이 지난 것으로 만들고 재선점 → 리스 만료 시뮬레이션
+        claimed.available_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+        again = queue.claim(db, "w2", ["test_job"])
+        assert again.attempts == 2
+        again.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+
+        # 시도 횟수를 모두 쓴 상태에서 리스가 만료되면 실패로 확정
+        assert queue.claim(db, "w3", ["test_job"]) is None
+        assert db.get(ProcessingJob, job.id, populate_existing=True).status == "failed"
+    finally:
+        db.close()
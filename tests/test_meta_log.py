@@ -0,0 +1,114 @@
+import threading
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.file import File
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row, file_record
+from app.services.meta_log import MetaLog, rebuild_database
+
+
+def make_record(file_id: str, note: str = "") -> dict:
+    meta = Metadata(vehicle_id="car-log", captured_at="2025-08-01T10:00:00Z", source="cam", route_id="r", note=note)
+    row = build_file_row(
+        file_id=file_id,
+        original_filename="f.jpg",
+        stored_path="/nonexistent/raw",
+        processed_path="/nonexistent/processed",
+        media_type="image",
+        size_bytes=10,
+        file_hash="0" * 64,
+        meta=meta,
+        computed={"blur_score": 1.0},
+    )
+    return file_record(row)
+
+
+def test_concurrent_appends_rotate_and_compact(tmp_path: Path):
+    log = MetaLog(tmp_path, segment_bytes=4096, compact_segments=1000)
+    ids = [[uuid4().hex for _ in range(50)] for _ in range(8)]
+
+    def writer(chunk: list[str]) -> None:
+        for file_id in chunk:
+            log.append(make_record(file_id))
+
+    threads = [threading.Thread(target=writer, args=(chunk,)) for chunk in ids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    all_ids = [i for chunk in ids for i in chunk]
+    log.append(make_record(all_ids[0], note="updated"))
+
+    assert len(list(tmp_path.glob("*.idx"))) > 2  # 크기 초과로 세그먼트가 봉인됨
+    assert all(log.get(i)["id"] == i for i in all_ids)
+    assert log.get(all_ids[0])["meta"]["note"] == "updated"
+    assert log.get("missing") is None
+
+    assert log.compact() > 2
+    assert len(list(tmp_path.glob("*.idx"))) == 1
+    assert all(log.get(i)["id"] == i for i in all_ids)
+    assert log.get(all_ids[0])["meta"]["note"] == "updated"
+    records = list(log.records())
+    assert sorted(r["id"] for r in records) == sorted(all_ids)
+
+    # 다시 열어도 (인덱스/활성 세그먼트 복구) 같은 결과
+    log.close()
+    reopened = MetaLog(tmp_path, segment_bytes=4096, compact_segments=1000)
+    assert all(reopened.get(i)["id"] == i for i in all_ids)
+
+
+def test_recovery_drops_torn_tail_and_rebuilds_missing_index(tmp_path: Path):
+    log = MetaLog(tmp_path, segment_bytes=2048, compact_segments=1000)
+    ids = [uuid4().hex for _ in range(30)]
+    log.append_many(make_record(i) for i in ids)
+    log.append(make_record(uuid4().hex))  # 첫 세그먼트가 봉인된 뒤 활성 세그먼트에 기록
+    log.close()
+
+    segments = sorted(tmp_path.glob("*.jsonl"))
+    (tmp_path / "00000001.idx").unlink()  # 봉인 도중 끊긴 상황
+    with segments[-1].open("ab") as f:
+        f.write(b'{"id": "torn')
+
+    log = MetaLog(tmp_path, segment_bytes=2048, compact_segments=1000)
+    assert all(log.get(i)["id"] == i for i in ids)
+    assert (tmp_path / "00000001.idx").exists()
+    log.append(make_record("after-recovery"))
+    assert log.get("after-recovery")["id"] == "after-recovery"
+    assert not segments[-1].read_bytes().count(b"torn")
+
+
+def test_rebuild_database_from_log(tmp_path: Path):
+    log = MetaLog(tmp_path, segment_bytes=1 << 20, compact_segments=1000)
+    ids = [uuid4().hex for _ in range(5)]
+    log.append_many(make_record(i) for i in ids)
+
+    assert rebuild_database(log, chunk_size=2) == 5
+    with SessionLocal() as db:
+        assert len(db.scalars(select(File.id).where(File.id.in_(ids))).all()) == 5
+    assert rebuild_database(log) == 0  # 이미 있는 행은 건너뜀
+
+
+def test_two_writers_on_one_directory(tmp_path: Path):
+    # API 프로세스와 처리 워커처럼 같은 디렉터리를 각자의 인스턴스로 씀
+    a = MetaLog(tmp_path, segment_bytes=2048, compact_segments=1000)
+    b = MetaLog(tmp_path, segment_bytes=2048, compact_segments=1000)
+    a.append(make_record("a1"))
+    b.append(make_record("b1"))
+    a.append(make_record("a2"))
+    for log in (a, b):
+        assert [log.get(i)["id"] for i in ("a1", "b1", "a2")] == ["a1", "b1", "a2"]
+
+    # 번갈아 쓰면서 양쪽에서 봉인이 일어나고, 다른 쪽이 병합해도 조회가 맞음
+    ids = [f"{'ab'[i % 2]}-{uuid4().hex}" for i in range(60)]
+    for i, file_id in enumerate(ids):
+        (a if i % 2 == 0 else b).append(make_record(file_id))
+    assert len(list(tmp_path.glob("*.idx"))) > 2
+    assert b.compact() > 2
+    a.append(make_record("a3"))
+    for log in (a, b):
+        assert all(log.get(i)["id"] == i for i in [*ids, "a1", "b1", "a2", "a3"])
+    assert sorted(r["id"] for r in a.records()) == sorted([*ids, "a1", "b1", "a2", "a3"])
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from app.core.database import Base
+import app.models  # noqa: F401
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def alembic_config(url: str) -> Config:
+    cfg = Config(str(ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT / "migrations"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def test_migrations_match_models(tmp_path: Path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    cfg = alembic_config(url)
+    command.upgrade(cfg, "head")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    assert diff == []
+
+    command.downgrade(cfg, "base")
+    engine.dispose()
+
+
+def test_backfill_from_existing_files(tmp_path: Path):
+    url = f"sqlite:///{tmp_path / 'backfill.db'}"
+    cfg = alembic_config(url)
+    command.upgrade(cfg, "0002")
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO files (id, original_filename, stored_path, processed_path, media_type, size_bytes,"
+                " sha256, vehicle_id, captured_at, source, route_id, location_lat, location_lon, meta_json,"
+                " computed_json, created_at)"
+                " VALUES (:id, 'a.mp4', 'r', 'p', 'video', 1, 'h', 'car', '2025-01-01 00:00:00', 's', 'r',"
+                " 57.64911, 10.40744, '{}', :computed, '2025-01-01 00:00:00')"
+            ),
+            {"id": "v1", "computed": '{"frame_count": 30, "fps": 15.0, "duration_sec": 2.0, "width": 64, "height": 48}'},
+        )
+    command.upgrade(cfg, "head")
+
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT blur_score, width, height, fps, duration_sec, frame_count FROM files WHERE id = 'v1'")
+        ).one()
+        assert tuple(row) == (None, 64, 48, 15.0, 2.0, 30)
+        assert conn.execute(text("SELECT geohash FROM files WHERE id = 'v1'")).scalar() == "u4pruydqq"
+        rollup = conn.execute(text("SELECT day, media_type, file_count, blur_count FROM stats_rollups")).one()
+    assert tuple(rollup) == ("2025-01-01", "video", 1, 0)
+    with engine.connect() as conn:
+        series = conn.execute(text("SELECT granularity, file_count FROM stats_timeseries ORDER BY granularity")).all()
+    assert [tuple(r) for r in series] == [("day", 1), ("hour", 1), ("minute", 1)]
+    engine.dispose()
+
+
+def test_geohash_backfill_spans_batches(tmp_path: Path):
+    url = f"sqlite:///{tmp_path / 'geohash.db'}"
+    cfg = alembic_config(url)
+    command.upgrade(cfg, "0006")
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO files (id, original_filename, stored_path, processed_path, media_type, size_bytes,"
+                " sha256, vehicle_id, captured_at, source, route_id, location_lat, location_lon, meta_json,"
+                " computed_json, created_at)"
+                " VALUES (:id, 'a.jpg', 'r', 'p', 'image', 1, 'h', 'car', '2025-01-01 00:00:00', 's', 'r',"
+                " :lat, 10.40744, '{}', '{}', '2025-01-01 00:00:00')"
+            ),
+            # 배치 크기(1000)를 넘는 행 수 + 좌표 없는 행
+            [{"id": f"f{i:05d}", "lat": 57.64911 if i % 10 else None} for i in range(2500)],
+        )
+    command.upgrade(cfg, "0007")
+
+    with engine.connect() as conn:
+        filled = conn.execute(text("SELECT count(*) FROM files WHERE geohash = 'u4pruydqq'")).scalar()
+        missing = conn.execute(text("SELECT count(*) FROM files WHERE geohash IS NULL")).scalar()
+    assert (filled, missing) == (2250, 250)
+    engine.dispose()
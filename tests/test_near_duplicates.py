@@ -0,0 +1,85 @@
+import io
+import json
+import random
+import zipfile
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.phash import BKTree, hamming
+
+
+def make_frame(tmp_path: Path, name: str, flip: bool = False, noise: int = 0) -> Path:
+    img = np.zeros((240, 320, 3), dtype=np.uint8)
+    img[:] = np.linspace(0, 200, 320, dtype=np.uint8)[None, :, None]
+    cv2.rectangle(img, (40, 60), (140, 180), (255, 255, 255), -1)
+    cv2.circle(img, (240, 100), 40, (30, 30, 30), -1)
+    if flip:
+        img = img[:, ::-1].copy()
+    if noise:
+        img = cv2.add(img, np.random.default_rng(noise).integers(0, noise, img.shape, dtype=np.uint8))
+    p = tmp_path / name
+    cv2.imwrite(str(p), img)
+    return p
+
+
+def upload(client: TestClient, path: Path, vehicle_id: str, captured_at: str) -> dict:
+    meta = {"vehicle_id": vehicle_id, "captured_at": captured_at, "source": "cam", "route_id": "red-light"}
+    with path.open("rb") as f:
+        resp = client.post(
+            "/api/upload", files={"file": (path.name, f, "image/png")}, data={"metadata": json.dumps(meta)}
+        )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_bk_tree_matches_brute_force():
+    rng = random.Random(0)
+    values = [rng.getrandbits(64) for _ in range(500)]
+    tree = BKTree()
+    for v in values:
+        tree.add(v)
+    for _ in range(20):
+        query = rng.choice(values) ^ (1 << rng.randrange(64))
+        for k in (0, 4, 12):
+            assert sorted(v for v, _ in tree.search(query, k)) == sorted(v for v in values if hamming(v, query) <= k)
+
+
+def test_dedupe_near_list_similar_and_download(tmp_path: Path):
+    client = TestClient(app)
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    frames = [
+        make_frame(tmp_path, "a.png"),
+        make_frame(tmp_path, "b.png", noise=6),
+        make_frame(tmp_path, "c.png", noise=12),
+        make_frame(tmp_path, "d.png", flip=True),
+    ]
+    bodies = [upload(client, p, vehicle_id, f"2025-04-01T10:00:0{i}Z") for i, p in enumerate(frames)]
+    assert all(len(b["computed"]["phash"]) == 16 for b in bodies)
+
+    params = {"vehicle_id": vehicle_id}
+    assert len(client.get("/api/files", params=params).json()) == 4
+    kept = client.get("/api/files", params={**params, "dedupe_near": 6}).json()
+    assert [f["id"] for f in kept] == [bodies[0]["id"], bodies[3]["id"]]
+
+    # 커서 모드: 걸러진 행은 다음 페이지에 다시 나오지 않음
+    page = client.get("/api/files", params={**params, "dedupe_near": 6, "pagination": "cursor", "limit": 1}).json()
+    assert [f["id"] for f in page["items"]] == [bodies[0]["id"]]
+    page = client.get("/api/files", params={**params, "dedupe_near": 6, "cursor": page["next_cursor"], "limit": 1}).json()
+    assert [f["id"] for f in page["items"]] == [bodies[3]["id"]]
+    assert page["next_cursor"] is None
+
+    similar = client.get(f"/api/files/{bodies[0]['id']}/similar", params={"k": 6}).json()["items"]
+    ids = [m["file"]["id"] for m in similar]
+    assert set(ids) >= {bodies[1]["id"], bodies[2]["id"]}
+    assert bodies[3]["id"] not in ids
+    assert all(m["distance"] <= 6 for m in similar)
+
+    resp = client.get("/api/download/dataset", params={**params, "dedupe_near": 6})
+    assert resp.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        assert len(zf.namelist()) == 2
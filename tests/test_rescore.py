@@ -0,0 +1,137 @@
+import asyncio
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import database
+from app.core.database import Base, SessionLocal, create_db_engine
+from app.main import app
+from app.models.file import File
+from app.models.processing_job import ProcessingJob
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row, insert_files
+from app.services.job_queue import job_queue
+from app.utils import quality
+from app.utils.media import compute_blur_score
+from app.utils.quality import gray_metrics, score_images, stack_metrics
+from app.workers.processing_worker import run_once
+
+
+@pytest.fixture(autouse=True)
+def isolated_db(tmp_path: Path):
+    # 재채점 작업은 files 전체를 훑으므로 다른 테스트가 남긴 행(s3:// 위치 등)과 섞이지 않게 별도 DB 사용
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'rescore.db'}")
+    Base.metadata.create_all(engine)
+    SessionLocal.configure(bind=engine)
+    try:
+        yield
+    finally:
+        SessionLocal.configure(bind=database.engine)
+        engine.dispose()
+
+
+def drain() -> None:
+    while asyncio.run(run_once("test-rescore")):
+        pass
+
+
+def seed_images(tmp_path: Path, vehicle_id: str, count: int) -> list[str]:
+    rng = np.random.default_rng(1)
+    rows = []
+    for i in range(count):
+        img = cv2.GaussianBlur(rng.integers(0, 255, (64, 64, 3), dtype=np.uint8), (2 * i + 1, 2 * i + 1), 0)
+        path = tmp_path / f"p{i}.png"
+        cv2.imwrite(str(path), img)
+        meta = Metadata(vehicle_id=vehicle_id, captured_at="2025-03-01T10:00:00Z", source="cam", route_id="r")
+        rows.append(
+            build_file_row(
+                file_id=uuid4().hex,
+                original_filename=path.name,
+                stored_path=path,
+                processed_path=path,
+                media_type="image",
+                size_bytes=1,
+                file_hash=uuid4().hex * 2,
+                meta=meta,
+                computed={"blur_score": 0.5, "width": 64},  # 예전 계산값
+            )
+        )
+    with SessionLocal() as db:
+        insert_files(db, rows)
+        db.commit()
+    return [r["id"] for r in rows]
+
+
+def test_stack_metrics_match_single_image():
+    batch = np.random.default_rng(2).integers(0, 255, (3, 40, 50), dtype=np.uint8)
+    batch[1] //= 4
+    metrics = stack_metrics(batch)
+    for i, gray in enumerate(batch):
+        single = gray_metrics(gray)
+        assert abs(metrics["blur_score"][i] - compute_blur_score(gray)) / compute_blur_score(gray) < 1e-5
+        for name in ("brightness", "contrast", "entropy"):
+            assert abs(metrics[name][i] - single[name]) < 1e-6
+
+
+def test_rescore_job_updates_files_and_rollups(tmp_path: Path):
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    ids = seed_images(tmp_path, vehicle_id, 5)
+    client = TestClient(app)
+    before = client.get("/api/stats", params={"vehicle_id": vehicle_id}).json()["blur_stats"]
+    assert before["min"] == before["max"] == 0.5
+
+    resp = client.post("/api/jobs/rescore", params={"chunk_size": 2, "batch_size": 2})
+    assert resp.status_code == 202
+    drain()
+    job = client.get(f"/api/jobs/{resp.json()['id']}").json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["updated"] >= 5 and job["result"]["files_per_sec"] > 0
+
+    with SessionLocal() as db:
+        files = db.query(File).filter(File.id.in_(ids)).all()
+    blurs = sorted(f.blur_score for f in files)
+    for f in files:
+        assert f.computed_json["blur_score"] == f.blur_score
+        assert f.computed_json["width"] == 64  # 기존 키 유지
+        assert 0 < f.computed_json["entropy"] <= 8
+    assert blurs[0] < blurs[-1]
+
+    after = client.get("/api/stats", params={"vehicle_id": vehicle_id}).json()["blur_stats"]
+    assert (after["min"], after["max"]) == (blurs[0], blurs[-1])
+    assert abs(after["avg"] - sum(blurs) / len(blurs)) < 1e-6
+
+
+def test_rescore_resumes_from_checkpoint():
+    with SessionLocal() as db:
+        job = job_queue.enqueue(db, "rescore_files", {"chunk_size": 10})
+        # 마지막 id 이후부터 재개 → 더 처리할 행이 없음
+        job_queue.checkpoint(db, job.id, {"cursor": "g", "processed": 7, "updated": 6, "elapsed_sec": 2.0})
+        job_id = job.id
+    drain()
+    with SessionLocal() as db:
+        job = db.get(ProcessingJob, job_id)
+        assert job.status == "succeeded"
+        assert (job.result["processed"], job.result["updated"], job.result["skipped"]) == (7, 6, 1)
+        assert job.result["files_per_sec"] == 3.5
+
+
+def test_score_images_skips_unreadable_locations(tmp_path: Path, monkeypatch):
+    good = tmp_path / "good.png"
+    cv2.imwrite(str(good), np.random.default_rng(3).integers(0, 255, (32, 32), dtype=np.uint8))
+    corrupt = tmp_path / "corrupt.jpg"
+    corrupt.write_bytes(b"not an image")
+    read = quality.read_location
+
+    def fake_read(location: str):
+        if location.startswith("s3://"):
+            raise RuntimeError("Unable to locate credentials")
+        return read(location)
+
+    monkeypatch.setattr(quality, "read_location", fake_read)
+    results = score_images([str(good), "s3://bucket/missing.jpg", str(corrupt), str(tmp_path / "gone.jpg")])
+    assert results[0] is not None and results[0]["blur_score"] > 0
+    assert results[1:] == [None, None, None]
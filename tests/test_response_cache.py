@@ -0,0 +1,113 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.main import app
+from app.models.file import File
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row, insert_files
+from app.services.response_cache import ResponseCache, UPDATES, mark_changed
+
+
+def make_row(vehicle_id: str) -> dict:
+    meta = Metadata(vehicle_id=vehicle_id, captured_at="2025-10-01T10:00:00Z", source="cam", route_id="route-c")
+    return build_file_row(
+        file_id=uuid4().hex,
+        original_filename="f.jpg",
+        stored_path="/nonexistent/raw.jpg",
+        processed_path="/nonexistent/processed.jpg",
+        media_type="image",
+        size_bytes=1,
+        file_hash="0" * 64,
+        meta=meta,
+        computed={"blur_score": 5.0},
+    )
+
+
+def seed_file(vehicle_id: str) -> str:
+    row = make_row(vehicle_id)
+    with SessionLocal() as db:
+        insert_files(db, [row])
+        db.commit()
+    return row["id"]
+
+
+def counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+def test_list_cached_until_insert_commits():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    seed_file(vehicle_id)
+    client = TestClient(app)
+
+    first = client.get("/api/files", params={"vehicle_id": vehicle_id})
+    hits = counter("response_cache_hits.files")
+    # 파라미터 순서/생략된 기본값이 달라도 같은 키
+    second = client.get("/api/files", params={"limit": 50, "vehicle_id": vehicle_id})
+    assert counter("response_cache_hits.files") == hits + 1
+    assert second.content == first.content and len(first.json()) == 1
+
+    seed_file(vehicle_id)
+    third = client.get("/api/files", params={"vehicle_id": vehicle_id})
+    assert counter("response_cache_hits.files") == hits + 1
+    assert len(third.json()) == 2
+    assert third.headers["etag"] != first.headers["etag"]
+
+    # 롤백된 쓰기는 세대를 올리지 않음
+    with SessionLocal() as db:
+        db.add(File(**make_row(vehicle_id)))
+        db.flush()
+        db.rollback()
+    client.get("/api/files", params={"vehicle_id": vehicle_id})
+    assert counter("response_cache_hits.files") == hits + 2
+
+    # insert_files를 거치지 않은 ORM 추가도 커밋되면 무효화
+    with SessionLocal() as db:
+        db.add(File(**make_row(vehicle_id)))
+        db.commit()
+    assert len(client.get("/api/files", params={"vehicle_id": vehicle_id}).json()) == 3
+
+
+def test_etag_not_modified_and_update_invalidates_single_file():
+    file_id = seed_file(f"car-{uuid4().hex[:8]}")
+    client = TestClient(app)
+
+    resp = client.get(f"/api/files/{file_id}")
+    etag = resp.headers["etag"]
+    not_modified = client.get(f"/api/files/{file_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    # 새 행 추가는 단건 응답을 무효화하지 않음
+    seed_file("car-other")
+    hits = counter("response_cache_hits.file")
+    client.get(f"/api/files/{file_id}")
+    assert counter("response_cache_hits.file") == hits + 1
+
+    with SessionLocal() as db:
+        db.execute(update(File), [{"id": file_id, "blur_score": 42.0}])
+        mark_changed(db, UPDATES)
+        db.commit()
+    changed = client.get(f"/api/files/{file_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["blur_score"] == 42.0
+
+    assert client.get(f"/api/files/{uuid4().hex}").status_code == 404
+    assert client.get("/api/metrics").json()["response_cache"]["file"]["hits"] >= 1
+
+
+def test_lru_evicts_by_total_bytes():
+    cache = ResponseCache(max_bytes=10, ttl_sec=60)
+    cache.put(("a",), b"1234", '"a"')
+    cache.put(("b",), b"1234", '"b"')
+    assert cache.get(("a",)) is not None  # a가 최근 사용
+    cache.put(("c",), b"1234", '"c"')
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is not None and cache.get(("c",)) is not None
+
+    expired = ResponseCache(max_bytes=10, ttl_sec=0)
+    expired.put(("a",), b"1", '"a"')
+    assert expired.get(("a",)) is None
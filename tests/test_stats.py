@@ -0,0 +1,65 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.main import app
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row, insert_files
+
+
+def seed(vehicle_id: str, items: list[tuple[str, str, float | None]]) -> None:
+    rows = []
+    for captured_at, media_type, blur in items:
+        meta = Metadata(vehicle_id=vehicle_id, captured_at=captured_at, source="camera_front", route_id="route-s")
+        rows.append(
+            build_file_row(
+                file_id=uuid4().hex,
+                original_filename="f",
+                stored_path="/nonexistent/raw",
+                processed_path="/nonexistent/processed",
+                media_type=media_type,
+                size_bytes=10,
+                file_hash="0" * 64,
+                meta=meta,
+                computed={} if blur is None else {"blur_score": blur},
+            )
+        )
+    # 두 번에 나눠 넣어 기존 집계 행에 더해지는 경로도 확인
+    for part in (rows[: len(rows) // 2], rows[len(rows) // 2 :]):
+        with SessionLocal() as db:
+            insert_files(db, part)
+            db.commit()
+
+
+def test_stats_from_rollups():
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    blurs = [float(v) for v in range(1, 101)]
+    seed(
+        vehicle_id,
+        [("2025-02-01T10:00:00Z", "image", b) for b in blurs[:50]]
+        + [("2025-02-02T10:00:00Z", "image", b) for b in blurs[50:]]
+        + [("2025-02-02T11:00:00Z", "video", None)],
+    )
+    client = TestClient(app)
+
+    body = client.get("/api/stats", params={"vehicle_id": vehicle_id}).json()
+    assert body["total_files"] == 101
+    assert body["total_size_bytes"] == 1010
+    assert body["media_histogram"] == {"image": 100, "video": 1}
+    blur = body["blur_stats"]
+    assert (blur["min"], blur["max"], blur["avg"]) == (1.0, 100.0, 50.5)
+    # 히스토그램 근사치 (버킷 폭 약 12%)
+    assert abs(blur["p50"] - 50) <= 6
+    assert abs(blur["p90"] - 90) <= 11
+    assert blur["p50"] <= blur["p90"] <= blur["p99"] <= 100.0
+
+    body = client.get("/api/stats", params={"vehicle_id": vehicle_id, "group_by": "day"}).json()
+    days = {b["day"]: b for b in body["breakdown"]}
+    assert list(days) == ["2025-02-01", "2025-02-02"]
+    assert days["2025-02-01"]["file_count"] == 50
+    assert days["2025-02-01"]["blur_stats"]["max"] == 50.0
+    assert days["2025-02-02"]["blur_stats"]["min"] == 51.0
+
+    body = client.get("/api/stats", params={"vehicle_id": vehicle_id, "captured_from": "2025-02-02"}).json()
+    assert body["total_files"] == 51
@@ -0,0 +1,125 @@
+import io
+import json
+import os
+import zipfile
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.main import app
+from app.storage import s3_storage
+from app.storage.local import LocalStorage
+
+
+def test_local_storage_protocol(tmp_path: Path):
+    storage = LocalStorage(tmp_path / "store")
+    location = storage.put_stream(io.BytesIO(b"0123456789"), "a/b/c.bin")
+    assert storage.exists(location)
+    assert storage.stat(location).size == 10
+    assert b"".join(storage.open_range(location, 2, 5)) == b"2345"
+    assert b"".join(storage.open_range(location, 7)) == b"789"
+    assert storage.presigned_url(location, 60) is None
+    storage.delete(location)
+    assert not storage.exists(location)
+    assert storage.stat(location) is None
+
+
+def test_local_storage_sharded_atomic_writes(tmp_path: Path):
+    storage = LocalStorage(tmp_path / "store", fsync=True)
+    dest, size, _ = storage.save_stream(io.BytesIO(b"abc"), subdir="raw", suffix=".jpg")
+    # raw/YYYY/MM/DD/<앞 2자리>/<uuid>.jpg
+    rel = dest.relative_to(tmp_path / "store")
+    assert rel.parts[0] == "raw" and len(rel.parts) == 6
+    assert rel.parts[4] == dest.name[:2]
+    assert size == 3 and dest.read_bytes() == b"abc"
+
+    # 한도 초과로 중단되면 최종 이름도 임시 파일도 남지 않음
+    with pytest.raises(ValueError):
+        storage.save_stream(io.BytesIO(b"x" * 10), subdir="raw", suffix=".jpg", max_bytes=5)
+    leftovers = [p.name for p in (tmp_path / "store").rglob("*") if p.is_file()]
+    assert leftovers == [dest.name]
+
+    srcs = []
+    for i in range(3):
+        src = tmp_path / f"src{i}.png"
+        src.write_bytes(bytes([i]) * 4)
+        srcs.append(src)
+    saved = storage.save_many(srcs, subdir="processed/images")
+    assert [p.read_bytes() for p in saved] == [s.read_bytes() for s in srcs]
+    assert all(p.suffix == ".png" for p in saved)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(settings, "s3_bucket", "pipeline-test")
+    monkeypatch.setattr(settings, "s3_region", "us-east-1")
+    monkeypatch.setattr(settings, "s3_prefix", "data")
+    # moto 최소 파트 크기(5MB)에 맞춘 멀티파트 설정
+    monkeypatch.setattr(settings, "s3_multipart_threshold_mb", 5)
+    monkeypatch.setattr(settings, "s3_multipart_chunk_mb", 5)
+    with moto.mock_aws():
+        s3_storage.cache_clear()
+        storage = s3_storage()
+        storage.client.create_bucket(Bucket="pipeline-test")
+        yield storage
+    s3_storage.cache_clear()
+
+
+def test_s3_storage_multipart_and_range(s3, tmp_path: Path):
+    data = os.urandom(11 * 1024 * 1024)
+    src = tmp_path / "big.mp4"
+    src.write_bytes(data)
+
+    location = s3.put_file(src, "raw/big.mp4")
+    assert location == "s3://pipeline-test/data/raw/big.mp4"
+    head = s3.client.head_object(Bucket="pipeline-test", Key="data/raw/big.mp4")
+    assert head["ETag"].strip('"').endswith("-3")  # 5MB 파트 3개로 업로드됨
+
+    assert s3.stat(location).size == len(data)
+    assert b"".join(s3.open_range(location)) == data
+    assert b"".join(s3.open_range(location, 100, 199)) == data[100:200]
+    assert "X-Amz-Signature" in s3.presigned_url(location, 60)
+
+    s3.delete(location)
+    assert not s3.exists(location)
+
+
+def test_upload_and_download_with_s3_mode(s3, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "storage_mode", "s3")
+    img = np.random.default_rng().integers(0, 255, (48, 64, 3), dtype=np.uint8)
+    img_path = tmp_path / "frame.png"
+    cv2.imwrite(str(img_path), img)
+    vehicle_id = f"car-{uuid4().hex[:8]}"
+    meta = {"vehicle_id": vehicle_id, "captured_at": "2025-01-01T10:00:00Z", "source": "cam", "route_id": "r"}
+
+    client = TestClient(app)
+    with img_path.open("rb") as f:
+        resp = client.post(
+            "/api/upload", files={"file": ("frame.png", f, "image/png")}, data={"metadata": json.dumps(meta)}
+        )
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["stored_path"].startswith("s3://pipeline-test/data/raw/")
+    assert body["processed_path"].startswith("s3://pipeline-test/data/processed/images/")
+    # 로컬 작업 공간에는 사본이 남지 않음
+    local_key = body["stored_path"].split("/data/", 1)[1]
+    assert not (Path(settings.storage_base_path) / local_key).exists()
+
+    url = client.get(f"/api/files/{body['id']}/url").json()["url"]
+    assert "X-Amz-Signature" in url
+
+    resp = client.get("/api/download/dataset", params={"vehicle_id": vehicle_id})
+    assert resp.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        [name] = zf.namelist()
+        decoded = cv2.imdecode(np.frombuffer(zf.read(name), np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == (640, 640, 3)
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.controllers import files_controller
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.main import app
+from app.schemas.upload import Metadata
+from app.services import upload_service
+from app.services.file_writer import build_file_row, insert_files
+from app.services.thumbnail_cache import ThumbnailCache
+
+
+def seed_file(processed: Path, media_type: str = "image") -> str:
+    meta = Metadata(vehicle_id="car-thumb", captured_at="2025-04-01T10:00:00Z", source="cam", route_id="r")
+    row = build_file_row(
+        file_id=uuid4().hex,
+        original_filename=processed.name,
+        stored_path=processed,
+        processed_path=processed,
+        media_type=media_type,
+        size_bytes=1,
+        file_hash=uuid4().hex * 2,
+        meta=meta,
+        computed={},
+    )
+    with SessionLocal() as db:
+        insert_files(db, [row])
+        db.commit()
+    return row["id"]
+
+
+def decode(body: bytes) -> np.ndarray:
+    return cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_COLOR)
+
+
+def test_thumbnail_endpoint(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(files_controller, "thumbnail_cache", ThumbnailCache(tmp_path / "thumbs", 10**8))
+    processed = tmp_path / "p.jpg"
+    cv2.imwrite(str(processed), np.full((400, 640, 3), 128, np.uint8))
+    file_id = seed_file(processed)
+    client = TestClient(app)
+
+    resp = client.get(f"/api/files/{file_id}/thumbnail", params={"size": 128})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "image/jpeg"
+    assert "immutable" in resp.headers["cache-control"]
+    assert decode(resp.content).shape[:2] == (80, 128)  # 비율 유지
+
+    hits = metrics.snapshot()["counters"].get("thumbnail_hits", 0)
+    again = client.get(f"/api/files/{file_id}/thumbnail", params={"size": 128})
+    assert again.content == resp.content
+    assert metrics.snapshot()["counters"]["thumbnail_hits"] == hits + 1
+    cached = client.get(
+        f"/api/files/{file_id}/thumbnail", params={"size": 128}, headers={"If-None-Match": resp.headers["etag"]}
+    )
+    assert cached.status_code == 304
+
+    # 처리 파일보다 큰 크기는 확대하지 않음
+    small = tmp_path / "small.jpg"
+    cv2.imwrite(str(small), np.full((100, 200, 3), 128, np.uint8))
+    large = client.get(f"/api/files/{seed_file(small)}/thumbnail", params={"size": 512})
+    assert decode(large.content).shape[:2] == (100, 200)
+    assert client.get(f"/api/files/{file_id}/thumbnail", params={"size": 100}).status_code == 400
+    assert client.get(f"/api/files/{uuid4().hex}/thumbnail").status_code == 404
+    assert client.get(f"/api/files/{seed_file(tmp_path / 'gone.jpg')}/thumbnail").status_code == 404
+
+
+def test_video_thumbnail_from_first_frame(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(files_controller, "thumbnail_cache", ThumbnailCache(tmp_path / "thumbs", 10**8))
+    path = tmp_path / "v.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (320, 240))
+    for _ in range(3):
+        writer.write(np.full((240, 320, 3), 200, np.uint8))
+    writer.release()
+    resp = TestClient(app).get(f"/api/files/{seed_file(path, 'video')}/thumbnail", params={"size": 128})
+    assert resp.status_code == 200
+    assert decode(resp.content).shape[:2] == (96, 128)
+
+
+def test_concurrent_first_requests_render_once(tmp_path: Path):
+    cache = ThumbnailCache(tmp_path, 10**8)
+    calls = []
+
+    def render() -> bytes:
+        calls.append(1)
+        time.sleep(0.1)
+        return b"thumb"
+
+    paths = []
+    threads = [threading.Thread(target=lambda: paths.append(cache.get_or_render("ab_128", render))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(paths) == 5 and len(set(paths)) == 1
+    assert paths[0].read_bytes() == b"thumb"
+
+
+def test_lru_eviction_by_total_size(tmp_path: Path):
+    cache = ThumbnailCache(tmp_path, max_bytes=250)
+    for i, key in enumerate(["aa_1", "bb_1", "cc_1"]):
+        path = cache.put(key, b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))  # mtime 해상도와 무관하게 순서를 고정
+    assert cache.get("aa_1") is None
+    assert cache.get("bb_1") is not None and cache.get("cc_1") is not None
+
+
+def test_read_survives_eviction_before_open(tmp_path: Path):
+    cache = ThumbnailCache(tmp_path, 10**8)
+    original = cache.get_or_render
+    served = []
+
+    def evicted_after_lookup(key, render):
+        # 경로를 받은 직후 다른 요청의 evict()가 지운 상황
+        path = original(key, render)
+        if not served:
+            path.unlink()
+        served.append(path)
+        return path
+
+    cache.get_or_render = evicted_after_lookup
+    renders = []
+    assert cache.read_or_render("ab_128", lambda: renders.append(1) or b"thumb") == b"thumb"
+    assert len(served) == 2 and len(renders) == 2
+    assert cache.get("ab_128") is not None
+
+
+def test_eager_thumbnails_on_upload(tmp_path: Path, monkeypatch):
+    cache = ThumbnailCache(tmp_path / "thumbs", 10**8)
+    monkeypatch.setattr(upload_service, "thumbnail_cache", cache)
+    monkeypatch.setattr(settings, "thumbnail_eager_sizes", [128])
+    img = np.zeros((100, 200, 3), dtype=np.uint8)
+    cv2.rectangle(img, (20, 20), (180, 80), (255, 255, 255), 2)
+    data = cv2.imencode(".jpg", img)[1].tobytes()
+    meta = {"vehicle_id": "car-thumb", "captured_at": "2025-04-01T10:00:00Z", "source": "cam", "route_id": "r"}
+
+    resp = TestClient(app).post(
+        "/api/upload", files={"file": ("t.jpg", data, "image/jpeg")}, data={"metadata": json.dumps(meta)}
+    )
+    assert resp.status_code == 200, resp.text
+    path = cache.get(ThumbnailCache.key(hashlib.sha256(data).hexdigest(), 128))
+    assert path is not None
+    assert max(decode(path.read_bytes()).shape[:2]) == 128
@@ -0,0 +1,85 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.main import app
+from app.schemas.upload import Metadata
+from app.services.file_writer import build_file_row, insert_files
+
+
+def seed(route_id: str, items: list[tuple[str, str]]) -> None:
+    rows = []
+    for vehicle_id, captured_at in items:
+        meta = Metadata(vehicle_id=vehicle_id, captured_at=captured_at, source="camera_front", route_id=route_id)
+        rows.append(
+            build_file_row(
+                file_id=uuid4().hex,
+                original_filename="f",
+                stored_path="/nonexistent/raw",
+                processed_path="/nonexistent/processed",
+                media_type="image",
+                size_bytes=10,
+                file_hash="0" * 64,
+                meta=meta,
+                computed={},
+            )
+        )
+    # 두 번에 나눠 넣어 기존 버킷에 더해지는 경로도 확인
+    for part in (rows[:2], rows[2:]):
+        with SessionLocal() as db:
+            insert_files(db, part)
+            db.commit()
+
+
+def test_timeseries_and_route_timeline():
+    route_id = f"route-{uuid4().hex[:8]}"
+    seed(
+        route_id,
+        [
+            ("car-a", "2025-06-01T10:00:00Z"),
+            ("car-a", "2025-06-01T10:00:30Z"),
+            ("car-b", "2025-06-01T10:01:10Z"),
+            ("car-a", "2025-06-01T10:05:00Z"),
+            ("car-b", "2025-06-01T11:30:00Z"),
+        ],
+    )
+    client = TestClient(app)
+
+    body = client.get("/api/stats/timeseries", params={"granularity": "minute", "route_id": route_id}).json()
+    assert [(b["bucket_start"], b["file_count"]) for b in body["buckets"]] == [
+        ("2025-06-01T10:00:00", 2),
+        ("2025-06-01T10:01:00", 1),
+        ("2025-06-01T10:05:00", 1),
+        ("2025-06-01T11:30:00", 1),
+    ]
+
+    body = client.get(
+        "/api/stats/timeseries", params={"granularity": "hour", "route_id": route_id, "group_by": "vehicle_id"}
+    ).json()
+    assert [(b["bucket_start"], b["vehicle_id"], b["file_count"]) for b in body["buckets"]] == [
+        ("2025-06-01T10:00:00", "car-a", 3),
+        ("2025-06-01T10:00:00", "car-b", 1),
+        ("2025-06-01T11:00:00", "car-b", 1),
+    ]
+
+    body = client.get(
+        "/api/stats/timeseries",
+        params={"granularity": "day", "route_id": route_id, "captured_from": "2025-06-01T10:30:00Z"},
+    ).json()
+    assert [(b["bucket_start"], b["file_count"], b["size_bytes"]) for b in body["buckets"]] == [
+        ("2025-06-01T00:00:00", 5, 50)
+    ]
+
+    timeline = client.get(f"/api/routes/{route_id}/timeline", params={"gap_sec": 60}).json()
+    assert [(s["start"], s["end"], s["file_count"]) for s in timeline["segments"]] == [
+        ("2025-06-01T10:00:00", "2025-06-01T10:01:10", 3),
+        ("2025-06-01T10:05:00", "2025-06-01T10:05:00", 1),
+        ("2025-06-01T11:30:00", "2025-06-01T11:30:00", 1),
+    ]
+    assert [g["duration_sec"] for g in timeline["gaps"]] == [230.0, 5100.0]
+    assert timeline["span_sec"] == 5400.0 and timeline["covered_sec"] == 70.0
+
+    timeline = client.get(f"/api/routes/{route_id}/timeline", params={"gap_sec": 60, "vehicle_id": "car-a"}).json()
+    assert [s["file_count"] for s in timeline["segments"]] == [2, 1]
+    assert client.get("/api/routes/no-such-route/timeline").status_code == 404
@@ -0,0 +1,206 @@
+import io
+import json
+import zipfile
+from pathlib import Path
+from uuid import uuid4
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.settings import settings
+from app.main import app
+from app.models.processing_job import JOB_FAILED, ProcessingJob
+from app.services.batch_service import BatchUploadService
+from app.services.blob_store import register_refs
+
+
+def make_zip(entries: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def jpeg_bytes() -> bytes:
+    img = np.zeros((120, 160, 3), dtype=np.uint8)
+    cv2.circle(img, (80, 60), 30, (255, 255, 255), 2)
+    ok, buf = cv2.imencode(".jpg", img)
+    assert ok
+    return buf.tobytes()
+
+
+def unique_jpeg_bytes() -> bytes:
+    # 중복 제거 모드 테스트용: 다른 테스트의 업로드와 해시가 겹치지 않도록 매번 다른 내용
+    img = np.random.default_rng().integers(0, 255, (64, 64, 3), dtype=np.uint8)
+    ok, buf = cv2.imencode(".jpg", img)
+    assert ok
+    return buf.tobytes()
+
+
+def manifest():
+    return {
+        "defaults": {
+            "vehicle_id": "car-batch",
+            "captured_at": "2025-01-01T10:00:00Z",
+            "source": "camera_front",
+            "route_id": "route-1",
+        },
+        "entries": {"frames/b.jpg": {"captured_at": "2025-01-01T10:00:01Z"}},
+    }
+
+
+def test_upload_batch_with_form_manifest():
+    data = make_zip(
+        {
+            "frames/a.jpg": jpeg_bytes(),
+            "frames/b.jpg": jpeg_bytes(),
+            "frames/readme.txt": b"not media",
+            "frames/broken.jpg": b"not a jpeg",
+        }
+    )
+    client = TestClient(app)
+    resp = client.post(
+        "/api/upload/batch",
+        files={"file": ("batch.zip", data, "application/zip")},
+        data={"manifest": json.dumps(manifest())},
+    )
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["total"] == 4
+    assert body["succeeded"] == 2
+    assert body["failed"] == 2
+    by_name = {e["name"]: e for e in body["entries"]}
+    assert by_name["frames/a.jpg"]["status"] == "ok"
+    assert "Unsupported file extension" in by_name["frames/readme.txt"]["error"]
+    assert by_name["frames/broken.jpg"]["status"] == "error"
+
+    detail = client.get(f"/api/files/{by_name['frames/b.jpg']['file_id']}").json()
+    assert detail["captured_at"].startswith("2025-01-01T10:00:01")
+    assert Path(detail["processed_path"]).exists()
+
+
+def test_upload_batch_with_embedded_manifest():
+    data = make_zip({"manifest.json": json.dumps(manifest()).encode(), "frames/a.jpg": jpeg_bytes()})
+    client = TestClient(app)
+    resp = client.post("/api/upload/batch", files={"file": ("batch.zip", data, "application/zip")})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["total"] == 1
+    assert body["succeeded"] == 1
+    assert body["status"] == "succeeded"
+
+
+def test_upload_batch_rejects_non_zip():
+    client = TestClient(app)
+    resp = client.post("/api/upload/batch", files={"file": ("batch.zip", b"nope", "application/zip")})
+    assert resp.status_code == 400
+    assert "Invalid ZIP archive" in resp.text
+
+
+def test_upload_batch_unexpected_entry_error_is_per_entry(monkeypatch):
+    original = BatchUploadService._process_media
+    stored = []
+
+    async def flaky(self, stored_path, media_type, suffix, file_hash):
+        if len(stored) == 0:
+            stored.append(stored_path)
+            raise RuntimeError("boom")
+        return await original(self, stored_path, media_type, suffix, file_hash)
+
+    monkeypatch.setattr(settings, "dedup_mode", False)
+    monkeypatch.setattr(BatchUploadService, "_process_media", flaky)
+    data = make_zip({"frames/a.jpg": jpeg_bytes(), "frames/b.jpg": jpeg_bytes()})
+    resp = TestClient(app).post(
+        "/api/upload/batch",
+        files={"file": ("batch.zip", data, "application/zip")},
+        data={"manifest": json.dumps(manifest())},
+    )
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["succeeded"] == 1
+    assert [e["error"] for e in body["entries"] if e["status"] == "error"] == ["Processing failed: boom"]
+    assert not Path(stored[0]).exists()
+
+
+def test_upload_batch_chunk_failure_marks_job_failed_and_cleans_files(monkeypatch):
+    chunks = []
+
+    def failing_insert(self, db, entries):
+        chunks.append([dict(e.row) for e in entries if e.row is not None])
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(settings, "dedup_mode", False)
+    monkeypatch.setattr(BatchUploadService, "_insert_chunk", failing_insert)
+    filename = f"batch-{uuid4().hex}.zip"
+    data = make_zip({"frames/a.jpg": jpeg_bytes(), "frames/b.jpg": jpeg_bytes()})
+    with pytest.raises(RuntimeError):
+        TestClient(app).post(
+            "/api/upload/batch",
+            files={"file": (filename, data, "application/zip")},
+            data={"manifest": json.dumps(manifest())},
+        )
+
+    rows = chunks[0]
+    assert len(rows) == 2
+    for row in rows:
+        assert not Path(row["stored_path"]).exists()
+        assert not Path(row["processed_path"]).exists()
+    with SessionLocal() as db:
+        job = db.scalars(select(ProcessingJob).where(ProcessingJob.payload["filename"].as_string() == filename)).one()
+    assert job.status == JOB_FAILED
+    assert "disk full" in job.result["error"]
+
+
+def test_upload_batch_dedup_error_removes_adopted_blobs(monkeypatch):
+    # 콘텐츠 주소 경로로 옮긴 뒤 실패해도 옮긴 블롭 파일이 고아로 남지 않음
+    adopted = []
+
+    async def failing(self, stored_path, media_type, suffix, file_hash):
+        adopted.append(stored_path)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(settings, "dedup_mode", True)
+    monkeypatch.setattr(BatchUploadService, "_process_media", failing)
+    data = make_zip({"frames/a.jpg": unique_jpeg_bytes()})
+    resp = TestClient(app).post(
+        "/api/upload/batch",
+        files={"file": ("batch.zip", data, "application/zip")},
+        data={"manifest": json.dumps(manifest())},
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["entries"][0]["error"] == "Processing failed: boom"
+    assert "/blobs/raw/" in str(adopted[0])
+    assert not adopted[0].exists()
+
+
+def test_upload_batch_dedup_failure_keeps_blobs_committed_by_another_request(monkeypatch):
+    # 같은 내용을 다른 요청이 먼저 커밋했다면 (참조 수 > 0) 실패한 배치가 블롭 파일을 지우지 않음
+    chunks = []
+
+    def concurrent_commit_then_fail(self, db, entries):
+        rows = [dict(e.row) for e in entries if e.row is not None]
+        chunks.append(rows)
+        with SessionLocal() as other:
+            register_refs(other, rows)
+            other.commit()
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(settings, "dedup_mode", True)
+    monkeypatch.setattr(BatchUploadService, "_insert_chunk", concurrent_commit_then_fail)
+    data = make_zip({"frames/a.jpg": unique_jpeg_bytes()})
+    with pytest.raises(RuntimeError):
+        TestClient(app).post(
+            "/api/upload/batch",
+            files={"file": ("batch.zip", data, "application/zip")},
+            data={"manifest": json.dumps(manifest())},
+        )
+
+    (row,) = chunks[0]
+    assert "/blobs/raw/" in row["stored_path"]
+    assert Path(row["stored_path"]).exists()
+    assert Path(row["processed_path"]).exists()
@@ -1,3 +1,4 @@
+import hashlib
 import json
 from pathlib import Path
 
@@ -6,6 +7,7 @@ import cv2
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.utils.media import analyze_video, compute_blur_score, jpeg_size, preprocess_image
 
 
 def make_dummy_image(tmpdir: Path) -> Path:
@@ -76,10 +78,61 @@ def test_upload_video(tmp_path: Path, monkeypatch):
     body = resp.json()
     assert body["media_type"] == "video"
     assert body["computed"]["frame_count"] == 5
+    assert body["computed"]["video_quality"]["samples"] == 5
+    assert body["computed"]["video_quality"]["underexposed_ratio"] == 1.0
     assert Path(body["stored_path"]).exists()
     assert Path(body["processed_path"]).exists()
 
 
+def test_analyze_video_samples(tmp_path: Path):
+    # 앞 20프레임은 검은 정지 화면, 뒤 20프레임은 노이즈
+    path = tmp_path / "mixed.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (64, 48))
+    rng = np.random.default_rng(0)
+    for i in range(40):
+        frame = np.zeros((48, 64, 3), dtype=np.uint8) if i < 20 else rng.integers(0, 255, (48, 64, 3), dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+
+    # 간격 4 → 순차 grab, 간격 10 → seek
+    for max_frames, dark_frames in ((10, 5), (4, 2)):
+        result = analyze_video(path, max_frames=max_frames, budget_sec=30.0)
+        quality = result["video_quality"]
+        assert quality["samples"] == max_frames and not quality["truncated"]
+        assert quality["underexposed_ratio"] == dark_frames / max_frames
+        assert quality["max_frozen_run"] == dark_frames - 1
+        assert quality["frozen_ratio"] == (dark_frames - 1) / (max_frames - 1)
+        assert quality["blur_min"] < quality["blur_max"]
+        assert result["blur_score"] >= 0
+
+    # 샘플 수 0이면 기본 메타만
+    assert "video_quality" not in analyze_video(path, max_frames=0, budget_sec=30.0)
+    # 시간 예산을 넘기면 중단하고 표시
+    assert analyze_video(path, max_frames=10, budget_sec=0.0)["video_quality"]["truncated"]
+
+
+def test_preprocess_reduced_decode(tmp_path: Path):
+    # 3000x2000 JPEG → 640x640: 1/2 축소 디코드(1500x1000)만으로 충분
+    img = cv2.GaussianBlur(np.random.default_rng(0).integers(0, 255, (2000, 3000, 3), dtype=np.uint8), (5, 5), 0)
+    ok, buf = cv2.imencode(".jpg", img)
+    data = buf.tobytes()
+    assert jpeg_size(data) == (3000, 2000)
+    assert jpeg_size(b"\x89PNG\r\n") is None
+
+    src = tmp_path / "big.jpg"
+    src.write_bytes(data)
+    full = preprocess_image(src, tmp_path / "full.jpg", (640, 640), 90, reduced_decode=False)
+    reduced = preprocess_image(data, tmp_path / "reduced.jpg", (640, 640), 90)
+    assert (reduced["width"], reduced["height"]) == (640, 640)
+    assert cv2.imread(str(tmp_path / "reduced.jpg")).shape == (640, 640, 3)
+    assert abs(reduced["blur_score"] - full["blur_score"]) / full["blur_score"] < 0.5
+
+    # 그레이스케일 float32 블러 = 기존 float64 계산과 같은 값
+    gray = cv2.cvtColor(cv2.resize(img, (640, 640)), cv2.COLOR_BGR2GRAY)
+    expected = cv2.Laplacian(gray, cv2.CV_64F).var()
+    assert abs(compute_blur_score(gray) - expected) / expected < 1e-4
+
+
 def test_upload_missing_meta_field(tmp_path: Path, monkeypatch):
     monkeypatch.setenv("STORAGE_BASE_PATH", str(tmp_path / "data"))
     monkeypatch.setenv("META_PATH", str(tmp_path / "meta"))
@@ -115,3 +168,93 @@ def test_upload_unsupported_ext(tmp_path: Path, monkeypatch):
         )
     assert resp.status_code == 400
     assert "Unsupported file extension" in resp.text
+
+
+def test_upload_hash_and_size_streamed(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("STORAGE_BASE_PATH", str(tmp_path / "data"))
+    monkeypatch.setenv("META_PATH", str(tmp_path / "meta"))
+
+    video_path = make_dummy_video(tmp_path)
+    raw = video_path.read_bytes()
+
+    client = TestClient(app)
+    with video_path.open("rb") as f:
+        resp = client.post(
+            "/api/upload",
+            files={"file": ("test.avi", f, "video/avi")},
+            data={"metadata": json.dumps(base_meta())},
+        )
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["size_bytes"] == len(raw)
+    assert body["sha256"] == hashlib.sha256(raw).hexdigest()
+    # processed/videos는 원본을 복사하지 않고 하드링크로 참조
+    assert Path(body["processed_path"]).stat().st_ino == Path(body["stored_path"]).stat().st_ino
+
+
+def use_tmp_storage(tmp_path: Path, monkeypatch) -> None:
+    # 설정은 import 때 읽으므로 환경 변수만으로는 이미 만든 업로드 서비스의 저장 위치가 바뀌지 않음
+    # → 저장소와 메타 로그도 tmp_path 아래로 돌려 저장소의 ./data에 파일을 남기지 않음
+    from app.controllers import upload_controller
+    from app.core.settings import settings
+    from app.storage.local import LocalStorage
+
+    monkeypatch.setenv("STORAGE_BASE_PATH", str(tmp_path / "data"))
+    monkeypatch.setenv("META_PATH", str(tmp_path / "meta"))
+    monkeypatch.setattr(upload_controller.service, "storage", LocalStorage(tmp_path / "data"))
+    monkeypatch.setattr(settings, "meta_log", False)
+
+
+def test_upload_too_large(tmp_path: Path, monkeypatch):
+    from app.core.settings import settings
+
+    use_tmp_storage(tmp_path, monkeypatch)
+    monkeypatch.setattr(settings, "max_file_size_mb", 0)
+    img_path = make_dummy_image(tmp_path)
+
+    client = TestClient(app)
+    with img_path.open("rb") as f:
+        resp = client.post(
+            "/api/upload",
+            files={"file": ("test.jpg", f, "image/jpeg")},
+            data={"metadata": json.dumps(base_meta())},
+        )
+    assert resp.status_code == 400
+    assert "File too large" in resp.text
+
+
+def test_upload_records_stage_metrics(tmp_path: Path, monkeypatch):
+    use_tmp_storage(tmp_path, monkeypatch)
+    img_path = make_dummy_image(tmp_path)
+
+    client = TestClient(app)
+    with img_path.open("rb") as f:
+        resp = client.post(
+            "/api/upload",
+            files={"file": ("test.jpg", f, "image/jpeg")},
+            data={"metadata": json.dumps(base_meta())},
+        )
+    assert resp.status_code == 200, resp.text
+
+    body = client.get("/api/metrics").json()
+    for stage in ("store_raw", "preprocess_image", "db_commit"):
+        assert body["stages"][stage]["count"] >= 1
+    assert Path(resp.json()["processed_path"]).is_relative_to(tmp_path)
+    assert body["gauges"]["uploads_inflight"] == 0
+
+
+def test_upload_backpressure_rejects_when_queue_full(tmp_path: Path, monkeypatch):
+    from app.core.workers import worker_pool
+
+    monkeypatch.setattr(worker_pool, "max_queued", 0)
+    img_path = make_dummy_image(tmp_path)
+
+    client = TestClient(app)
+    with img_path.open("rb") as f:
+        resp = client.post(
+            "/api/upload",
+            files={"file": ("test.jpg", f, "image/jpeg")},
+            data={"metadata": json.dumps(base_meta())},
+        )
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"